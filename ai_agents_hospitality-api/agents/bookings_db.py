@@ -0,0 +1,423 @@
+"""
+Bookings Database
+
+This module gives the API read-only access to the bookings database loaded by
+bookings-db. Two backends share the same interface:
+
+- PostgreSQL (postgresql://... URLs) through an asyncpg connection pool.
+  Queries run in read-only transactions with a statement timeout.
+- SQLite (sqlite:///path URLs), a local stand-in for development and tests.
+  Connections are opened read-only and used from worker threads.
+
+Before a query is executed its plan is checked: plans that scan a large table
+sequentially are rejected, so an unselective question can't tie up the
+database. Results are capped at a maximum number of rows.
+"""
+
+import asyncio
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from util.logger_config import logger
+
+# ISO dates given as query parameters are converted to dates for PostgreSQL
+ISO_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class QueryRejectedError(ValueError):
+    """Raised when a query is rejected before being executed."""
+
+
+class QueryTimeoutError(ValueError):
+    """Raised when a query exceeds the statement timeout."""
+
+
+class QueryFailedError(ValueError):
+    """Raised when the database can't run a query (invalid SQL, connection errors...)."""
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    """Rows returned by a query."""
+
+    columns: List[str]
+    rows: List[Tuple[Any, ...]]
+    truncated: bool
+    seconds: float
+
+
+class BookingsDatabase(ABC):
+    """
+    Read-only bookings database.
+
+    Subclasses implement the plan inspection and the execution of a query
+    with positional parameters.
+    """
+
+    # Placeholder style of the backend: "dollar" ($1, $2...) or "qmark" (?)
+    paramstyle = "qmark"
+
+    def __init__(
+        self, url: str, pool_size: int, timeout: float, max_rows: int, max_scan_rows: int
+    ):
+        """
+        Initialize the database.
+
+        Args:
+            url: Database URL
+            pool_size: Maximum number of open connections
+            timeout: Statement timeout in seconds
+            max_rows: Maximum number of rows returned by a query
+            max_scan_rows: Reject plans that scan a table of more rows sequentially (0 disables)
+        """
+        self.url = url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.max_scan_rows = max_scan_rows
+        self._table_rows: Dict[str, int] = {}
+        self._tables: Optional[List[str]] = None
+
+    @abstractmethod
+    async def _list_tables(self) -> List[str]:
+        """Return the names of the tables and views that can be queried."""
+
+    @abstractmethod
+    async def _full_scans(self, sql: str, params: Sequence[Any]) -> List[str]:
+        """Return the tables the plan of a query reads sequentially."""
+
+    @abstractmethod
+    async def _table_size(self, table: str) -> int:
+        """Return the (estimated) number of rows of a table."""
+
+    @abstractmethod
+    async def _fetch(
+        self, sql: str, params: Sequence[Any], limit: int
+    ) -> Tuple[List[str], List[tuple]]:
+        """Run a query and return its columns and at most limit rows."""
+
+    async def available_tables(self) -> List[str]:
+        """
+        Return the tables and views of the database (listed once, then cached).
+
+        Returns:
+            list: Names of the queryable tables and populated views
+        """
+        if self._tables is None:
+            self._tables = await self._list_tables()
+        return self._tables
+
+    async def check_plan(self, sql: str, params: Sequence[Any]) -> None:
+        """
+        Reject queries whose plan scans a large table sequentially.
+
+        Args:
+            sql: Query with positional placeholders
+            params: Query parameters
+
+        Raises:
+            QueryRejectedError: If the plan contains a full scan over the threshold
+        """
+        if self.max_scan_rows <= 0:
+            return
+        for table in await self._full_scans(sql, params):
+            if table not in self._table_rows:
+                self._table_rows[table] = await self._table_size(table)
+            if self._table_rows[table] > self.max_scan_rows:
+                raise QueryRejectedError(
+                    f"The query would scan all {self._table_rows[table]} rows of {table}; "
+                    f"please ask a more specific question (e.g. a hotel or a date range)"
+                )
+
+    async def execute(self, sql: str, params: Sequence[Any]) -> QueryResult:
+        """
+        Check the plan of a query and run it.
+
+        Args:
+            sql: Read-only query with positional placeholders
+            params: Query parameters
+
+        Returns:
+            QueryResult: Columns and at most max_rows rows
+
+        Raises:
+            QueryRejectedError: If the plan is rejected
+            QueryTimeoutError: If the query exceeds the timeout
+            QueryFailedError: If the database can't run the query
+        """
+        await self.check_plan(sql, params)
+        start = time.perf_counter()
+        columns, rows = await self._fetch(sql, params, self.max_rows + 1)
+        return QueryResult(
+            columns=columns,
+            rows=rows[:self.max_rows],
+            truncated=len(rows) > self.max_rows,
+            seconds=time.perf_counter() - start,
+        )
+
+    def invalidate(self) -> None:
+        """Forget the cached table list and sizes (e.g. after the data is reloaded)."""
+        self._table_rows.clear()
+        self._tables = None
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Close the open connections."""
+
+
+class PostgresBookingsDatabase(BookingsDatabase):
+    """PostgreSQL backend using an asyncpg connection pool."""
+
+    paramstyle = "dollar"
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the database; the pool is created on first use."""
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._pool_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+    async def _get_pool(self):
+        """Return the pool of the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._pool is not None and self._pool_loop is loop:
+            return self._pool
+        if self._pool_lock is None or self._pool_loop is not loop:
+            self._pool_lock = asyncio.Lock()
+            self._pool_loop = loop
+            self._pool = None
+        async with self._pool_lock:
+            if self._pool is None:
+                import asyncpg
+
+                self._pool = await asyncpg.create_pool(
+                    self.url, min_size=1, max_size=self.pool_size, command_timeout=self.timeout
+                )
+                logger.info(f"Opened bookings database pool (max {self.pool_size} connections)")
+        return self._pool
+
+    @staticmethod
+    def _convert(params: Sequence[Any]) -> List[Any]:
+        """Convert ISO date strings to dates (asyncpg doesn't cast text to date)."""
+        return [
+            date.fromisoformat(value)
+            if isinstance(value, str) and ISO_DATE_PATTERN.match(value)
+            else value
+            for value in params
+        ]
+
+    async def _run(self, callback):
+        """Run a callback on a connection inside a read-only transaction with a timeout."""
+        import asyncpg
+
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction(readonly=True):
+                    await conn.execute(f"SET LOCAL statement_timeout = {int(self.timeout * 1000)}")
+                    return await callback(conn)
+        except (asyncpg.exceptions.QueryCanceledError, asyncio.TimeoutError) as e:
+            raise QueryTimeoutError(f"The query took longer than {self.timeout}s") from e
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+            # Invalid SQL (unknown column, syntax error...) or an unreachable database
+            raise QueryFailedError(f"The bookings database could not run the query: {e}") from e
+
+    async def _list_tables(self) -> List[str]:
+        """List the tables, views and populated materialized views of the current schema."""
+        async def tables(conn):
+            return await conn.fetch(
+                "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'v', 'm') "
+                "AND (c.relkind <> 'm' OR c.relispopulated)"
+            )
+
+        return [record[0] for record in await self._run(tables)]
+
+    async def _full_scans(self, sql: str, params: Sequence[Any]) -> List[str]:
+        """Return the relations read by Seq Scan nodes of the plan."""
+        async def explain(conn):
+            return await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *self._convert(params))
+
+        plan = await self._run(explain)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        tables = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node.get("Node Type") == "Seq Scan":
+                tables.append(node.get("Relation Name"))
+            nodes.extend(node.get("Plans", []))
+        return tables
+
+    async def _table_size(self, table: str) -> int:
+        """Return the planner's row estimate of a relation."""
+        async def reltuples(conn):
+            return await conn.fetchval(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = $1", table
+            )
+
+        return max(int(await self._run(reltuples) or 0), 0)
+
+    async def _fetch(
+        self, sql: str, params: Sequence[Any], limit: int
+    ) -> Tuple[List[str], List[tuple]]:
+        """Run a query through a cursor and stop after limit rows."""
+        async def fetch(conn):
+            statement = await conn.prepare(sql)
+            cursor = await statement.cursor(*self._convert(params))
+            records = await cursor.fetch(limit)
+            columns = [attribute.name for attribute in statement.get_attributes()]
+            return columns, [tuple(record.values()) for record in records]
+
+        return await self._run(fetch)
+
+    async def aclose(self) -> None:
+        """Close the pool, if it belongs to the running event loop."""
+        if self._pool is not None and self._pool_loop is asyncio.get_running_loop():
+            await self._pool.close()
+            self._pool = None
+
+
+class SQLiteBookingsDatabase(BookingsDatabase):
+    """SQLite backend, opened read-only, for local development and tests."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the database; connections are opened on first use."""
+        super().__init__(*args, **kwargs)
+        self._path = self.url[len("sqlite:///"):]
+        self._connections: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._opened = 0
+        self._open_lock = threading.Lock()
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection or open a new one, waiting when the pool is full."""
+        try:
+            return self._connections.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            if self._opened < self.pool_size:
+                conn = sqlite3.connect(
+                    f"file:{self._path}?mode=ro", uri=True, check_same_thread=False
+                )
+                conn.execute("PRAGMA query_only = ON")
+                self._opened += 1
+                return conn
+        return self._connections.get(timeout=self.timeout)
+
+    def _run(self, sql: str, params: Sequence[Any], limit: int) -> Tuple[List[str], List[tuple]]:
+        """Run a query on a pooled connection, interrupting it after the timeout."""
+        try:
+            conn = self._acquire()
+        except queue.Empty as e:
+            raise QueryTimeoutError(f"No connection was free within {self.timeout}s") from e
+        except sqlite3.Error as e:
+            raise QueryFailedError(f"The bookings database could not be opened: {e}") from e
+        deadline = time.monotonic() + self.timeout
+        # Called every 10k virtual machine instructions; a non-zero return aborts the query
+        conn.set_progress_handler(lambda: int(time.monotonic() > deadline), 10000)
+        try:
+            cursor = conn.execute(sql, list(params))
+            columns = [column[0] for column in cursor.description or []]
+            return columns, cursor.fetchmany(limit)
+        except sqlite3.Error as e:
+            if isinstance(e, sqlite3.OperationalError) and "interrupted" in str(e):
+                raise QueryTimeoutError(f"The query took longer than {self.timeout}s") from e
+            # Invalid SQL (unknown column, syntax error...)
+            raise QueryFailedError(f"The bookings database could not run the query: {e}") from e
+        finally:
+            conn.set_progress_handler(None, 0)
+            self._connections.put(conn)
+
+    async def _list_tables(self) -> List[str]:
+        """List the tables and views of the database."""
+        _, rows = await asyncio.to_thread(
+            self._run, "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')", [], 1000
+        )
+        return [row[0] for row in rows]
+
+    async def _full_scans(self, sql: str, params: Sequence[Any]) -> List[str]:
+        """Return the tables the query plan scans (SCAN steps, including covering index scans)."""
+        _, plan = await asyncio.to_thread(self._run, f"EXPLAIN QUERY PLAN {sql}", params, 1000)
+        tables = []
+        for row in plan:
+            match = re.match(r"SCAN (?:TABLE )?(\w+)", row[-1])
+            if match:
+                # The plan names aliased tables by their alias
+                name = match.group(1)
+                alias = re.search(
+                    rf"\b(?:from|join)\s+(\w+)\s+(?:as\s+)?{re.escape(name)}\b", sql, re.IGNORECASE
+                )
+                tables.append(alias.group(1) if alias else name)
+        return tables
+
+    async def _table_size(self, table: str) -> int:
+        """Count the rows of a table (0 for CTEs and subqueries)."""
+        _, rows = await asyncio.to_thread(
+            self._run,
+            "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = ?",
+            [table],
+            1,
+        )
+        if not rows[0][0]:
+            return 0
+        _, rows = await asyncio.to_thread(self._run, f'SELECT count(*) FROM "{table}"', [], 1)
+        return rows[0][0]
+
+    async def _fetch(
+        self, sql: str, params: Sequence[Any], limit: int
+    ) -> Tuple[List[str], List[tuple]]:
+        """Run a query in a worker thread."""
+        return await asyncio.to_thread(self._run, sql, params, limit)
+
+    async def aclose(self) -> None:
+        """Close the idle connections; new ones are opened on next use."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._open_lock:
+                self._opened -= 1
+
+
+def create_bookings_database(
+    url: str, pool_size: int, timeout: float, max_rows: int, max_scan_rows: int
+) -> Optional[BookingsDatabase]:
+    """
+    Create the bookings database for a URL.
+
+    Args:
+        url: postgresql:// DSN or sqlite:///path (empty disables the database)
+        pool_size: Maximum number of open connections
+        timeout: Statement timeout in seconds
+        max_rows: Maximum number of rows returned by a query
+        max_scan_rows: Reject plans that scan a table of more rows sequentially (0 disables)
+
+    Returns:
+        BookingsDatabase: Database for the URL, or None if no URL is configured
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url:
+        return None
+    scheme = urlparse(url).scheme
+    if scheme in ("postgres", "postgresql"):
+        backend = PostgresBookingsDatabase
+    elif scheme == "sqlite":
+        backend = SQLiteBookingsDatabase
+    else:
+        raise ValueError(f"Unsupported bookings database URL scheme: {scheme}")
+    return backend(url, pool_size, timeout, max_rows, max_scan_rows)
@@ -0,0 +1,504 @@
+"""
+Bookings SQL Analytics
+
+This module answers analytics questions (bookings, occupancy, revenue) from
+the bookings database instead of the hotel documents. The LLM translates the
+question into one SQL query with named parameters; the query is checked
+before it reaches the database:
+
+- a single SELECT / WITH statement, without comments
+- no data-modifying or session keywords and no server-side functions
+- only the tables of the bookings schema
+- every named parameter is provided, and values are scalars
+
+The query is then bound with the placeholder style of the backend and run
+read-only, with a timeout, a row cap and an EXPLAIN-based plan check (see
+agents.bookings_db). The result is rendered as a markdown table.
+
+When the database has the pre-aggregated views of bookings-db/src/db/aggregates.sql
+(daily occupancy and monthly revenue), they are added to the schema shown to
+the LLM, which is told to prefer them over the raw bookings rows. The metrics
+count queries and their latency per set of tables read, so the gain of the
+aggregates is visible.
+"""
+
+import json
+import re
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from util.logger_config import logger
+
+from agents.bookings_db import (
+    BookingsDatabase,
+    QueryFailedError,
+    QueryRejectedError,
+    QueryResult,
+    QueryTimeoutError,
+)
+from agents.hotel_retrieval import normalize_text
+
+# Tables the generated SQL may read, with their columns
+BOOKINGS_SCHEMA: Dict[str, Dict[str, str]] = {
+    "bookings": {
+        "id": "integer primary key",
+        "hotel_name": "text, e.g. 'Grand Victoria'",
+        "room_id": "text, floor-number, e.g. '01-004'",
+        "room_type": "text: 'Single', 'Double' or 'Triple'",
+        "room_category": "text: 'Standard' or 'Premium'",
+        "check_in_date": "date",
+        "check_out_date": "date (the room is free again that day)",
+        "total_nights": "integer",
+        "guest_first_name": "text",
+        "guest_last_name": "text",
+        "guest_email": "text",
+        "guest_phone": "text",
+        "guest_country": "text, country of the guest",
+        "guest_city": "text, city of the guest",
+        "guest_address": "text",
+        "guest_zip_code": "text",
+        "meal_plan": (
+            "text: 'Room Only', 'Room and Breakfast', 'Half Board', 'Full Board' or "
+            "'All Inclusive'"
+        ),
+        "total_price": "decimal, price of the whole stay in euros",
+    },
+    "hotel_daily_occupancy": {
+        "hotel_name": "text",
+        "stay_date": "date, one row per hotel and day, including days without guests",
+        "occupied_rooms": "integer, rooms occupied that night",
+        "total_rooms": "integer, rooms of the hotel",
+        "occupancy_rate": "decimal between 0 and 1, occupied_rooms / total_rooms",
+        "room_revenue": (
+            "decimal, revenue of that night in euros (stay price spread evenly over its nights)"
+        ),
+    },
+    "hotel_monthly_revenue": {
+        "hotel_name": "text",
+        "month": "date, first day of the check-in month",
+        "room_type": "text: 'Single', 'Double' or 'Triple'",
+        "meal_plan": "text, same values as bookings.meal_plan",
+        "bookings": "integer, bookings checking in that month",
+        "room_nights": "integer, nights of those bookings",
+        "revenue": "decimal, total price of those bookings in euros",
+    },
+}
+
+# Pre-aggregated views (bookings-db/src/db/aggregates.sql), used when present
+AGGREGATE_TABLES = ("hotel_daily_occupancy", "hotel_monthly_revenue")
+
+AGGREGATE_RULES = (
+    "\n"
+    "- Prefer the pre-aggregated tables, which are much faster than bookings: "
+    "hotel_daily_occupancy for occupancy, occupied rooms and nightly revenue by day; "
+    "hotel_monthly_revenue for bookings counts, room nights and revenue by month, room type or "
+    "meal plan\n"
+    "- Read bookings only for guest details, room categories or date ranges the aggregates can't "
+    "answer"
+)
+
+SQL_INSTRUCTIONS = (
+    "You translate questions about hotel bookings into one read-only {dialect} query.\n"
+    "\n"
+    "Schema:\n"
+    "{schema}\n"
+    "\n"
+    "Rules:\n"
+    "- Write a single SELECT (or WITH ... SELECT) statement over the tables above\n"
+    "- Use named parameters such as :hotel_name or :start_date for every value taken from the "
+    "question (hotel names, cities, countries, dates, meal plans, room types); never write those "
+    "values inline\n"
+    "- Pass dates as 'YYYY-MM-DD' strings\n"
+    "- A booking occupies its room from check_in_date (inclusive) to check_out_date (exclusive)\n"
+    "- Filter by hotel and/or date range whenever the question allows it\n"
+    "- Aggregate when the question asks for totals, counts or averages; select only the columns "
+    "needed, with readable aliases{aggregate_rules}\n"
+    "\n"
+    'Answer only with a JSON object: {{"sql": "...", "params": {{"name": "value"}}, '
+    '"explanation": "one sentence describing the result"}}'
+)
+
+# Metrics that are only in the bookings database: questions about them go to the SQL path
+METRIC_WORDS = {
+    "occupancy", "occupied", "revenue", "revenues", "income", "earned", "earnings", "sold",
+}
+
+# Words about bookings: questions with them go to the SQL path only when they ask for an
+# aggregate or a date range (e.g. not "the cancellation policy for bookings")
+BOOKING_WORDS = {"booking", "bookings", "booked", "reservation", "reservations", "reserved"}
+AGGREGATE_PATTERN = re.compile(
+    r"\b(?:how many|number of|count|total|average|avg|sum|most|least|busiest|top \d+)\b"
+)
+DATE_RANGE_PATTERN = re.compile(
+    r"\b(?:january|february|march|april|june|july|august|september|october|november|december"
+    r"|(?:in|of|during|since|until|from|to|before|after) may|(?:19|20)\d{2}|between|since"
+    r"|until|(?:last|this|next|per|each|every) (?:day|week|month|year|quarter)"
+    r"|daily|weekly|monthly|yearly|annual|today|yesterday|tomorrow|weekend)\b"
+)
+
+# Keywords that can't appear in a read-only query
+FORBIDDEN_KEYWORDS = {
+    "insert", "update", "delete", "merge", "upsert", "drop", "alter", "create",
+    "truncate", "grant", "revoke", "copy", "vacuum", "analyze", "reindex", "cluster", "call",
+    "do", "execute", "prepare", "deallocate", "listen", "notify", "set", "reset", "lock",
+    "attach", "detach", "pragma", "into", "begin", "commit", "rollback", "savepoint",
+}
+FORBIDDEN_FUNCTIONS = {
+    "current_setting", "set_config", "dblink", "load_extension", "readfile", "writefile",
+    "lo_import", "lo_export", "query_to_xml", "information_schema", "sqlite_master",
+    "sqlite_schema", "sqlite_temp_master",
+}
+
+LITERAL_OR_PARAMETER = re.compile(r"'(?:[^']|'')*'|(?<![:\w]):([A-Za-z_]\w*)")
+
+
+def is_analytics_question(question: str) -> bool:
+    """
+    Check whether a question asks for booking figures (counts, occupancy, revenue, date ranges).
+
+    Args:
+        question: User's question
+
+    Returns:
+        bool: True if the question should be answered from the bookings database
+    """
+    text = normalize_text(question)
+    words = set(text.split())
+    if words & METRIC_WORDS:
+        return True
+    return bool(words & BOOKING_WORDS) and bool(
+        AGGREGATE_PATTERN.search(text) or DATE_RANGE_PATTERN.search(text)
+    )
+
+
+def schema_tables(available: Iterable[str]) -> List[str]:
+    """
+    Select the schema tables present in the database.
+
+    Args:
+        available: Tables and views of the database
+
+    Returns:
+        list: Tables of BOOKINGS_SCHEMA found in the database, in schema order
+    """
+    available = {name.lower() for name in available}
+    return [table for table in BOOKINGS_SCHEMA if table in available]
+
+
+def build_sql_instructions(dialect: str, tables: Optional[Iterable[str]] = None) -> str:
+    """
+    Build the system prompt of the SQL generation step.
+
+    Args:
+        dialect: SQL dialect of the database ("PostgreSQL" or "SQLite")
+        tables: Schema tables to describe (all of BOOKINGS_SCHEMA by default)
+
+    Returns:
+        str: Instructions with the schema of the allowed tables
+    """
+    tables = list(BOOKINGS_SCHEMA) if tables is None else list(tables)
+    schema = "\n".join(
+        f"{table}(\n"
+        + ",\n".join(
+            f"  {column} -- {description}"
+            for column, description in BOOKINGS_SCHEMA[table].items()
+        )
+        + "\n)"
+        for table in tables
+    )
+    aggregate_rules = AGGREGATE_RULES if set(AGGREGATE_TABLES) & set(tables) else ""
+    return SQL_INSTRUCTIONS.format(dialect=dialect, schema=schema, aggregate_rules=aggregate_rules)
+
+
+def parse_sql_response(content: Any) -> Tuple[str, Dict[str, Any], str]:
+    """
+    Parse the JSON answer of the SQL generation step.
+
+    Args:
+        content: Message content returned by the LLM
+
+    Returns:
+        tuple: (sql, params, explanation)
+
+    Raises:
+        QueryRejectedError: If the answer is not the expected JSON object
+    """
+    if not isinstance(content, str):
+        # Some providers return a list of content parts
+        content = "".join(
+            part if isinstance(part, str) else part.get("text", "") for part in content
+        )
+    match = re.search(r"\{.*\}", content, re.DOTALL)
+    try:
+        data = json.loads(match.group(0)) if match else None
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get("sql"), str):
+        raise QueryRejectedError("Could not build a query for this question")
+    params = data.get("params") or {}
+    if not isinstance(params, dict):
+        raise QueryRejectedError("Query parameters must be a JSON object")
+    return data["sql"], params, str(data.get("explanation") or "")
+
+
+def _from_names(code: str) -> List[str]:
+    """Return the first name of every FROM list item (comma joins) and of every JOIN."""
+    from_lists = re.findall(
+        r"(?is)\bfrom\s+([^()]*?)(?=\b(?:where|group|order|limit|having|join|union|on)\b|\)|$)",
+        code,
+    )
+    return re.findall(r"(?i)\bjoin\s+([a-z_][\w.]*)", code) + [
+        item.split()[0]
+        for from_list in from_lists
+        for item in from_list.split(",")
+        if item.strip()
+    ]
+
+
+def referenced_tables(sql: str) -> List[str]:
+    """
+    Return the schema tables a query reads.
+
+    Args:
+        sql: SQL query
+
+    Returns:
+        list: Sorted names of the BOOKINGS_SCHEMA tables in its FROM and JOIN clauses
+    """
+    code = re.sub(r"'(?:[^']|'')*'", "''", sql)
+    return sorted({name.lower() for name in _from_names(code)} & set(BOOKINGS_SCHEMA))
+
+
+def prepare_sql(
+    sql: str, params: Dict[str, Any], paramstyle: str, tables: Optional[Iterable[str]] = None
+) -> Tuple[str, List[Any]]:
+    """
+    Validate a generated query and bind its named parameters.
+
+    Args:
+        sql: Query with named parameters (:name)
+        params: Parameter values by name
+        paramstyle: Placeholder style of the backend ("dollar" or "qmark")
+        tables: Schema tables the query may read (all of BOOKINGS_SCHEMA by default)
+
+    Returns:
+        tuple: (query with positional placeholders, parameter values in order)
+
+    Raises:
+        QueryRejectedError: If the query is not a safe read-only query over the schema
+    """
+    sql = sql.strip().rstrip(";").strip()
+    code = re.sub(r"'(?:[^']|'')*'", "''", sql)
+
+    if ";" in code or "--" in code or "/*" in code:
+        raise QueryRejectedError("Only a single statement without comments is allowed")
+    if not re.match(r"(?i)(select|with)\b", code):
+        raise QueryRejectedError("Only SELECT queries are allowed")
+
+    words = set(re.findall(r"[a-z_][a-z0-9_]*", code.lower()))
+    forbidden = sorted(
+        (words & (FORBIDDEN_KEYWORDS | FORBIDDEN_FUNCTIONS))
+        | {w for w in words if w.startswith("pg_")}
+    )
+    if forbidden:
+        raise QueryRejectedError(
+            f"Keywords not allowed in a read-only query: {', '.join(forbidden)}"
+        )
+
+    # FROM/JOIN may only name schema tables, CTEs, or columns (EXTRACT(... FROM column))
+    ctes = {
+        name.lower()
+        for name in re.findall(r"(?i)\b(\w+)\s*(?:\([\w\s,]*\))?\s+as\s*\(", code)
+    }
+    tables = set(BOOKINGS_SCHEMA) if tables is None else set(tables)
+    columns = {column for table in tables for column in BOOKINGS_SCHEMA[table]}
+    allowed = tables | ctes | columns
+    for name in _from_names(code):
+        if name.lower() not in allowed:
+            raise QueryRejectedError(f"Unknown table: {name}")
+
+    values: List[Any] = []
+    positions: Dict[str, int] = {}
+
+    def bind(match: re.Match) -> str:
+        name = match.group(1)
+        if name is None:
+            return match.group(0)
+        if name not in params:
+            raise QueryRejectedError(f"Missing value for parameter :{name}")
+        value = params[name]
+        if value is not None and not isinstance(value, (str, int, float, bool)):
+            raise QueryRejectedError(f"Parameter :{name} must be a single value")
+        if paramstyle == "dollar":
+            if name not in positions:
+                values.append(value)
+                positions[name] = len(values)
+            return f"${positions[name]}"
+        values.append(value)
+        return "?"
+
+    return LITERAL_OR_PARAMETER.sub(bind, sql), values
+
+
+def _format_value(value: Any) -> str:
+    """Render a result value in a markdown table cell."""
+    if value is None:
+        return ""
+    if isinstance(value, (float, Decimal)):
+        return f"{value:,.2f}"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value).replace("|", "\\|")
+
+
+def render_result(result: QueryResult, explanation: str, sql: str) -> str:
+    """
+    Render a query result as a markdown answer.
+
+    Args:
+        result: Query result
+        explanation: Description of the result written by the LLM
+        sql: Executed query, shown for transparency
+
+    Returns:
+        str: Markdown answer with the result table and the query
+    """
+    parts = [explanation] if explanation else []
+    if not result.rows:
+        parts.append("No bookings match the question.")
+    else:
+        parts.append(
+            "\n".join(
+                [
+                    "| " + " | ".join(result.columns) + " |",
+                    "|" + "---|" * len(result.columns),
+                ]
+                + [
+                    "| " + " | ".join(_format_value(value) for value in row) + " |"
+                    for row in result.rows
+                ]
+            )
+        )
+        if result.truncated:
+            parts.append(f"_Showing the first {len(result.rows)} rows._")
+    parts.append(f"```sql\n{sql}\n```")
+    return "\n\n".join(parts)
+
+
+class SQLStats:
+    """Thread-safe counters of the SQL analytics path."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._counters = {
+            "questions": 0,
+            "executed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "failed": 0,
+            "truncated": 0,
+        }
+        self._query_seconds = 0.0
+        self._rows = 0
+        # [queries, seconds] per set of tables read, e.g. "bookings" or "hotel_monthly_revenue"
+        self._by_tables: Dict[str, List[float]] = {}
+
+    def record(self, outcome: str, result: QueryResult = None, tables: Iterable[str] = ()) -> None:
+        """
+        Record the outcome of a question.
+
+        Args:
+            outcome: "executed", "rejected", "timeouts" or "failed"
+            result: Result of an executed query
+            tables: Schema tables read by the executed query
+        """
+        with self._lock:
+            self._counters["questions"] += 1
+            self._counters[outcome] += 1
+            if result is not None:
+                self._counters["truncated"] += int(result.truncated)
+                self._query_seconds += result.seconds
+                self._rows += len(result.rows)
+                entry = self._by_tables.setdefault("+".join(tables) or "none", [0, 0.0])
+                entry[0] += 1
+                entry[1] += result.seconds
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return the SQL path metrics.
+
+        Returns:
+            dict: Questions per outcome, average query latency in milliseconds,
+            average rows returned, and queries and latency per set of tables read
+        """
+        with self._lock:
+            executed = self._counters["executed"]
+            return {
+                **self._counters,
+                "avg_query_ms": self._query_seconds * 1000 / executed if executed else 0.0,
+                "avg_rows": self._rows / executed if executed else 0.0,
+                "by_tables": {
+                    tables: {"queries": queries, "avg_query_ms": seconds * 1000 / queries}
+                    for tables, (queries, seconds) in sorted(self._by_tables.items())
+                },
+            }
+
+
+# Shared counters used by the agents
+sql_stats = SQLStats()
+
+
+async def answer_with_sql(llm: Any, database: BookingsDatabase, question: str) -> str:
+    """
+    Answer an analytics question with a generated read-only SQL query.
+
+    Args:
+        llm: LangChain chat model
+        database: Bookings database
+        question: User's question
+
+    Returns:
+        str: Markdown answer with the query result
+
+    Raises:
+        QueryRejectedError: If the generated query or its plan is rejected
+        QueryTimeoutError: If the query exceeds the timeout
+        QueryFailedError: If the database can't list its tables or run the query
+    """
+    dialect = "PostgreSQL" if database.paramstyle == "dollar" else "SQLite"
+    try:
+        tables = schema_tables(await database.available_tables())
+        response = await llm.ainvoke([
+            SystemMessage(content=build_sql_instructions(dialect, tables)),
+            HumanMessage(content=question),
+        ])
+        sql, params, explanation = parse_sql_response(response.content)
+        bound_sql, values = prepare_sql(sql, params, database.paramstyle, tables)
+        logger.info(f"Bookings SQL: {bound_sql} {values}")
+        result = await database.execute(bound_sql, values)
+    except QueryRejectedError as e:
+        sql_stats.record("rejected")
+        logger.warning(f"Bookings SQL rejected: {e}")
+        raise
+    except QueryTimeoutError:
+        sql_stats.record("timeouts")
+        raise
+    except QueryFailedError as e:
+        sql_stats.record("failed")
+        logger.warning(f"Bookings SQL failed: {e}")
+        raise
+    except Exception:
+        sql_stats.record("failed")
+        raise
+
+    sql_stats.record("executed", result, referenced_tables(sql))
+    return render_result(result, explanation, sql.strip().rstrip(";"))
+
+
+def get_sql_stats() -> Dict[str, object]:
+    """Return metrics of the SQL analytics path."""
+    return sql_stats.stats()
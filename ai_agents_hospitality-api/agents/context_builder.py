@@ -0,0 +1,161 @@
+"""
+Hotel Context Builder
+
+This module builds the hotel context that is passed to the LLM prompt.
+The context (together with the hotel index used to filter it per question and
+the structured query engine) is rendered once per hotel data version and kept
+as an immutable cached artifact, so answering a question never re-serializes
+the hotel catalog.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict
+
+from util.configuration import settings
+from util.logger_config import logger
+
+from agents.context_encoder import CONTEXT_FORMAT_COMPACT, encode_hotels_compact
+from agents.hotel_query_engine import HotelQueryEngine
+from agents.hotel_retrieval import HotelIndex
+
+
+@dataclass(frozen=True)
+class HotelContext:
+    """Rendered hotel context for one version of the hotel data files."""
+
+    version: str
+    text: str
+    size_bytes: int
+    hotel_index: HotelIndex
+    query_engine: HotelQueryEngine
+    build_seconds: float
+
+
+def render_hotel_context(
+    hotels_data: dict, hotel_details_text: str, context_format: str = CONTEXT_FORMAT_COMPACT
+) -> str:
+    """
+    Render the full hotel context text sent to the LLM.
+
+    Args:
+        hotels_data: Parsed content of hotels.json
+        hotel_details_text: Content of hotel_details.md
+        context_format: "compact" (aggregated room tables) or "legacy"
+
+    Returns:
+        str: Context text in the compact format, or the markdown details
+        and the JSON summary in the legacy format
+    """
+    if context_format == CONTEXT_FORMAT_COMPACT:
+        return encode_hotels_compact(hotels_data)
+    return f"""
+{hotel_details_text}
+
+Hotels JSON Summary:
+{json.dumps(hotels_data, indent=2, ensure_ascii=False)}
+"""
+
+
+class HotelContextBuilder:
+    """
+    Cache of rendered hotel contexts keyed by data version.
+
+    Only the most recent versions are kept; older ones are evicted as soon as
+    a new version is built.
+    """
+
+    def __init__(self, max_versions: int = 2, context_format: str = CONTEXT_FORMAT_COMPACT):
+        """
+        Initialize the builder.
+
+        Args:
+            max_versions: Number of data versions to keep rendered in memory
+            context_format: Format of the rendered hotels ("compact" or "legacy")
+        """
+        self._max_versions = max_versions
+        self._context_format = context_format
+        self._contexts: OrderedDict[str, HotelContext] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_context(
+        self, version: str, hotels_data: dict, hotel_details_text: str
+    ) -> HotelContext:
+        """
+        Return the rendered context for a data version, building it on first use.
+
+        Args:
+            version: Version key of the hotel data
+            hotels_data: Parsed content of hotels.json
+            hotel_details_text: Content of hotel_details.md
+
+        Returns:
+            HotelContext: Cached rendered context
+        """
+        # Lock-free fast path: contexts are immutable once published
+        context = self._contexts.get(version)
+        if context is not None:
+            self._hits += 1
+            return context
+
+        with self._lock:
+            context = self._contexts.get(version)
+            if context is not None:
+                self._hits += 1
+                return context
+
+            self._misses += 1
+            start = time.perf_counter()
+            text = render_hotel_context(hotels_data, hotel_details_text, self._context_format)
+            hotel_index = HotelIndex(hotels_data, hotel_details_text, self._context_format)
+            context = HotelContext(
+                version=version,
+                text=text,
+                size_bytes=len(text.encode("utf-8")),
+                hotel_index=hotel_index,
+                query_engine=HotelQueryEngine(hotels_data, hotel_index),
+                build_seconds=time.perf_counter() - start,
+            )
+            self._contexts[version] = context
+            while len(self._contexts) > self._max_versions:
+                self._contexts.popitem(last=False)
+
+        logger.info(
+            f"Built hotel context for data version {version} "
+            f"({context.size_bytes} bytes in {context.build_seconds * 1000:.1f} ms)"
+        )
+        return context
+
+    def clear(self) -> None:
+        """Drop all cached contexts."""
+        with self._lock:
+            self._contexts.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return cache metrics.
+
+        Returns:
+            dict: Hits, misses, number of cached versions and their sizes in bytes
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "cached_versions": len(self._contexts),
+                "size_bytes": {v: c.size_bytes for v, c in self._contexts.items()},
+            }
+
+
+# Shared builder used by the agents
+context_builder = HotelContextBuilder(context_format=settings.HOTEL_CONTEXT_FORMAT)
+
+
+def get_context_stats() -> Dict[str, object]:
+    """Return metrics of the shared hotel context builder."""
+    return context_builder.stats()
@@ -0,0 +1,182 @@
+"""
+Compact Context Encoder
+
+This module renders hotels in a compact, token-efficient format for the LLM
+prompt. The legacy context contains every room twice (as a markdown bullet
+list in hotel_details.md and again as indented JSON); the compact format
+lists each hotel once, with identical rooms aggregated into a single table
+row (type, category, guests and prices) carrying the room count and the
+room IDs collapsed into ranges.
+"""
+
+import json
+from typing import Dict, Iterable, List, Tuple
+
+# Supported context formats
+CONTEXT_FORMAT_COMPACT = "compact"
+CONTEXT_FORMAT_LEGACY = "legacy"
+
+
+def _format_number(value) -> str:
+    """Render a number without a trailing ".0"."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def compress_room_ids(room_ids: Iterable[str]) -> str:
+    """
+    Collapse room IDs into ranges of consecutive rooms on the same floor.
+
+    Room IDs follow the "FF-NNN" pattern of the generator (floor, then room
+    number), e.g. ["01-001", "01-002", "01-003", "02-001"] -> "01-001..003, 02-001".
+    IDs that don't follow the pattern are listed as they are.
+
+    Args:
+        room_ids: Room IDs
+
+    Returns:
+        str: Comma separated IDs and ranges
+    """
+    parsed: List[Tuple[str, int, int, str]] = []
+    others: List[str] = []
+    for room_id in room_ids:
+        floor, sep, number = room_id.partition("-")
+        if sep and number.isdigit():
+            parsed.append((floor, int(number), len(number), room_id))
+        else:
+            others.append(room_id)
+
+    parts: List[str] = []
+    parsed.sort()
+    i = 0
+    while i < len(parsed):
+        floor, start, width, first_id = parsed[i]
+        end = start
+        while (
+            i + 1 < len(parsed)
+            and parsed[i + 1][0] == floor
+            and parsed[i + 1][1] == end + 1
+        ):
+            i += 1
+            end += 1
+        parts.append(first_id if end == start else f"{first_id}..{end:0{width}d}")
+        i += 1
+    return ", ".join(parts + sorted(others))
+
+
+def aggregate_rooms(rooms: List[dict]) -> List[Tuple[Tuple, List[str]]]:
+    """
+    Group identical rooms by type, category, guests and prices.
+
+    Args:
+        rooms: Rooms of a hotel from hotels.json
+
+    Returns:
+        list: (group key, room IDs) pairs ordered by type, category and price
+    """
+    groups: Dict[Tuple, List[str]] = {}
+    for room in rooms:
+        key = (
+            room.get("Type"),
+            room.get("Category"),
+            room.get("Guests"),
+            room.get("PriceOffSeason"),
+            room.get("PricePeakSeason"),
+        )
+        groups.setdefault(key, []).append(room.get("RoomId", ""))
+    return sorted(
+        groups.items(), key=lambda item: (str(item[0][0]), str(item[0][1]), item[0][3] or 0)
+    )
+
+
+def encode_hotel_compact(hotel: dict) -> str:
+    """
+    Render one hotel in the compact format.
+
+    Args:
+        hotel: Hotel dictionary from hotels.json
+
+    Returns:
+        str: Markdown section with the hotel, its pricing rules and room table
+    """
+    address = hotel.get("Address", {})
+    params = hotel.get("SyntheticParams", {})
+    lines = [
+        f"# {hotel['Name']} (key {hotel.get('hotelkey')})",
+        f"Location: {address.get('City')}, {address.get('Country')}; "
+        f"address: {address.get('Address')}, {address.get('ZipCode')}",
+    ]
+
+    meal_prices = params.get("MealPlanPrices")
+    if meal_prices:
+        multipliers = (
+            f"{plan} x{_format_number(factor)}" for plan, factor in meal_prices.items()
+        )
+        lines.append("Meal plan price multipliers: " + ", ".join(multipliers))
+    charges = []
+    if "ExtraBedChargePercentage" in params:
+        charges.append(f"extra bed +{params['ExtraBedChargePercentage']}%")
+    if "PromotionPriceDiscount" in params:
+        charges.append(f"promotion discount -{params['PromotionPriceDiscount']}%")
+    if charges:
+        lines.append("Charges: " + ", ".join(charges))
+
+    # Generation parameters, kept in one line for completeness
+    generation = []
+    if "OccupancyPeakSeasonWeight" in params:
+        generation.append(
+            f"occupancy weight peak {params['OccupancyPeakSeasonWeight']}/"
+            f"off {params.get('OccupancyOffSeasonWeight')}"
+        )
+    if "OccupancyBaseDiscountPercentage" in params:
+        generation.append(f"occupancy base discount {params['OccupancyBaseDiscountPercentage']}%")
+    meal_weights = params.get("MealPlanWeights")
+    if meal_weights:
+        generation.append(
+            "meal plan weights "
+            + ", ".join(
+                f"{plan.get('name', key)} {_format_number(plan.get('weight'))}"
+                for key, plan in meal_weights.items()
+            )
+        )
+    if generation:
+        lines.append("Booking generation: " + "; ".join(generation))
+
+    rooms = hotel.get("Rooms", [])
+    lines.append(f"Rooms ({len(rooms)}; room ID = floor-number):")
+    lines.append("| Type | Category | Guests | Off season | Peak season | Count | Room IDs |")
+    lines.append("|---|---|---|---|---|---|---|")
+    for (room_type, category, guests, price_off, price_peak), room_ids in aggregate_rooms(rooms):
+        lines.append(
+            f"| {room_type} | {category} | {guests} | {_format_number(price_off)} | "
+            f"{_format_number(price_peak)} | {len(room_ids)} | {compress_room_ids(room_ids)} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def encode_hotel_legacy(hotel: dict, hotel_details: str) -> str:
+    """
+    Render one hotel in the legacy format (markdown details plus indented JSON).
+
+    Args:
+        hotel: Hotel dictionary from hotels.json
+        hotel_details: Markdown section of the hotel from hotel_details.md
+
+    Returns:
+        str: Hotel context segment
+    """
+    return f"{hotel_details}\n\nHotel JSON:\n{json.dumps(hotel, indent=2, ensure_ascii=False)}\n"
+
+
+def encode_hotels_compact(hotels_data: dict) -> str:
+    """
+    Render every hotel in the compact format.
+
+    Args:
+        hotels_data: Parsed content of hotels.json
+
+    Returns:
+        str: Context text with one section per hotel
+    """
+    return "\n".join(encode_hotel_compact(hotel) for hotel in hotels_data.get("Hotels", []))
@@ -0,0 +1,775 @@
+"""
+Document Index
+
+This module implements a local retrieval index over the markdown files written
+by the bookings-db generator (hotel_details.md, hotel_rooms.md and
+hotel_bookings.md). The files are split into heading-aware chunks, embedded on
+CPU and stored on disk:
+
+- Embeddings come from a sentence-transformers model when one is configured
+  and installed; otherwise chunks are encoded as hashed TF-IDF vectors (word
+  unigrams and bigrams), which need nothing beyond NumPy.
+- The vector matrix is saved as a .npy file and memory-mapped, so the index
+  doesn't have to fit in the process heap and is shared by the page cache.
+- Queries are answered with a brute-force NumPy top-k; large indexes can also
+  use an approximate inverted-file (IVF) index that only scores the chunks of
+  the clusters nearest to the query.
+- Re-indexing is incremental: only the files whose content changed are
+  chunked and embedded again, the vectors of the other files are copied over.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from util.configuration import PROJECT_ROOT, settings
+from util.logger_config import logger
+
+from agents.hotel_retrieval import normalize_text
+
+# Generator outputs indexed by default
+DOCUMENT_FILENAMES = ("hotel_details.md", "hotel_rooms.md", "hotel_bookings.md")
+
+MANIFEST_FILENAME = "manifest.json"
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*\S)\s*$")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\|[\s:|-]+\|$")
+
+# Weight of the chunk title (document kind and headings) added to the chunk vector, so a
+# table of bookings still matches the hotel it belongs to
+TITLE_WEIGHT = 0.5
+
+
+@dataclass(frozen=True)
+class DocumentChunk:
+    """Piece of a document stored in the index."""
+
+    source: str
+    title: str
+    text: str
+
+
+@dataclass(frozen=True)
+class DocumentMatch:
+    """Chunk returned by a search, with its similarity to the query."""
+
+    chunk: DocumentChunk
+    score: float
+
+
+def chunk_markdown(text: str, source: str, max_chars: int) -> List[DocumentChunk]:
+    """
+    Split a markdown document into chunks of at most about max_chars characters.
+
+    Chunks break at line boundaries, preferably at headings. Every chunk starts
+    with the headings it belongs to (e.g. the hotel name), and chunks that
+    continue a table repeat its header row, so each chunk can be understood
+    on its own.
+
+    Args:
+        text: Markdown content
+        source: Name of the document
+        max_chars: Target maximum size of a chunk
+
+    Returns:
+        list: Chunks in document order
+    """
+    chunks: List[DocumentChunk] = []
+    headings: Dict[int, str] = {}
+    table_header: List[str] = []
+    piece: List[str] = []
+    prefix: List[str] = []
+    title_headings: Dict[int, str] = {}
+    piece_chars = 0
+    has_content = False
+
+    def flush() -> None:
+        nonlocal piece, prefix, piece_chars, has_content
+        if has_content:
+            title = " > ".join(
+                HEADING_PATTERN.match(title_headings[level]).group(2)
+                for level in sorted(title_headings)
+            )
+            chunks.append(DocumentChunk(source, title, "\n".join(prefix + piece).strip()))
+        piece, prefix, piece_chars, has_content = [], [], 0, False
+
+    def start_piece(extra_prefix: List[str]) -> None:
+        nonlocal prefix, title_headings
+        prefix = [headings[level] for level in sorted(headings)] + extra_prefix
+        title_headings = dict(headings)
+
+    for line in text.splitlines():
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            if has_content and piece_chars >= max_chars // 2:
+                flush()
+            level = len(heading.group(1))
+            for deeper in [lvl for lvl in headings if lvl >= level]:
+                del headings[deeper]
+            table_header = []
+            if not piece:
+                start_piece([])
+            headings[level] = line
+            if not has_content:
+                title_headings = dict(headings)
+            piece.append(line)
+            piece_chars += len(line) + 1
+            continue
+
+        if line.startswith("|"):
+            in_header = not table_header or (
+                len(table_header) == 1 and TABLE_SEPARATOR_PATTERN.match(line.strip())
+            )
+            if in_header:
+                table_header.append(line)
+        else:
+            in_header = False
+            if line.strip():
+                table_header = []
+
+        if has_content and piece_chars + len(line) + 1 > max_chars:
+            flush()
+        if not piece:
+            # A chunk starting inside a table repeats the table header
+            start_piece([] if in_header else list(table_header))
+        piece.append(line)
+        piece_chars += len(line) + 1
+        has_content = has_content or bool(line.strip())
+
+    flush()
+    return chunks
+
+
+def _tokens(text: str) -> List[str]:
+    """Return the word unigrams and bigrams of a text."""
+    words = normalize_text(text).split()
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:], strict=False)]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a matrix in place."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class HashingTfidfEmbedder:
+    """
+    Hashed TF-IDF vectors computed with NumPy.
+
+    Terms are hashed into a fixed number of dimensions with CRC32 (stable
+    across processes), so document vectors only depend on the document and
+    can be reused when other files change. Document vectors hold sublinear
+    term frequencies; the inverse document frequencies of the index are
+    applied to the query vector at search time.
+    """
+
+    # Query vectors are weighted by the inverse document frequencies of the index
+    uses_idf = True
+
+    def __init__(self, dim: int):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Number of hash dimensions
+        """
+        self.dim = dim
+        self.name = f"hashing-tfidf-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: L2-normalized float32 vectors, one row per text
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(
+                zlib.crc32(token.encode("utf-8")) % self.dim for token in _tokens(text)
+            )
+            if counts:
+                columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+                frequencies = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+                matrix[row, columns] = 1.0 + np.log(frequencies)
+        return _normalize_rows(matrix)
+
+
+class SentenceTransformerEmbedder:
+    """Dense embeddings from a local sentence-transformers model run on CPU."""
+
+    uses_idf = False
+
+    def __init__(self, model_name: str):
+        """
+        Load the model.
+
+        Args:
+            model_name: sentence-transformers model name or path
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers:{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: L2-normalized float32 vectors, one row per text
+        """
+        vectors = self._model.encode(
+            list(texts), batch_size=32, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+def create_embedder(model_name: str, dim: int):
+    """
+    Create the embedder of the index.
+
+    Args:
+        model_name: sentence-transformers model (empty for hashed TF-IDF)
+        dim: Dimensions of the hashed TF-IDF vectors
+
+    Returns:
+        Embedder: Local model embedder, or the hashed TF-IDF fallback
+    """
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except ImportError:
+            logger.warning(
+                f"sentence-transformers is not installed, embedding model {model_name} "
+                f"unavailable: using hashed TF-IDF vectors"
+            )
+    return HashingTfidfEmbedder(dim)
+
+
+def embed_chunks(embedder, chunks: Sequence[DocumentChunk]) -> np.ndarray:
+    """
+    Embed chunks, boosting their title.
+
+    Args:
+        embedder: Embedder of the index
+        chunks: Chunks to embed
+
+    Returns:
+        np.ndarray: L2-normalized float32 vectors, one row per chunk
+    """
+    if not chunks:
+        return np.zeros((0, embedder.dim), dtype=np.float32)
+    texts = embedder.embed([chunk.text for chunk in chunks])
+    titles = embedder.embed(
+        [f"{Path(chunk.source).stem.replace('_', ' ')}: {chunk.title}" for chunk in chunks]
+    )
+    return _normalize_rows(texts + TITLE_WEIGHT * titles)
+
+
+@dataclass(frozen=True)
+class IVFIndex:
+    """
+    Inverted-file index: chunks clustered with spherical k-means.
+
+    A search only scores the chunks of the nprobe clusters whose centroids
+    are closest to the query.
+    """
+
+    centroids: np.ndarray
+    order: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def build(
+        cls, vectors: np.ndarray, num_lists: int, iterations: int = 10, seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Cluster the vectors.
+
+        Args:
+            vectors: L2-normalized vectors
+            num_lists: Number of clusters
+            iterations: k-means iterations
+            seed: Seed of the initial centroids
+
+        Returns:
+            IVFIndex: New index
+        """
+        data = np.asarray(vectors)
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(data), size=num_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, data)
+            # Empty clusters keep their previous centroid
+            filled = np.bincount(assignments, minlength=num_lists) > 0
+            centroids[filled] = _normalize_rows(sums[filled])
+        assignments = np.argmax(data @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=num_lists))))
+        return cls(centroids=centroids, order=order, offsets=offsets)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """
+        Return the rows of the clusters nearest to a query.
+
+        Args:
+            query: Query vector
+            nprobe: Number of clusters to scan
+
+        Returns:
+            np.ndarray: Row numbers of the candidate chunks (empty if all clusters are)
+        """
+        # k-means can leave clusters empty: only probe the clusters that hold chunks
+        filled = np.flatnonzero(np.diff(self.offsets) > 0)
+        nearest = filled[np.argsort(-(self.centroids[filled] @ query), kind="stable")[:nprobe]]
+        if not len(nearest):
+            return self.order[:0]
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in nearest])
+
+    def save(self, path: Path) -> None:
+        """Save the index to an .npz file."""
+        np.savez(path, centroids=self.centroids, order=self.order, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        """Load an index saved with save()."""
+        with np.load(path) as data:
+            return cls(centroids=data["centroids"], order=data["order"], offsets=data["offsets"])
+
+
+@dataclass(frozen=True)
+class _IndexState:
+    """Immutable view of one generation of the on-disk index."""
+
+    generation: str
+    files: Dict[str, dict]
+    chunks: List[DocumentChunk]
+    vectors: np.ndarray
+    idf: Optional[np.ndarray]
+    ivf: Optional[IVFIndex]
+
+
+def _file_signature(path: Path) -> str:
+    """Return a cheap change marker of a file (modification time and size)."""
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class DocumentIndex:
+    """
+    On-disk vector index over the generator's markdown files.
+
+    Searches read an immutable snapshot of the index, so they never wait for a
+    re-index running in the background.
+    """
+
+    def __init__(
+        self,
+        index_path: Path,
+        embedding_model: str = "",
+        dim: int = 4096,
+        chunk_chars: int = 1500,
+        approximate_min_chunks: int = 5000,
+        nprobe: int = 8,
+        filenames: Sequence[str] = DOCUMENT_FILENAMES,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            index_path: Directory holding the index files
+            embedding_model: sentence-transformers model (empty for hashed TF-IDF)
+            dim: Dimensions of the hashed TF-IDF vectors
+            chunk_chars: Target maximum size of a chunk in characters
+            approximate_min_chunks: Build the approximate index from this many chunks
+                (0 disables it)
+            nprobe: Clusters scanned by an approximate search
+            filenames: Names of the documents to index
+        """
+        self._index_path = Path(index_path)
+        self._embedding_model = embedding_model
+        self._dim = dim
+        self._chunk_chars = chunk_chars
+        self._approximate_min_chunks = approximate_min_chunks
+        self._nprobe = nprobe
+        self._filenames = tuple(filenames)
+        self._embedder = None
+        self._state: Optional[_IndexState] = None
+        self._lock = threading.Lock()
+        # Background re-indexing: the worker indexes the most recently requested directory
+        self._schedule_lock = threading.Lock()
+        self._pending_path: Optional[Path] = None
+        self._worker: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._builds = 0
+        self._reembedded_files = 0
+        self._reused_files = 0
+        self._last_build_seconds = 0.0
+        self._queries = 0
+        self._approximate_queries = 0
+        self._query_seconds = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been loaded or built."""
+        return self._state is not None
+
+    def _get_embedder(self):
+        """Create the embedder on first use (loading a model is slow)."""
+        if self._embedder is None:
+            self._embedder = create_embedder(self._embedding_model, self._dim)
+        return self._embedder
+
+    def _compute_idf(self, vectors: np.ndarray) -> Optional[np.ndarray]:
+        """Compute the smoothed inverse document frequencies of the index."""
+        if not self._get_embedder().uses_idf:
+            return None
+        doc_freq = np.count_nonzero(vectors, axis=0)
+        return (np.log((1 + len(vectors)) / (1 + doc_freq)) + 1).astype(np.float32)
+
+    def _load_state(self) -> Optional[_IndexState]:
+        """Load the index saved on disk, if it was built with the current embedder."""
+        manifest_file = self._index_path / MANIFEST_FILENAME
+        if not manifest_file.exists():
+            return None
+        try:
+            with open(manifest_file, encoding="utf-8") as f:
+                manifest = json.load(f)
+            embedder = self._get_embedder()
+            if (manifest.get("embedder") != embedder.name
+                    or manifest.get("chunk_chars") != self._chunk_chars):
+                logger.info("Document index was built with other settings: rebuilding it")
+                return None
+            generation = manifest["generation"]
+            vectors = np.load(self._index_path / f"vectors-{generation}.npy", mmap_mode="r")
+            ivf_file = self._index_path / f"ivf-{generation}.npz"
+            return _IndexState(
+                generation=generation,
+                files=manifest["files"],
+                chunks=[DocumentChunk(**chunk) for chunk in manifest["chunks"]],
+                vectors=vectors,
+                idf=self._compute_idf(vectors),
+                ivf=IVFIndex.load(ivf_file) if ivf_file.exists() else None,
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load the document index, rebuilding it: {e}")
+            return None
+
+    def load(self) -> bool:
+        """
+        Load the index saved on disk without checking the documents.
+
+        Returns:
+            bool: True if an index was loaded
+        """
+        with self._lock:
+            if self._state is None:
+                self._state = self._load_state()
+            return self._state is not None
+
+    def refresh(self, data_path: Path) -> bool:
+        """
+        Bring the index up to date with the documents of a directory.
+
+        Only the files whose content changed are chunked and embedded again.
+
+        Args:
+            data_path: Directory holding the documents
+
+        Returns:
+            bool: True if a new generation of the index was written
+        """
+        with self._lock:
+            start = time.perf_counter()
+            state = self._state or self._load_state()
+            old_files = state.files if state else {}
+            embedder = self._get_embedder()
+
+            files: Dict[str, dict] = {}
+            blocks = []
+            reused = reembedded = 0
+            for name in self._filenames:
+                path = Path(data_path) / name
+                if not path.exists():
+                    continue
+                signature = _file_signature(path)
+                old = old_files.get(name)
+                if old is not None and old["signature"] == signature:
+                    files[name] = dict(old)
+                    blocks.append(("reuse", old))
+                    reused += 1
+                    continue
+
+                text = path.read_text(encoding="utf-8")
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if old is not None and old["sha256"] == digest:
+                    # Touched but unchanged
+                    files[name] = {**old, "signature": signature}
+                    blocks.append(("reuse", old))
+                    reused += 1
+                    continue
+
+                chunks = chunk_markdown(text, name, self._chunk_chars)
+                files[name] = {"signature": signature, "sha256": digest, "count": len(chunks)}
+                blocks.append(("new", (chunks, embed_chunks(embedder, chunks))))
+                reembedded += 1
+
+            if state is not None and reembedded == 0 and set(files) == set(old_files):
+                if files != old_files:
+                    self._write_manifest(state.generation, files, state.chunks, embedder)
+                    state = _IndexState(
+                        state.generation, files, state.chunks, state.vectors, state.idf, state.ivf
+                    )
+                self._state = state
+                return False
+
+            new_state = self._write_generation(state, files, blocks, embedder)
+            self._state = new_state
+            self._remove_old_generations(new_state.generation)
+            elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            self._builds += 1
+            self._reembedded_files += reembedded
+            self._reused_files += reused
+            self._last_build_seconds = elapsed
+        logger.info(
+            f"Document index updated: {len(new_state.chunks)} chunks from {len(files)} files "
+            f"({reembedded} re-embedded, {reused} reused) in {elapsed:.2f}s"
+        )
+        return True
+
+    def _write_generation(
+        self, state: Optional[_IndexState], files: Dict[str, dict], blocks, embedder
+    ) -> _IndexState:
+        """Write the vectors, IVF index and manifest of a new generation (lock must be held)."""
+        self._index_path.mkdir(parents=True, exist_ok=True)
+        generation = uuid.uuid4().hex[:12]
+        total = sum(entry["count"] for entry in files.values())
+
+        chunks: List[DocumentChunk] = []
+        vectors_file = self._index_path / f"vectors-{generation}.npy"
+        matrix = np.lib.format.open_memmap(
+            vectors_file, mode="w+", dtype=np.float32, shape=(total, embedder.dim)
+        )
+        row = 0
+        for (kind, payload), name in zip(blocks, files, strict=True):
+            if kind == "reuse":
+                start, count = payload["start"], payload["count"]
+                matrix[row:row + count] = state.vectors[start:start + count]
+                chunks.extend(state.chunks[start:start + count])
+            else:
+                new_chunks, new_vectors = payload
+                count = len(new_chunks)
+                matrix[row:row + count] = new_vectors
+                chunks.extend(new_chunks)
+            files[name]["start"] = row
+            row += count
+        matrix.flush()
+        del matrix
+
+        vectors = np.load(vectors_file, mmap_mode="r")
+        ivf = None
+        if self._approximate_min_chunks > 0 and total >= self._approximate_min_chunks:
+            ivf = IVFIndex.build(vectors, num_lists=max(1, int(math.sqrt(total))))
+            ivf.save(self._index_path / f"ivf-{generation}.npz")
+
+        # The manifest is replaced last, so a crash never leaves a half-written index
+        self._write_manifest(generation, files, chunks, embedder)
+        return _IndexState(generation, files, chunks, vectors, self._compute_idf(vectors), ivf)
+
+    def _write_manifest(
+        self, generation: str, files: Dict[str, dict], chunks: List[DocumentChunk], embedder
+    ) -> None:
+        """Atomically replace the manifest."""
+        manifest = {
+            "generation": generation,
+            "embedder": embedder.name,
+            "chunk_chars": self._chunk_chars,
+            "files": files,
+            "chunks": [chunk.__dict__ for chunk in chunks],
+        }
+        tmp_file = self._index_path / f"{MANIFEST_FILENAME}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_file, self._index_path / MANIFEST_FILENAME)
+
+    def _remove_old_generations(self, generation: str) -> None:
+        """Delete the files of previous generations (open memory maps stay valid)."""
+        for pattern in ("vectors-*.npy", "ivf-*.npz"):
+            for path in self._index_path.glob(pattern):
+                if generation not in path.name:
+                    try:
+                        path.unlink()
+                    except OSError as e:
+                        logger.debug(f"Could not delete old index file {path}: {e}")
+
+    def schedule_refresh(self, data_path: Path) -> None:
+        """
+        Refresh the index in a background thread.
+
+        Requests made while a refresh is running are coalesced into one more run.
+
+        Args:
+            data_path: Directory holding the documents
+        """
+        with self._schedule_lock:
+            self._pending_path = Path(data_path)
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._run_refreshes, name="document-indexer", daemon=True
+            )
+            self._worker.start()
+
+    def _run_refreshes(self) -> None:
+        """Run the scheduled refreshes until none is pending."""
+        while True:
+            with self._schedule_lock:
+                data_path, self._pending_path = self._pending_path, None
+                if data_path is None:
+                    self._worker = None
+                    return
+            try:
+                self.refresh(data_path)
+            except Exception as e:
+                logger.error(f"Document index refresh failed: {e}", exc_info=True)
+
+    def _query_vector(self, state: _IndexState, query: str) -> np.ndarray:
+        """Embed a query and weight it with the inverse document frequencies."""
+        vector = self._get_embedder().embed([query])[0]
+        if state.idf is not None:
+            vector = vector * state.idf
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector /= norm
+        return vector
+
+    def search(
+        self, query: str, top_k: int, approximate: Optional[bool] = None
+    ) -> List[DocumentMatch]:
+        """
+        Return the chunks most similar to a query.
+
+        Args:
+            query: Search text
+            top_k: Number of chunks to return
+            approximate: Use the approximate index (None: when it has been built)
+
+        Returns:
+            list: Matches ordered by decreasing score (empty if the index isn't ready)
+        """
+        state = self._state
+        if state is None or not state.chunks or top_k <= 0:
+            return []
+
+        start = time.perf_counter()
+        query_vector = self._query_vector(state, query)
+        use_ivf = state.ivf is not None and approximate is not False
+        rows = state.ivf.candidates(query_vector, self._nprobe) if use_ivf else None
+        if rows is not None and len(rows):
+            scores = state.vectors[rows] @ query_vector
+        else:
+            # No candidates: fall back to the exact scan
+            use_ivf = False
+            rows = None
+            scores = state.vectors @ query_vector
+
+        k = min(top_k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        matches = [
+            DocumentMatch(state.chunks[int(rows[i] if rows is not None else i)], float(scores[i]))
+            for i in top
+        ]
+
+        with self._stats_lock:
+            self._queries += 1
+            self._approximate_queries += int(use_ivf)
+            self._query_seconds += time.perf_counter() - start
+        return matches
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return index metrics.
+
+        Returns:
+            dict: Size of the index, build counters and average query latency in milliseconds
+        """
+        state = self._state
+        with self._stats_lock:
+            return {
+                "ready": state is not None,
+                "embedder": self._embedder.name if self._embedder else None,
+                "chunks": len(state.chunks) if state else 0,
+                "files": (
+                    {name: entry["count"] for name, entry in state.files.items()} if state else {}
+                ),
+                "approximate": state is not None and state.ivf is not None,
+                "builds": self._builds,
+                "reembedded_files": self._reembedded_files,
+                "reused_files": self._reused_files,
+                "last_build_seconds": self._last_build_seconds,
+                "queries": self._queries,
+                "approximate_queries": self._approximate_queries,
+                "avg_query_ms": (
+                    self._query_seconds * 1000 / self._queries if self._queries else 0.0
+                ),
+            }
+
+
+def format_matches(matches: Sequence[DocumentMatch]) -> str:
+    """
+    Render search matches as a prompt context.
+
+    Args:
+        matches: Search matches
+
+    Returns:
+        str: Chunks separated by their source document
+    """
+    return "\n\n".join(f"[Source: {match.chunk.source}]\n{match.chunk.text}" for match in matches)
+
+
+# Shared index used by the agents
+document_index = DocumentIndex(
+    index_path=Path(settings.DOCUMENT_INDEX_PATH) if settings.DOCUMENT_INDEX_PATH
+    else PROJECT_ROOT / "data" / "document_index",
+    embedding_model=settings.DOCUMENT_INDEX_EMBEDDING_MODEL,
+    dim=settings.DOCUMENT_INDEX_DIM,
+    chunk_chars=settings.DOCUMENT_INDEX_CHUNK_CHARS,
+    approximate_min_chunks=settings.DOCUMENT_INDEX_APPROXIMATE_MIN_CHUNKS,
+    nprobe=settings.DOCUMENT_INDEX_NPROBE,
+)
+
+
+def get_document_index_stats() -> Dict[str, object]:
+    """Return metrics of the shared document index."""
+    return document_index.stats()
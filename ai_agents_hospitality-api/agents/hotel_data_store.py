@@ -0,0 +1,324 @@
+"""
+Hotel Data Store
+
+This module keeps the hotel data files (hotels.json and hotel_details.md) in
+memory as immutable, versioned snapshots. A background watcher polls the data
+directory and, when the files are regenerated, loads and validates the new
+version and atomically swaps it in. Readers just take a reference to the
+current snapshot, so the read path never waits on a lock and in-flight
+requests finish on the version they started with.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from util.logger_config import logger
+
+HOTELS_JSON_FILENAME = "hotels.json"
+HOTEL_DETAILS_FILENAME = "hotel_details.md"
+
+
+@dataclass(frozen=True)
+class HotelDataSnapshot:
+    """Immutable view of one version of the hotel data files."""
+
+    version: str
+    hotels_data: dict
+    hotel_details_text: str
+    data_path: Path
+    loaded_at: float
+
+    @property
+    def hotels(self) -> List[dict]:
+        """List of hotels contained in the snapshot."""
+        return self.hotels_data.get("Hotels", [])
+
+
+def compute_data_version(*files: Path) -> str:
+    """
+    Compute a version key for a set of data files.
+
+    The key is derived from the name, modification time and size of each file,
+    so it changes whenever any of the files is regenerated.
+
+    Args:
+        *files: Paths of the files that make up the data set
+
+    Returns:
+        str: Short hexadecimal version key
+    """
+    digest = hashlib.sha256()
+    for file_path in files:
+        stat = file_path.stat()
+        digest.update(f"{file_path.name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()[:16]
+
+
+def validate_hotel_data(hotels_data: dict, hotel_details_text: str) -> None:
+    """
+    Validate the content of the hotel data files.
+
+    Args:
+        hotels_data: Parsed content of hotels.json
+        hotel_details_text: Content of hotel_details.md
+
+    Raises:
+        ValueError: If the data is incomplete or malformed
+    """
+    hotels = hotels_data.get("Hotels") if isinstance(hotels_data, dict) else None
+    if not isinstance(hotels, list) or not hotels:
+        raise ValueError(f"{HOTELS_JSON_FILENAME} must contain a non-empty 'Hotels' list")
+    for hotel in hotels:
+        missing = [key for key in ("Name", "Address", "Rooms") if key not in hotel]
+        if missing:
+            raise ValueError(
+                f"Hotel {hotel.get('Name', '<unnamed>')} is missing fields: {', '.join(missing)}"
+            )
+    if not hotel_details_text.strip():
+        raise ValueError(f"{HOTEL_DETAILS_FILENAME} is empty")
+
+
+class HotelDataStore:
+    """
+    Versioned store of the hotel data with background hot-reload.
+
+    The store looks for the data files in the local path first (Docker) and
+    then in the external path (local development).
+    """
+
+    def __init__(self, local_path: Path, external_path: Path):
+        """
+        Initialize the store.
+
+        Args:
+            local_path: Data directory inside the API project
+            external_path: Data directory of the bookings-db generator output
+        """
+        self._local_path = local_path
+        self._external_path = external_path
+        self._snapshot: Optional[HotelDataSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._listeners: List[Callable[[HotelDataSnapshot], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._rejected_version: Optional[str] = None
+        self._reloads = 0
+        self._failed_reloads = 0
+
+    def _get_data_path(self) -> Path:
+        """
+        Determine the directory holding the hotel data files.
+
+        Returns:
+            Path: Local path if it contains hotels.json, external path otherwise
+        """
+        if (self._local_path / HOTELS_JSON_FILENAME).exists():
+            return self._local_path
+        return self._external_path
+
+    def _check_files_exist(self, data_path: Path) -> None:
+        """
+        Check that both data files exist.
+
+        Raises:
+            FileNotFoundError: If one of the hotel data files doesn't exist
+        """
+        for filename in (HOTELS_JSON_FILENAME, HOTEL_DETAILS_FILENAME):
+            if not (data_path / filename).exists():
+                raise FileNotFoundError(
+                    f"Hotel data file not found: {data_path / filename}\n"
+                    f"Tried paths:\n"
+                    f"  - Local: {self._local_path / filename}\n"
+                    f"  - External: {self._external_path / filename}\n"
+                    f"Please generate hotel data first:\n"
+                    f"cd bookings-db && python src/gen_synthetic_hotels.py --num_hotels 3\n"
+                    f"Or copy files to: {self._local_path}"
+                )
+
+    def _load_snapshot(self, data_path: Path, version: str) -> HotelDataSnapshot:
+        """
+        Read and validate the data files into a new snapshot.
+
+        Raises:
+            json.JSONDecodeError: If hotels.json is invalid
+            ValueError: If the data fails validation or changed while being read
+        """
+        hotels_json_file = data_path / HOTELS_JSON_FILENAME
+        hotel_details_file = data_path / HOTEL_DETAILS_FILENAME
+
+        logger.info(f"Loading hotel data from {hotels_json_file}")
+        with open(hotels_json_file, encoding="utf-8") as f:
+            hotels_data = json.load(f)
+
+        logger.info(f"Loading hotel details from {hotel_details_file}")
+        with open(hotel_details_file, encoding="utf-8") as f:
+            hotel_details_text = f.read()
+
+        # Files still being written by the generator: retry on the next poll
+        if compute_data_version(hotels_json_file, hotel_details_file) != version:
+            raise ValueError("Hotel data files changed while being loaded")
+
+        validate_hotel_data(hotels_data, hotel_details_text)
+
+        return HotelDataSnapshot(
+            version=version,
+            hotels_data=hotels_data,
+            hotel_details_text=hotel_details_text,
+            data_path=data_path,
+            loaded_at=time.time(),
+        )
+
+    def current(self) -> HotelDataSnapshot:
+        """
+        Return the current snapshot, loading it on first use.
+
+        Returns:
+            HotelDataSnapshot: Current version of the hotel data
+
+        Raises:
+            FileNotFoundError: If hotel data files don't exist
+            json.JSONDecodeError: If hotels.json is invalid
+            ValueError: If the data fails validation
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._load_lock:
+            if self._snapshot is None:
+                data_path = self._get_data_path()
+                logger.info(f"Using hotel data path: {data_path}")
+                self._check_files_exist(data_path)
+                version = compute_data_version(
+                    data_path / HOTELS_JSON_FILENAME, data_path / HOTEL_DETAILS_FILENAME
+                )
+                self._publish(self._load_snapshot(data_path, version))
+            return self._snapshot
+
+    async def acurrent(self) -> HotelDataSnapshot:
+        """
+        Async variant of current() for the event loop.
+
+        Once a snapshot is published this returns immediately; the first load
+        reads the files in a worker thread so the event loop is never blocked
+        on file I/O.
+
+        Returns:
+            HotelDataSnapshot: Current version of the hotel data
+
+        Raises:
+            FileNotFoundError: If hotel data files don't exist
+            json.JSONDecodeError: If hotels.json is invalid
+            ValueError: If the data fails validation
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        return await asyncio.to_thread(self.current)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Load a new snapshot if the data files changed since the current one.
+
+        The current snapshot is kept when the new files are missing or invalid.
+
+        Returns:
+            bool: True if a new snapshot was swapped in
+        """
+        with self._load_lock:
+            data_path = self._get_data_path()
+            version = None
+            try:
+                self._check_files_exist(data_path)
+                version = compute_data_version(
+                    data_path / HOTELS_JSON_FILENAME, data_path / HOTEL_DETAILS_FILENAME
+                )
+                if self._snapshot is not None and self._snapshot.version == version:
+                    return False
+                if version == self._rejected_version:
+                    return False
+                snapshot = self._load_snapshot(data_path, version)
+            except (OSError, ValueError) as e:
+                # Don't retry a version that failed validation until the files change again
+                self._rejected_version = version
+                self._failed_reloads += 1
+                logger.warning(f"Hotel data reload skipped, keeping current version: {e}")
+                return False
+
+            previous = self._snapshot.version if self._snapshot else None
+            self._publish(snapshot)
+            self._reloads += 1
+
+        logger.info(
+            f"Hotel data reloaded: version {previous} -> {snapshot.version} "
+            f"({len(snapshot.hotels)} hotels)"
+        )
+        return True
+
+    def _publish(self, snapshot: HotelDataSnapshot) -> None:
+        """Atomically swap in a new snapshot and notify listeners."""
+        self._snapshot = snapshot
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Hotel data listener failed: {e}", exc_info=True)
+
+    def add_listener(self, listener: Callable[[HotelDataSnapshot], None]) -> None:
+        """
+        Register a callback invoked with every newly published snapshot.
+
+        Args:
+            listener: Callable receiving the new snapshot
+        """
+        self._listeners.append(listener)
+
+    def start_watching(self, interval: float) -> None:
+        """
+        Start the background watcher polling the data files.
+
+        Args:
+            interval: Polling interval in seconds (0 or less disables watching)
+        """
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+
+        self._stop_event.clear()
+
+        def _watch():
+            while not self._stop_event.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=_watch, name="hotel-data-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching hotel data files for changes every {interval}s")
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher."""
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return store metrics.
+
+        Returns:
+            dict: Current version, number of hotels and reload counters
+        """
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "data_path": str(snapshot.data_path) if snapshot else None,
+            "hotels": len(snapshot.hotels) if snapshot else 0,
+            "reloads": self._reloads,
+            "failed_reloads": self._failed_reloads,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+        }
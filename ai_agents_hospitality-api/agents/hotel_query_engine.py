@@ -0,0 +1,514 @@
+"""
+Hotel Query Engine
+
+This module answers the most common hotel configuration questions (hotel
+listings, room counts per type, room prices per type/category/season and meal
+plan surcharges) with exact lookups over hotels.json, without calling the LLM.
+
+A small keyword-based intent parser decides whether a question is one of
+those lookups; anything ambiguous or out of scope (dates, guests, bookings,
+occupancy, comparisons between hotels...) is left to the LangChain chain. A
+question is only answered when every word in it is understood: query
+vocabulary, or the names, cities and countries of the hotels it matched. An
+unknown place, hotel name or qualifier ("in Germany", "the Ritz", "have a
+spa", "included") sends it to the LLM rather than to a lookup over the wrong
+hotels.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from agents.hotel_retrieval import HotelIndex, normalize_text
+
+ROOM_TYPE_WORDS = {
+    "single": "Single",
+    "sigle": "Single",
+    "individual": "Single",
+    "double": "Double",
+    "triple": "Triple",
+}
+ROOM_TYPES = ("Single", "Double", "Triple")
+
+CATEGORY_WORDS = {
+    "standard": "Standard",
+    "premium": "Premium",
+}
+CATEGORIES = ("Standard", "Premium")
+
+SEASON_WORDS = {
+    "peak": "peak",
+    "high": "peak",
+    "off": "off",
+    "low": "off",
+}
+
+# Checked in order, so longer phrases go first
+MEAL_PLAN_PHRASES = (
+    ("no meal plan", "Room Only"),
+    ("without meal plan", "Room Only"),
+    ("room only", "Room Only"),
+    ("room and breakfast", "Room and Breakfast"),
+    ("breakfast", "Room and Breakfast"),
+    ("half board", "Half Board"),
+    ("full board", "Full Board"),
+    ("all inclusive", "All Inclusive"),
+)
+
+# A meal plan after one of these is excluded, not asked for ("without breakfast")
+MEAL_PLAN_NEGATIONS = ("no", "not", "without", "excluding", "except")
+
+# Questions mentioning any of these need reasoning beyond a lookup
+UNSUPPORTED_WORDS = {
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december", "today", "tomorrow", "next",
+    "date", "dates", "night", "nights", "stay", "weekend", "weekends", "weekday", "weekdays",
+    "guest", "guests", "person", "persons", "people", "extra", "bed", "discount",
+    "promotion", "booking", "bookings", "booked", "occupancy", "cancellation", "revenue",
+    "available", "availability", "floor", "floors", "ratio", "percentage", "view", "views",
+    "balcony", "balconies", "family", "families", "accessibility", "connecting",
+}
+
+COUNT_WORDS = {"amount", "number", "distribution", "count"}
+PRICE_WORDS = {
+    "price", "prices", "cost", "costs", "rate", "rates", "cheapest", "lowest",
+    "highest", "expensive",
+}
+MEAL_CHARGE_WORDS = {"charge", "charges", "surcharge", "surcharges", "supplement", "meal"}
+LIST_WORDS = {"which", "what", "show"}
+ROOM_WORDS = {"room", "rooms"}
+HOTEL_WORDS = {"hotel", "hotels"}
+
+# Words a lookup question may contain besides the keywords above and the
+# hotel names, cities and countries of the index; any other word is a
+# place, name or qualifier the lookups don't understand
+FUNCTION_WORDS = {
+    "a", "an", "the", "s", "is", "are", "there", "of", "in", "at", "for", "to", "on", "by",
+    "with", "during", "and", "or", "vs", "versus", "between", "per", "each", "all", "their",
+    "its", "what", "whats", "which", "how", "many", "much", "do", "does", "could", "can",
+    "would", "you", "me", "i", "please", "provide", "tell", "give", "list", "show", "get",
+    "total", "type", "types", "category", "categories", "season", "seasons", "plan", "plans",
+    "board", "half", "full", "inclusive", "only", "no", "without", "considering",
+    "location", "locations", "city", "cities", "country", "countries",
+}
+
+# Comparisons between hotels ("the difference in the number of single rooms between A and
+# B") need arithmetic the lookups don't do; only the peak vs off season difference is shown
+COMPARISON_WORDS = {
+    "difference", "differences", "differ", "compare", "compared", "comparison", "vs", "versus",
+}
+
+# Words after a room type word that show it isn't one ("a single hotel", "double the price")
+NOT_ROOM_TYPE_NEXT_WORDS = {"hotel", "hotels", "the", "a", "an", "its", "their"}
+
+# Qualifiers each kind of lookup answers; a question with any other is left to the LLM
+# (e.g. "which hotels are cheapest" is not a hotel listing)
+KIND_QUALIFIERS = {
+    "list_hotels": set(),
+    "room_counts": {"room_types", "categories"},
+    "meal_plan_charge": {"meal_plan"},
+    "room_prices": {"room_types", "categories", "seasons", "meal_plan", "extreme"},
+}
+QUERY_VOCABULARY = (
+    FUNCTION_WORDS | set(ROOM_TYPE_WORDS) | set(CATEGORY_WORDS) | set(SEASON_WORDS)
+    | {word for phrase, _ in MEAL_PLAN_PHRASES for word in phrase.split()}
+    | COUNT_WORDS | PRICE_WORDS | MEAL_CHARGE_WORDS | LIST_WORDS | ROOM_WORDS | HOTEL_WORDS
+    | COMPARISON_WORDS
+)
+
+
+def is_meal_plan_negated(text: str) -> bool:
+    """
+    Check whether a text excludes a meal plan other than Room Only.
+
+    Args:
+        text: Normalized text (see normalize_text)
+
+    Returns:
+        bool: True for texts such as "without breakfast" or "no half board"
+    """
+    padded = f" {text} "
+    return any(
+        f" {negation} {article}{phrase} " in padded
+        for phrase, plan in MEAL_PLAN_PHRASES if plan != "Room Only"
+        for negation in MEAL_PLAN_NEGATIONS
+        for article in ("", "a ", "any ")
+    )
+
+
+@dataclass(frozen=True)
+class QueryIntent:
+    """Structured interpretation of a question."""
+
+    kind: str  # "list_hotels", "room_counts", "room_prices" or "meal_plan_charge"
+    hotels: Tuple[int, ...]
+    room_types: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    seasons: Tuple[str, ...]
+    meal_plan: Optional[str] = None
+    extreme: Optional[str] = None  # "min" or "max"
+
+
+def parse_intent(question: str, hotel_index: HotelIndex, num_hotels: int) -> Optional[QueryIntent]:
+    """
+    Parse a question into a structured intent.
+
+    Args:
+        question: User's question
+        hotel_index: Index used to find the hotels the question is about
+        num_hotels: Number of hotels in the catalog (scope when none is matched)
+
+    Returns:
+        QueryIntent or None if the question is not a supported lookup
+        (including questions with words or numbers the lookups don't
+        understand, such as a hotel, city or country that is not in the
+        index, comparisons between hotels, or qualifiers the lookup would
+        ignore)
+    """
+    text = normalize_text(question)
+    words = text.split()
+    word_set = set(words)
+    padded = f" {text} "
+
+    # An excluded meal plan isn't a lookup: "without breakfast" must not match the breakfast plan
+    if word_set & UNSUPPORTED_WORDS or is_meal_plan_negated(text):
+        return None
+
+    if any(
+        word in ROOM_TYPE_WORDS and next_word in NOT_ROOM_TYPE_NEXT_WORDS
+        for word, next_word in zip(words, words[1:], strict=False)
+    ):
+        return None
+
+    room_types = tuple(sorted(
+        {ROOM_TYPE_WORDS[w] for w in words if w in ROOM_TYPE_WORDS}, key=ROOM_TYPES.index
+    ))
+    categories = tuple(sorted(
+        {CATEGORY_WORDS[w] for w in words if w in CATEGORY_WORDS}, key=CATEGORIES.index
+    ))
+    seasons = tuple(sorted(
+        {SEASON_WORDS[w] for w in words if w in SEASON_WORDS}, key=("off", "peak").index
+    ))
+    meal_plan = next(
+        (plan for phrase, plan in MEAL_PLAN_PHRASES if f" {phrase} " in padded), None
+    )
+    extreme = None
+    if word_set & {"lowest", "cheapest"}:
+        extreme = "min"
+    elif word_set & {"highest", "expensive"}:
+        extreme = "max"
+
+    # Unknown places, names and qualifiers, or a place where the named hotels are not,
+    # go to the LLM; all hotels are only in scope when no place or name is mentioned
+    hotel_match = hotel_index.match_details(question)
+    if hotel_match.conflict or any(
+        w not in QUERY_VOCABULARY and w not in hotel_match.words for w in words
+    ):
+        return None
+    hotels = hotel_match.positions or tuple(range(num_hotels))
+    mentions_rooms = bool(word_set & ROOM_WORDS) or bool(room_types) or bool(categories)
+
+    if ("how many" in padded or word_set & COUNT_WORDS) and mentions_rooms:
+        kind = "room_counts"
+    elif meal_plan and not room_types and word_set & MEAL_CHARGE_WORDS:
+        kind = "meal_plan_charge"
+    elif "meal charge" in padded or "meal charges" in padded:
+        kind = "meal_plan_charge"
+    elif (word_set & PRICE_WORDS or "how much" in padded) and mentions_rooms:
+        kind = "room_prices"
+    elif (
+        ("list" in word_set or any(f" {w} hotels " in padded for w in LIST_WORDS))
+        and word_set & HOTEL_WORDS and not mentions_rooms
+    ):
+        kind = "list_hotels"
+    else:
+        return None
+
+    qualifiers = {
+        name for name, value in (
+            ("room_types", room_types), ("categories", categories), ("seasons", seasons),
+            ("meal_plan", meal_plan), ("extreme", extreme),
+        ) if value
+    }
+    if qualifiers - KIND_QUALIFIERS[kind]:
+        return None
+    if word_set & COMPARISON_WORDS and not (kind == "room_prices" and len(seasons) == 2):
+        return None
+
+    return QueryIntent(
+        kind=kind,
+        hotels=hotels,
+        room_types=room_types or ROOM_TYPES,
+        categories=categories or CATEGORIES,
+        seasons=seasons or ("off", "peak"),
+        meal_plan=meal_plan,
+        extreme=extreme,
+    )
+
+
+@dataclass(frozen=True)
+class RoomGroup:
+    """Rooms of a hotel sharing type and category."""
+
+    count: int
+    price_off: float
+    price_peak: float
+
+
+class HotelQueryEngine:
+    """
+    In-memory index of rooms keyed by hotel, type and category.
+
+    Built once per data version; answering a question is a dictionary lookup.
+    """
+
+    def __init__(self, hotels_data: dict, hotel_index: HotelIndex):
+        """
+        Build the room index.
+
+        Args:
+            hotels_data: Parsed content of hotels.json
+            hotel_index: Index of the same hotels by name, city and country
+        """
+        self._hotels = hotels_data.get("Hotels", [])
+        self._hotel_index = hotel_index
+        self._rooms: Dict[Tuple[int, str, str], RoomGroup] = {}
+        self._meal_plan_prices: List[Dict[str, float]] = []
+
+        for position, hotel in enumerate(self._hotels):
+            groups: Dict[Tuple[str, str], List[dict]] = {}
+            for room in hotel.get("Rooms", []):
+                groups.setdefault((room["Type"], room["Category"]), []).append(room)
+            for (room_type, category), rooms in groups.items():
+                self._rooms[(position, room_type, category)] = RoomGroup(
+                    count=len(rooms),
+                    price_off=min(room["PriceOffSeason"] for room in rooms),
+                    price_peak=min(room["PricePeakSeason"] for room in rooms),
+                )
+            self._meal_plan_prices.append(
+                hotel.get("SyntheticParams", {}).get("MealPlanPrices", {})
+            )
+
+    def answer(self, question: str) -> Optional[str]:
+        """
+        Answer a question with an exact lookup.
+
+        Args:
+            question: User's question
+
+        Returns:
+            str: Markdown answer, or None if the question must go to the LLM
+        """
+        intent = parse_intent(question, self._hotel_index, len(self._hotels))
+        if intent is None:
+            return None
+        return self.render(intent)
+
+    def render(self, intent: QueryIntent) -> str:
+        """
+        Render the answer of a structured intent.
+
+        Args:
+            intent: Lookup to perform
+
+        Returns:
+            str: Markdown answer
+        """
+        if intent.kind == "list_hotels":
+            return self._answer_list_hotels(intent)
+        if intent.kind == "room_counts":
+            return self._answer_room_counts(intent)
+        if intent.kind == "meal_plan_charge":
+            return self._answer_meal_plan_charge(intent)
+        return self._answer_room_prices(intent)
+
+    def _hotel_label(self, position: int) -> str:
+        """Return "Name (City, Country)" for a hotel."""
+        hotel = self._hotels[position]
+        address = hotel.get("Address", {})
+        return f"{hotel['Name']} ({address.get('City')}, {address.get('Country')})"
+
+    def _answer_list_hotels(self, intent: QueryIntent) -> str:
+        """List the hotels in scope grouped by country and city."""
+        by_location: Dict[str, Dict[str, List[str]]] = {}
+        for position in intent.hotels:
+            hotel = self._hotels[position]
+            address = hotel.get("Address", {})
+            by_location.setdefault(address.get("Country"), {}).setdefault(
+                address.get("City"), []
+            ).append(hotel["Name"])
+
+        lines = [f"There are {len(intent.hotels)} hotels:"]
+        for country, cities in by_location.items():
+            lines.append(f"\n### {country}")
+            for city, names in cities.items():
+                lines.append(f"\n**{city}:**")
+                lines.extend(f"- {name}" for name in names)
+        return "\n".join(lines)
+
+    def _answer_room_counts(self, intent: QueryIntent) -> str:
+        """Count rooms per type for the hotels in scope."""
+        header = "| Hotel | " + " | ".join(intent.room_types) + " | Total |"
+        lines = [
+            f"Number of rooms per type ({' and '.join(intent.categories)} categories):",
+            "",
+            header,
+            "|" + "---|" * (len(intent.room_types) + 2),
+        ]
+        grand_total = 0
+        for position in intent.hotels:
+            counts = [
+                sum(
+                    self._rooms[(position, room_type, category)].count
+                    for category in intent.categories
+                    if (position, room_type, category) in self._rooms
+                )
+                for room_type in intent.room_types
+            ]
+            grand_total += sum(counts)
+            lines.append(
+                f"| {self._hotel_label(position)} | "
+                + " | ".join(str(c) for c in counts)
+                + f" | {sum(counts)} |"
+            )
+        if len(intent.hotels) > 1:
+            lines.append(f"\n**Total rooms:** {grand_total}")
+        return "\n".join(lines)
+
+    def _answer_meal_plan_charge(self, intent: QueryIntent) -> str:
+        """Show the meal plan surcharge of the hotels in scope."""
+        lines = [
+            f"Meal plan charge for **{intent.meal_plan}** "
+            "(applied as an increase over the room price per night):",
+            "",
+            "| Hotel | Price multiplier | Surcharge |",
+            "|---|---|---|",
+        ]
+        for position in intent.hotels:
+            multiplier = self._meal_plan_prices[position].get(intent.meal_plan)
+            if multiplier is None:
+                lines.append(f"| {self._hotel_label(position)} | N/A | Not offered |")
+                continue
+            lines.append(
+                f"| {self._hotel_label(position)} | x{multiplier} | "
+                f"+{round((multiplier - 1) * 100)}% |"
+            )
+        return "\n".join(lines)
+
+    def _answer_room_prices(self, intent: QueryIntent) -> str:
+        """Show room prices per type, category and season for the hotels in scope."""
+        rows = []
+        missing = []
+        for position in intent.hotels:
+            multiplier = 1.0
+            if intent.meal_plan:
+                multiplier = self._meal_plan_prices[position].get(intent.meal_plan)
+                if multiplier is None:
+                    missing.append(position)
+                    continue
+            found = False
+            for room_type in intent.room_types:
+                for category in intent.categories:
+                    group = self._rooms.get((position, room_type, category))
+                    if group is None:
+                        continue
+                    prices = {
+                        "off": round(group.price_off * multiplier, 2),
+                        "peak": round(group.price_peak * multiplier, 2),
+                    }
+                    rows.append((position, f"{room_type} {category}", prices))
+                    found = True
+            if not found:
+                missing.append(position)
+
+        description = " / ".join(intent.room_types)
+        if len(intent.categories) == 1:
+            description += f" {intent.categories[0]}"
+        description += " rooms"
+        if intent.meal_plan:
+            description += f" with {intent.meal_plan}"
+        if not rows:
+            return f"No {description} were found in the selected hotels."
+        # Hotels the question is about that have no such room are named, so the
+        # answer doesn't look like it covers them
+        missing_note = ""
+        if missing and len(intent.hotels) < len(self._hotels):
+            missing_note = f"\n\n*No {description} at: " + ", ".join(
+                self._hotel_label(position) for position in missing
+            ) + ".*"
+
+        season_names = {"off": "Off Season", "peak": "Peak Season"}
+        if intent.extreme:
+            pick = min if intent.extreme == "min" else max
+            position, room, prices = pick(
+                rows, key=lambda row: pick(row[2][s] for s in intent.seasons)
+            )
+            season = pick(intent.seasons, key=lambda s: prices[s])
+            word = "Lowest" if intent.extreme == "min" else "Highest"
+            return (
+                f"{word} price for {description}: **{prices[season]}** per night "
+                f"({season_names[season]}) for a {room} room at "
+                f"**{self._hotel_label(position)}**.{missing_note}"
+            )
+
+        headers = [season_names[s] for s in intent.seasons]
+        if len(intent.seasons) == 2:
+            headers.append("Difference")
+        lines = [
+            f"Prices per night for {description}:",
+            "",
+            "| Hotel | Room | " + " | ".join(headers) + " |",
+            "|---|---|" + "---|" * len(headers),
+        ]
+        for position, room, prices in rows:
+            values = [str(prices[s]) for s in intent.seasons]
+            if len(intent.seasons) == 2:
+                values.append(str(round(prices["peak"] - prices["off"], 2)))
+            cells = [self._hotel_label(position), room, *values]
+            lines.append("| " + " | ".join(cells) + " |")
+        if intent.meal_plan and intent.meal_plan != "Room Only":
+            lines.append(f"\n*Prices include the {intent.meal_plan} meal plan surcharge.*")
+        return "\n".join(lines) + missing_note
+
+
+class RouteStats:
+    """Thread-safe counter of how questions are routed."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._routes: Dict[str, int] = {}
+
+    def record(self, route: str) -> None:
+        """
+        Count one question answered by a route.
+
+        Args:
+            route: Route name ("structured", "cache" or "llm")
+        """
+        with self._lock:
+            self._routes[route] = self._routes.get(route, 0) + 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return the per-route counters and the LLM offload rate.
+
+        Returns:
+            dict: Questions per route and share answered without calling the LLM
+        """
+        with self._lock:
+            total = sum(self._routes.values())
+            offloaded = total - self._routes.get("llm", 0)
+            return {
+                "routes": dict(self._routes),
+                "llm_offload_rate": offloaded / total if total else 0.0,
+            }
+
+
+# Shared counters used by the agents
+route_stats = RouteStats()
+
+
+def get_route_stats() -> Dict[str, object]:
+    """Return the question routing metrics."""
+    return route_stats.stats()
@@ -0,0 +1,383 @@
+"""
+Hotel Retrieval
+
+This module implements the pre-LLM retrieval stage: it indexes the hotels of a
+data snapshot by name, city and country and builds a prompt context that only
+contains the hotels a question is about. When no hotel can be matched, the
+context falls back to a compact summary of every hotel.
+"""
+
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from agents.context_encoder import (
+    CONTEXT_FORMAT_COMPACT,
+    encode_hotel_compact,
+    encode_hotel_legacy,
+)
+
+# Minimum similarity for a question word to fuzzily match a hotel name word
+FUZZY_WORD_THRESHOLD = 0.8
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for matching: lowercase, no accents, no punctuation.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        str: Normalized text with single spaces between words
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def _word_matches(question_word: str, name_word: str) -> Tuple[bool, bool]:
+    """
+    Compare a question word with a hotel name word.
+
+    Returns:
+        tuple: (matches, is_full_word) where is_full_word is False when the
+        question word only matched as an initial (e.g. "g" for "grand")
+    """
+    if question_word == name_word:
+        return True, True
+    if len(question_word) == 1:
+        return question_word == name_word[0], False
+    # Upper bound of the similarity ratio, cheap enough to skip most comparisons
+    shortest, total = min(len(question_word), len(name_word)), len(question_word) + len(name_word)
+    if 2 * shortest / total < FUZZY_WORD_THRESHOLD:
+        return False, True
+    similarity = SequenceMatcher(None, question_word, name_word).ratio()
+    return similarity >= FUZZY_WORD_THRESHOLD, True
+
+
+def _name_windows(name_words: Sequence[str], question_words: Sequence[str]) -> List[int]:
+    """
+    Find where a hotel name appears in the question, allowing abbreviations
+    and small typos (e.g. "G Victoria" or "Grand Victora" for "Grand Victoria").
+
+    Returns:
+        list: Position of the first question word of every occurrence
+    """
+    size = len(name_words)
+    starts = []
+    for start in range(len(question_words) - size + 1):
+        window = question_words[start:start + size]
+        results = [_word_matches(q, n) for q, n in zip(window, name_words, strict=True)]
+        if all(matches for matches, _ in results) and any(full for _, full in results):
+            starts.append(start)
+    return starts
+
+
+def _name_in_question(name_words: Sequence[str], question_words: Sequence[str]) -> bool:
+    """Check whether a hotel name appears in the question (see _name_windows)."""
+    return bool(_name_windows(name_words, question_words))
+
+
+def split_hotel_details(hotel_details_text: str) -> Dict[str, str]:
+    """
+    Split hotel_details.md into one markdown section per hotel.
+
+    Args:
+        hotel_details_text: Content of hotel_details.md
+
+    Returns:
+        dict: Markdown section keyed by hotel name
+    """
+    sections = {}
+    for section in re.split(r"\n---\n", hotel_details_text):
+        section = section.strip()
+        match = re.match(r"# (.+)", section)
+        if match:
+            sections.setdefault(match.group(1).strip(), []).append(section)
+    return {name: "\n\n---\n\n".join(parts) for name, parts in sections.items()}
+
+
+def render_hotel_summary(hotel: dict) -> str:
+    """
+    Render a one-line summary of a hotel: location, rooms per type and price range.
+
+    Args:
+        hotel: Hotel dictionary from hotels.json
+
+    Returns:
+        str: Markdown bullet with the hotel summary
+    """
+    rooms = hotel.get("Rooms", [])
+    rooms_per_type: Dict[str, int] = {}
+    for room in rooms:
+        rooms_per_type[room["Type"]] = rooms_per_type.get(room["Type"], 0) + 1
+    room_counts = ", ".join(f"{count} {room_type}" for room_type, count in rooms_per_type.items())
+    address = hotel.get("Address", {})
+    summary = (
+        f"- **{hotel['Name']}** ({address.get('City')}, {address.get('Country')}): "
+        f"{len(rooms)} rooms ({room_counts})"
+    )
+    if rooms:
+        min_price = min(room["PriceOffSeason"] for room in rooms)
+        max_price = max(room["PricePeakSeason"] for room in rooms)
+        summary += f", prices from {min_price} (off season) to {max_price} (peak season)"
+    return summary
+
+
+@dataclass(frozen=True)
+class RetrievedContext:
+    """Context selected for a single question."""
+
+    text: str
+    hotel_names: Tuple[str, ...]
+    fallback: bool
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class HotelMatch:
+    """Hotels a question is about and the question words that identified them."""
+
+    positions: Tuple[int, ...]
+    words: FrozenSet[str]  # Question words that are hotel names, cities or countries of the index
+    conflict: bool  # A city or country is mentioned where none of the matched hotels are
+
+
+class HotelIndex:
+    """
+    Index of the hotels of one data snapshot by name, city and country.
+
+    Each hotel's context segment is rendered once when the index is built, so
+    building the context for a question only joins precomputed strings.
+    """
+
+    def __init__(
+        self,
+        hotels_data: dict,
+        hotel_details_text: str,
+        context_format: str = CONTEXT_FORMAT_COMPACT,
+    ):
+        """
+        Build the index.
+
+        Args:
+            hotels_data: Parsed content of hotels.json
+            hotel_details_text: Content of hotel_details.md
+            context_format: Format of the hotel segments ("compact" or "legacy")
+        """
+        hotels = hotels_data.get("Hotels", [])
+        details_by_name = {}
+        if context_format != CONTEXT_FORMAT_COMPACT:
+            details_by_name = split_hotel_details(hotel_details_text)
+
+        self._names: List[Tuple[str, ...]] = []
+        self._locations: List[Tuple[str, str]] = []
+        self._segments: List[str] = []
+        self._hotel_names: List[str] = []
+
+        for hotel in hotels:
+            address = hotel.get("Address", {})
+            self._hotel_names.append(hotel["Name"])
+            self._names.append(tuple(normalize_text(hotel["Name"]).split()))
+            self._locations.append((
+                normalize_text(address.get("City", "")),
+                normalize_text(address.get("Country", "")),
+            ))
+            if context_format == CONTEXT_FORMAT_COMPACT:
+                self._segments.append(encode_hotel_compact(hotel))
+            else:
+                details = details_by_name.get(hotel["Name"], f"# {hotel['Name']}")
+                self._segments.append(encode_hotel_legacy(hotel, details))
+
+        summaries = "\n".join(render_hotel_summary(hotel) for hotel in hotels)
+        self._summary_text = (
+            "No specific hotel, city or country was identified in the question. "
+            "Summary of all hotels:\n\n"
+            f"{summaries}\n"
+        )
+
+    def match(self, question: str) -> List[int]:
+        """
+        Find the hotels a question is about.
+
+        Hotels are matched by (fuzzy) name first; if no name matches, by city
+        and then by country.
+
+        Args:
+            question: User's question
+
+        Returns:
+            list: Positions of the matched hotels in hotels.json
+        """
+        normalized = normalize_text(question)
+        question_words = normalized.split()
+        padded = f" {normalized} "
+
+        by_name = [
+            i for i, name_words in enumerate(self._names)
+            if name_words and _name_in_question(name_words, question_words)
+        ]
+        if by_name:
+            return by_name
+
+        by_city = [
+            i for i, (city, _) in enumerate(self._locations) if city and f" {city} " in padded
+        ]
+        if by_city:
+            return by_city
+
+        return [
+            i for i, (_, country) in enumerate(self._locations)
+            if country and f" {country} " in padded
+        ]
+
+    def match_details(self, question: str) -> HotelMatch:
+        """
+        Find the hotels a question is about, as match(), and which words identified them.
+
+        Args:
+            question: User's question
+
+        Returns:
+            HotelMatch: Matched hotels, the question words that are hotel
+            names, cities or countries of the index, and whether a mentioned
+            city or country contradicts the matched hotels
+        """
+        positions = self.match(question)
+        question_words = normalize_text(question).split()
+        padded = f" {' '.join(question_words)} "
+
+        words = set()
+        for position in positions:
+            name_words = self._names[position]
+            for start in _name_windows(name_words, question_words):
+                words.update(question_words[start:start + len(name_words)])
+
+        conflict = False
+        for field in (0, 1):  # city, country
+            mentioned = {
+                location[field] for location in self._locations
+                if location[field] and f" {location[field]} " in padded
+            }
+            for place in mentioned:
+                words.update(place.split())
+                if not any(self._locations[i][field] == place for i in positions):
+                    conflict = True
+
+        return HotelMatch(positions=tuple(positions), words=frozenset(words), conflict=conflict)
+
+    def find(self, name: str = "", city: str = "", country: str = "") -> List[int]:
+        """
+        Find hotels by (fuzzy) name and/or exact city and country.
+
+        Args:
+            name: Hotel name, abbreviations and small typos allowed
+            city: City name
+            country: Country name
+
+        Returns:
+            list: Positions of the matching hotels (all hotels without filters)
+        """
+        positions = self.match(name) if name else list(range(len(self._names)))
+        if city:
+            city = normalize_text(city)
+            positions = [i for i in positions if self._locations[i][0] == city]
+        if country:
+            country = normalize_text(country)
+            positions = [i for i in positions if self._locations[i][1] == country]
+        return positions
+
+    def segment(self, position: int) -> str:
+        """
+        Return the rendered context segment of a hotel.
+
+        Args:
+            position: Position of the hotel in hotels.json
+
+        Returns:
+            str: Hotel context segment
+        """
+        return self._segments[position]
+
+    def build_context(self, question: str) -> RetrievedContext:
+        """
+        Build the prompt context for a question.
+
+        Args:
+            question: User's question
+
+        Returns:
+            RetrievedContext: Context with only the matched hotels, or the
+            compact summary of all hotels when nothing matches
+        """
+        matched = self.match(question)
+        if matched:
+            text = "\n---\n\n".join(self._segments[i] for i in matched)
+            names = tuple(self._hotel_names[i] for i in matched)
+            fallback = False
+        else:
+            text = self._summary_text
+            names = ()
+            fallback = True
+        return RetrievedContext(
+            text=text,
+            hotel_names=names,
+            fallback=fallback,
+            size_bytes=len(text.encode("utf-8")),
+        )
+
+
+class RetrievalStats:
+    """Thread-safe counters of the retrieval stage."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._fallbacks = 0
+        self._bytes_sent = 0
+        self._bytes_saved = 0
+
+    def record(self, retrieved: RetrievedContext, full_size_bytes: int) -> None:
+        """
+        Record the context sent for one request.
+
+        Args:
+            retrieved: Context selected for the question
+            full_size_bytes: Size of the full (unfiltered) context
+        """
+        with self._lock:
+            self._requests += 1
+            self._fallbacks += int(retrieved.fallback)
+            self._bytes_sent += retrieved.size_bytes
+            self._bytes_saved += max(full_size_bytes - retrieved.size_bytes, 0)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return the retrieval metrics.
+
+        Returns:
+            dict: Requests, fallbacks, prompt bytes sent/saved in total and per request
+        """
+        with self._lock:
+            requests = self._requests
+            return {
+                "requests": requests,
+                "fallbacks": self._fallbacks,
+                "prompt_bytes_sent": self._bytes_sent,
+                "prompt_bytes_saved": self._bytes_saved,
+                "avg_prompt_bytes_saved": self._bytes_saved / requests if requests else 0.0,
+            }
+
+
+# Shared counters used by the agents
+retrieval_stats = RetrievalStats()
+
+
+def get_retrieval_stats() -> Dict[str, object]:
+    """Return metrics of the retrieval stage."""
+    return retrieval_stats.stats()
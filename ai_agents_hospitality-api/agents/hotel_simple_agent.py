@@ -9,10 +9,10 @@ Uses a small sample of 3 hotels for learning purposes.
 """
 
 import asyncio
-import json
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Optional, Tuple
 
 try:
     # Try new LangChain structure (v0.2+)
@@ -21,47 +21,112 @@ except ImportError:
     # Fallback to old structure (v0.1)
     from langchain.prompts import ChatPromptTemplate
 
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-except ImportError:
-    # Fallback to community package if google_genai not available
-    from langchain_community.chat_models import ChatGoogleGenerativeAI
-
-# Import ChatOpenAI for proxy/custom endpoint support
-try:
-    from langchain_openai import ChatOpenAI
-except ImportError:
-    ChatOpenAI = None
-
-from util.configuration import PROJECT_ROOT
+from util.configuration import PROJECT_ROOT, settings
+from util.concurrency import ConcurrencyLimiter, ConcurrencyLimitError
 from util.logger_config import logger
-from config.agent_config import get_agent_config
+from config.agent_config import get_cached_agent_config
+from agents.bookings_db import (
+    QueryFailedError,
+    QueryRejectedError,
+    QueryTimeoutError,
+    create_bookings_database,
+)
+from agents.bookings_sql import answer_with_sql, is_analytics_question
+from agents.context_builder import HotelContext, context_builder
+from agents.document_index import document_index, format_matches
+from agents.hotel_query_engine import route_stats
+from agents.hotel_retrieval import retrieval_stats
+from agents.response_cache import ResponseCache
+from agents.hotel_data_store import HotelDataSnapshot, HotelDataStore
+from agents.hotel_tool_agent import answer_with_tools
+from agents.llm_providers import message_text, provider_registry
+from agents.prompt_cache import (
+    SYSTEM_INSTRUCTIONS,
+    GeminiContextCache,
+    add_usage,
+    build_prompt_prefix,
+    prompt_cache_key,
+    prompt_cache_stats,
+)
 
 # Path to hotel data files (relative to project root)
 # First try local data directory (for Docker), then fallback to bookings-db
 HOTELS_DATA_PATH_LOCAL = PROJECT_ROOT / "data" / "hotels"
 HOTELS_DATA_PATH_EXTERNAL = PROJECT_ROOT.parent / "bookings-db" / "output_files" / "hotels"
 
+# Agent mode in which the LLM calls lookup tools instead of receiving the hotel context
+AGENT_MODE_TOOLS = "tools"
+
+
+# Versioned, hot-reloadable store of the hotel data files
+hotel_data_store = HotelDataStore(HOTELS_DATA_PATH_LOCAL, HOTELS_DATA_PATH_EXTERNAL)
+
+# Pre-render the context of every new data version before it is requested
+hotel_data_store.add_listener(
+    lambda snapshot: context_builder.get_context(
+        snapshot.version, snapshot.hotels_data, snapshot.hotel_details_text
+    )
+)
+
+# Keep the document index in sync with the generator's outputs (re-indexed in the background);
+# only the "documents" context mode and the tool agent read it
+if settings.DOCUMENT_INDEX_ENABLED and (
+    settings.HOTEL_CONTEXT_MODE == "documents" or settings.AGENT_MODE == AGENT_MODE_TOOLS
+):
+    hotel_data_store.add_listener(
+        lambda snapshot: document_index.schedule_refresh(snapshot.data_path)
+    )
+
+# Cache of LLM answers, invalidated whenever a new data version is published
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    similarity_threshold=settings.RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+)
+hotel_data_store.add_listener(lambda snapshot: response_cache.invalidate(snapshot.version))
+
+# Explicit Gemini context caches of the static prompt prefix, one per data version
+gemini_context_cache = GeminiContextCache(ttl_seconds=settings.GEMINI_CONTEXT_CACHE_TTL_SECONDS)
+hotel_data_store.add_listener(lambda snapshot: gemini_context_cache.invalidate(snapshot.version))
 
-def _get_hotels_data_path():
+# Limit on concurrent LLM calls, with a bounded wait queue for backpressure
+llm_limiter = ConcurrencyLimiter(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_queue=settings.LLM_MAX_QUEUE,
+    queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+)
+
+# Read-only bookings database for analytics questions (None when not configured)
+bookings_database = create_bookings_database(
+    settings.BOOKINGS_DB_URL,
+    pool_size=settings.BOOKINGS_DB_POOL_SIZE,
+    timeout=settings.BOOKINGS_SQL_TIMEOUT,
+    max_rows=settings.BOOKINGS_SQL_MAX_ROWS,
+    max_scan_rows=settings.BOOKINGS_SQL_MAX_SCAN_ROWS,
+)
+# A data reload usually comes with a database reload: list the tables (and
+# populated aggregates) and their sizes again
+if bookings_database is not None:
+    hotel_data_store.add_listener(lambda snapshot: bookings_database.invalidate())
+
+# Global variable to cache the agent
+_agent_chain = None
+
+
+def get_hotel_data_snapshot() -> HotelDataSnapshot:
     """
-    Determine the correct path to hotel data files.
-    Tries local path first (for Docker), then external path (for local development).
+    Get the current snapshot of the hotel data.
     
     Returns:
-        Path: Path to the hotels data directory
+        HotelDataSnapshot: Current version of the hotel data files
+
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+        json.JSONDecodeError: If hotels.json is invalid
+        ValueError: If the hotel data fails validation
     """
-    if HOTELS_DATA_PATH_LOCAL.exists() and (HOTELS_DATA_PATH_LOCAL / "hotels.json").exists():
-        logger.info(f"Using local hotel data path: {HOTELS_DATA_PATH_LOCAL}")
-        return HOTELS_DATA_PATH_LOCAL
-    else:
-        logger.info(f"Using external hotel data path: {HOTELS_DATA_PATH_EXTERNAL}")
-        return HOTELS_DATA_PATH_EXTERNAL
-
-# Global variables to cache loaded data and agent
-_hotels_data: Optional[dict] = None
-_hotel_details_text: Optional[str] = None
-_agent_chain = None
+    return hotel_data_store.current()
 
 
 def load_hotel_data() -> Tuple[dict, str]:
@@ -74,60 +139,58 @@ def load_hotel_data() -> Tuple[dict, str]:
     Raises:
         FileNotFoundError: If hotel data files don't exist
         json.JSONDecodeError: If hotels.json is invalid
+        ValueError: If the hotel data fails validation
     """
-    global _hotels_data, _hotel_details_text
-    
-    # Return cached data if already loaded
-    if _hotels_data is not None and _hotel_details_text is not None:
-        return _hotels_data, _hotel_details_text
-    
-    # Determine the correct path to hotel data
-    hotels_data_path = _get_hotels_data_path()
-    hotels_json_file = hotels_data_path / "hotels.json"
-    hotel_details_file = hotels_data_path / "hotel_details.md"
-    
-    # Check if files exist
-    if not hotels_json_file.exists():
-        raise FileNotFoundError(
-            f"Hotel data file not found: {hotels_json_file}\n"
-            f"Tried paths:\n"
-            f"  - Local: {HOTELS_DATA_PATH_LOCAL / 'hotels.json'}\n"
-            f"  - External: {HOTELS_DATA_PATH_EXTERNAL / 'hotels.json'}\n"
-            f"Please generate hotel data first:\n"
-            f"cd bookings-db && python src/gen_synthetic_hotels.py --num_hotels 3\n"
-            f"Or copy files to: {HOTELS_DATA_PATH_LOCAL}"
-        )
-    
-    if not hotel_details_file.exists():
-        raise FileNotFoundError(
-            f"Hotel details file not found: {hotel_details_file}\n"
-            f"Tried paths:\n"
-            f"  - Local: {HOTELS_DATA_PATH_LOCAL / 'hotel_details.md'}\n"
-            f"  - External: {HOTELS_DATA_PATH_EXTERNAL / 'hotel_details.md'}\n"
-            f"Please generate hotel data first:\n"
-            f"cd bookings-db && python src/gen_synthetic_hotels.py --num_hotels 3\n"
-            f"Or copy files to: {HOTELS_DATA_PATH_LOCAL}"
+    snapshot = get_hotel_data_snapshot()
+    logger.info(f"Hotel data version {snapshot.version} ({len(snapshot.hotels)} hotels)")
+    return snapshot.hotels_data, snapshot.hotel_details_text
+
+
+def _select_hotel_context(context: HotelContext, question: str) -> str:
+    """
+    Select the hotel context to send to the LLM for a question.
+
+    In "filtered" mode only the hotels the question is about are sent (or a
+    compact summary of all hotels when none can be identified); in "documents"
+    mode the most similar chunks of the document index are sent (hotel
+    details, rooms and bookings); in "full" mode the whole catalog is sent.
+
+    Args:
+        context: Cached context of the current data version
+        question: User's question
+
+    Returns:
+        str: Hotel context text
+    """
+    if settings.HOTEL_CONTEXT_MODE == "documents" and document_index.ready:
+        matches = document_index.search(question, settings.DOCUMENT_INDEX_TOP_K)
+        logger.info(
+            f"Document context: {len(matches)} chunks "
+            f"({', '.join(sorted({m.chunk.source for m in matches}))})"
         )
-    
-    # Load JSON data
-    logger.info(f"Loading hotel data from {hotels_json_file}")
-    with open(hotels_json_file, 'r', encoding='utf-8') as f:
-        _hotels_data = json.load(f)
-    
-    # Load markdown details
-    logger.info(f"Loading hotel details from {hotel_details_file}")
-    with open(hotel_details_file, 'r', encoding='utf-8') as f:
-        _hotel_details_text = f.read()
-    
-    logger.info(f"Successfully loaded hotel data ({len(_hotels_data.get('hotels', []))} hotels)")
-    
-    return _hotels_data, _hotel_details_text
+        return format_matches(matches)
+
+    # Until the document index is built, questions get the filtered context
+    if settings.HOTEL_CONTEXT_MODE not in ("filtered", "documents"):
+        return context.text
+
+    retrieved = context.hotel_index.build_context(question)
+    retrieval_stats.record(retrieved, context.size_bytes)
+    logger.info(
+        f"Hotel context: {', '.join(retrieved.hotel_names) or 'summary of all hotels'} "
+        f"({retrieved.size_bytes} of {context.size_bytes} bytes)"
+    )
+    return retrieved.text
 
 
 def _create_agent_chain():
     """
     Create and return the LangChain agent chain.
     
+    The prompt is laid out for provider-side prompt caching: the system
+    message is a static prefix (instructions, then hotel context) and the
+    question comes last.
+
     Returns:
         LangChain chain: Prompt template + LLM chain
     """
@@ -136,43 +199,14 @@ def _create_agent_chain():
     if _agent_chain is not None:
         return _agent_chain
     
-    # Load configuration from centralized config system
-    config = get_agent_config()
-    
-    # Create LLM instance based on provider and configuration
-    if config.provider == "openai":
-        # Standard OpenAI API
-        if not ChatOpenAI:
-            raise ImportError("langchain_openai is required for OpenAI provider. Install with: pip install langchain-openai")
-        llm = ChatOpenAI(
-            model=config.model,
-            temperature=config.temperature,
-            api_key=config.api_key
-        )
-        logger.info(f"Using OpenAI API with model: {config.model}")
-    else:
-        # Standard Gemini API usage
-        llm = ChatGoogleGenerativeAI(
-            model=config.model,
-            temperature=config.temperature,
-            google_api_key=config.api_key
-        )
-        logger.info(f"Using Gemini API with model: {config.model}")
+    # Configuration is loaded once; the LLM client and its connection pool are
+    # shared through the provider registry
+    config = get_cached_agent_config()
+    llm = provider_registry.get_llm(config)
     
-    # Create prompt template
+    # Create prompt template (instructions contain no template variables)
     prompt_template = ChatPromptTemplate.from_messages([
-        ("system", """You are a helpful hotel assistant. Use the following hotel information to answer questions.
-
-Hotel Data:
-{hotel_context}
-
-When answering questions:
-- Be accurate and specific
-- Reference hotel names, locations, and details from the data
-- If information is not available, say so clearly
-- Format responses in a clear, readable way using markdown
-- Use bullet points and tables when appropriate
-- Include specific prices, addresses, and details when available"""),
+        ("system", SYSTEM_INSTRUCTIONS + "{hotel_context}"),
         ("human", "{question}")
     ])
     
@@ -182,79 +216,369 @@ When answering questions:
     return _agent_chain
 
 
+async def _get_request_chain(prepared: "PreparedQuestion"):
+    """
+    Return the chain for a request, bound to the provider's prompt cache.
+
+    OpenAI requests are tagged with a prompt_cache_key of the prefix. With
+    Gemini context caching enabled and the full hotel context selected, the
+    prefix is served from the cached content of the data version and only the
+    question is sent.
+
+    Args:
+        prepared: Prepared question with the chain inputs
+
+    Returns:
+        tuple: (LangChain chain, name of the Gemini cached content it uses or None)
+    """
+    chain = _create_agent_chain()
+    if not settings.PROMPT_CACHE_ENABLED:
+        return chain, None
+
+    config = get_cached_agent_config()
+    llm = provider_registry.get_llm(config)
+    hotel_context = prepared.chain_inputs["hotel_context"]
+
+    if config.provider == "openai":
+        cache_key = prompt_cache_key(hotel_context)
+        return chain.first | llm.bind(extra_body={"prompt_cache_key": cache_key}), None
+
+    full_context = prepared.context is not None and hotel_context == prepared.context.text
+    if settings.GEMINI_CONTEXT_CACHE_ENABLED and full_context:
+        cache_name = await gemini_context_cache.get_cache_name(
+            llm, config.model, prepared.snapshot.version, build_prompt_prefix(hotel_context)
+        )
+        if cache_name:
+            question_prompt = ChatPromptTemplate.from_messages([("human", "{question}")])
+            return question_prompt | llm.bind(cached_content=cache_name), cache_name
+
+    return chain, None
+
+
+def _discard_cached_content(
+    prepared: "PreparedQuestion", cache_name: Optional[str], error: Exception
+):
+    """
+    Handle a failed LLM call: if it used a Gemini cached content, forget the cache
+    and return the uncached chain to retry with; otherwise re-raise the error.
+
+    Args:
+        prepared: Prepared question
+        cache_name: Cached content used by the failed call, if any
+        error: Error raised by the call
+
+    Returns:
+        LangChain chain: Chain with the full prompt
+    """
+    if cache_name is None:
+        raise error
+    # e.g. a cache deleted at the provider before its expected expiry
+    gemini_context_cache.discard(prepared.snapshot.version, cache_name, error)
+    return _create_agent_chain()
+
+
+@dataclass
+class PreparedQuestion:
+    """Outcome of the pre-LLM stages for a question."""
+
+    snapshot: HotelDataSnapshot
+    answer: Optional[str] = None
+    chain_inputs: Optional[dict] = None
+    context: Optional[HotelContext] = None
+    analytics: bool = False
+
+
+def _prepare_question(question: str, snapshot: HotelDataSnapshot) -> PreparedQuestion:
+    """
+    Run the pre-LLM stages for a question.
+    
+    Exact lookups and cached answers are resolved here; otherwise the chain
+    inputs (selected hotel context and question) are returned. This only does
+    in-memory work, so it is safe to call from the event loop.
+    
+    Args:
+        question: User's question about hotels
+        snapshot: Data snapshot used for the whole request, even if reloaded
+        
+    Returns:
+        PreparedQuestion: Final answer, or the inputs for the LLM chain
+    """
+    # Get the rendered context for this data version (built once, then cached)
+    context = context_builder.get_context(
+        snapshot.version, snapshot.hotels_data, snapshot.hotel_details_text
+    )
+
+    # Exact lookups are answered directly from the room index
+    if settings.STRUCTURED_QUERIES_ENABLED:
+        structured_answer = context.query_engine.answer(question)
+        if structured_answer is not None:
+            route_stats.record("structured")
+            logger.info(f"Answered without LLM: {question[:100]}...")
+            return PreparedQuestion(snapshot=snapshot, answer=structured_answer)
+
+    # Repeated and near-duplicate questions are served from the response cache
+    if settings.RESPONSE_CACHE_ENABLED:
+        cached_answer = response_cache.get(snapshot.version, question)
+        if cached_answer is not None:
+            route_stats.record("cache")
+            logger.info(f"Answered from response cache: {question[:100]}...")
+            return PreparedQuestion(snapshot=snapshot, answer=cached_answer)
+    route_stats.record("llm")
+
+    # Booking figures (counts, occupancy, revenue) are answered with SQL over the bookings
+    # database; the LLM inputs are prepared if the SQL path can't answer
+    if bookings_database is not None and is_analytics_question(question):
+        return PreparedQuestion(snapshot=snapshot, context=context, analytics=True)
+
+    return _prepare_llm_question(question, snapshot, context)
+
+
+def _prepare_llm_question(
+    question: str, snapshot: HotelDataSnapshot, context: HotelContext
+) -> PreparedQuestion:
+    """
+    Prepare a question for the tool agent or the LLM chain with the hotel context.
+
+    Args:
+        question: User's question about hotels
+        snapshot: Data snapshot used for the whole request
+        context: Cached context of the snapshot
+
+    Returns:
+        PreparedQuestion: Inputs for the tool agent or the LLM chain
+    """
+    # The tool agent looks the hotels up itself instead of receiving a context
+    if settings.AGENT_MODE == AGENT_MODE_TOOLS:
+        return PreparedQuestion(snapshot=snapshot, context=context)
+
+    return PreparedQuestion(
+        snapshot=snapshot,
+        chain_inputs={
+            "hotel_context": _select_hotel_context(context, question),
+            "question": question
+        },
+        context=context
+    )
+
+
+def _format_error(error: Exception) -> str:
+    """
+    Format an error raised while answering a question as a user message.
+
+    Args:
+        error: Exception raised by the agent
+
+    Returns:
+        str: Markdown error message
+    """
+    if isinstance(error, FileNotFoundError):
+        logger.error(f"Hotel data files not found: {error}")
+        return """❌ **Error**: Hotel data files not found.
+
+Please generate the hotel data first:
+```bash
+cd bookings-db
+python src/gen_synthetic_hotels.py --num_hotels 3
+```
+
+New data files are picked up automatically while the API server is running."""
+
+    if isinstance(error, ConcurrencyLimitError):
+        logger.warning(f"LLM call rejected by the concurrency limiter: {error}")
+        return """⏳ **The assistant is busy right now.** Please try again in a few seconds."""
+
+    if isinstance(error, ValueError):
+        logger.error(f"Configuration error: {error}")
+        return f"""❌ **Error**: {str(error)}"""
+
+    logger.error(f"Error processing question: {error}", exc_info=error)
+    return f"""❌ **Error**: An unexpected error occurred while processing your question.
+
+Error details: {str(error)}
+
+Please try again or contact support if the problem persists."""
+
+
+async def _answer_with_tools(prepared: PreparedQuestion, question: str) -> str:
+    """
+    Answer a question with the tool-calling agent.
+
+    Args:
+        prepared: Prepared question
+        question: User's question
+
+    Returns:
+        str: Agent's response
+    """
+    llm = provider_registry.get_llm(get_cached_agent_config())
+    logger.info(f"Answering with tools: {question[:100]}...")
+    async with llm_limiter.slot():
+        answer = await answer_with_tools(
+            llm, prepared.context, question, settings.TOOL_AGENT_MAX_STEPS
+        )
+
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache.put(prepared.snapshot.version, question, answer)
+
+    return answer
+
+
+async def _answer_with_sql(question: str) -> Optional[str]:
+    """
+    Answer an analytics question with a read-only SQL query over the bookings database.
+
+    SQL answers are not cached: the response cache follows the hotel files, and the
+    database can be reloaded on its own.
+
+    Args:
+        question: User's question
+
+    Returns:
+        str: Markdown answer with the query result, or None if the query could not be
+        built, was rejected, timed out or failed in the database (the question then
+        takes the LLM path)
+    """
+    llm = provider_registry.get_llm(get_cached_agent_config())
+    logger.info(f"Answering with bookings SQL: {question[:100]}...")
+    try:
+        async with llm_limiter.slot():
+            return await answer_with_sql(llm, bookings_database, question)
+    except (QueryRejectedError, QueryTimeoutError, QueryFailedError) as e:
+        logger.info(f"Bookings SQL can't answer, using the LLM path: {e}")
+        return None
+
+
+async def _answer_with_sql_once(question: str) -> Optional[str]:
+    """
+    Answer an analytics question from a one-off event loop (see answer_hotel_question).
+
+    The connection pool belongs to the event loop that opened it, so it is
+    closed before the loop ends instead of being left open.
+
+    Args:
+        question: User's question
+
+    Returns:
+        str: Markdown answer, or None if the question takes the LLM path
+    """
+    try:
+        return await _answer_with_sql(question)
+    finally:
+        await bookings_database.aclose()
+
+
 def answer_hotel_question(question: str) -> str:
     """
     Simple agent that answers questions using hotel files as context.
-    
+
     This function loads hotel data and uses it as context for the LLM
     to answer questions about hotels, rooms, and configurations.
-    
+
     Args:
         question: User's question about hotels
-        
+
     Returns:
         str: Agent's response
-        
-    Raises:
-        FileNotFoundError: If hotel data files don't exist
-        ValueError: If configuration is invalid or missing required values
     """
     try:
-        # Load hotel data
-        hotels_data, hotel_details_text = load_hotel_data()
+        prepared = _prepare_question(question, get_hotel_data_snapshot())
+        if prepared.answer is not None:
+            return prepared.answer
         
-        # Prepare context from loaded files
-        hotel_context = f"""
-{hotel_details_text}
+        if prepared.analytics:
+            answer = asyncio.run(_answer_with_sql_once(question))
+            if answer is not None:
+                return answer
+            prepared = _prepare_llm_question(question, prepared.snapshot, prepared.context)
+
+        if settings.AGENT_MODE == AGENT_MODE_TOOLS:
+            return asyncio.run(_answer_with_tools(prepared, question))
 
-Hotels JSON Summary:
-{json.dumps(hotels_data, indent=2, ensure_ascii=False)}
-"""
-        
         # Create agent chain
         chain = _create_agent_chain()
         
         # Invoke the chain
         logger.info(f"Processing question: {question[:100]}...")
-        response = chain.invoke({
-            "hotel_context": hotel_context,
-            "question": question
-        })
+        response = chain.invoke(prepared.chain_inputs)
+        prompt_cache_stats.record(response.usage_metadata)
+        answer = message_text(response)
         
-        return response.content
+        if settings.RESPONSE_CACHE_ENABLED:
+            response_cache.put(prepared.snapshot.version, question, answer)
+
+        return answer
         
-    except FileNotFoundError as e:
-        logger.error(f"Hotel data files not found: {e}")
-        return f"""❌ **Error**: Hotel data files not found.
+    except Exception as e:
+        return _format_error(e)
 
-Please generate the hotel data first:
-```bash
-cd bookings-db
-python src/gen_synthetic_hotels.py --num_hotels 3
-```
 
-Then restart the API server."""
+async def stream_hotel_query(user_query: str) -> AsyncIterator[str]:
+    """
+    Stream the answer to a hotel query as incremental text deltas.
     
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        return f"""❌ **Error**: {str(e)}"""
+    Answers that don't need the LLM (exact lookups, cached answers and
+    errors) are yielded as a single delta.
     
-    except Exception as e:
-        logger.error(f"Error processing question: {e}", exc_info=True)
-        return f"""❌ **Error**: An unexpected error occurred while processing your question.
+    Args:
+        user_query: User's query string
 
-Error details: {str(e)}
+    Yields:
+        str: Next piece of the answer
+    """
+    try:
+        snapshot = await hotel_data_store.acurrent()
+        prepared = _prepare_question(user_query, snapshot)
+        if prepared.answer is not None:
+            yield prepared.answer
+            return
 
-Please try again or contact support if the problem persists."""
+        # The SQL path and the tool agent answer in a single piece
+        if prepared.analytics:
+            answer = await _answer_with_sql(user_query)
+            if answer is not None:
+                yield answer
+                return
+            prepared = _prepare_llm_question(user_query, prepared.snapshot, prepared.context)
+        if settings.AGENT_MODE == AGENT_MODE_TOOLS:
+            yield await _answer_with_tools(prepared, user_query)
+            return
+
+        chain, cache_name = await _get_request_chain(prepared)
+        logger.info(f"Streaming answer for question: {user_query[:100]}...")
+        parts = []
+        usage = None
+        async with llm_limiter.slot():
+            while True:
+                try:
+                    async for chunk in chain.astream(prepared.chain_inputs):
+                        usage = add_usage(usage, chunk.usage_metadata)
+                        text = message_text(chunk)
+                        if text:
+                            parts.append(text)
+                            yield text
+                    break
+                except Exception as e:
+                    # Retry once without the cached content, unless text was already sent
+                    if parts:
+                        raise
+                    chain = _discard_cached_content(prepared, cache_name, e)
+                    cache_name = None
+        prompt_cache_stats.record(usage)
+
+        if settings.RESPONSE_CACHE_ENABLED:
+            response_cache.put(prepared.snapshot.version, user_query, "".join(parts))
+
+    except Exception as e:
+        yield _format_error(e)
 
 
 async def handle_hotel_query_simple(user_query: str) -> str:
     """
     Handle hotel queries using simple file context approach.
     
-    This is the async wrapper for the WebSocket API integration.
-    Executes the synchronous agent function in a thread pool to avoid
-    blocking the event loop.
+    This is the async entry point for the WebSocket API integration. The LLM
+    is called natively with ainvoke, so waiting on the provider doesn't pin a
+    thread; the number of concurrent calls is bounded by the LLM limiter.
     
     Args:
         user_query: User's query string
@@ -262,8 +586,37 @@ async def handle_hotel_query_simple(user_query: str) -> str:
     Returns:
         str: Formatted response from the agent
     """
-    # Run the synchronous function in a thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(None, answer_hotel_question, user_query)
-    return response
+    try:
+        snapshot = await hotel_data_store.acurrent()
+        prepared = _prepare_question(user_query, snapshot)
+        if prepared.answer is not None:
+            return prepared.answer
+
+        if prepared.analytics:
+            answer = await _answer_with_sql(user_query)
+            if answer is not None:
+                return answer
+            prepared = _prepare_llm_question(user_query, prepared.snapshot, prepared.context)
 
+        if settings.AGENT_MODE == AGENT_MODE_TOOLS:
+            return await _answer_with_tools(prepared, user_query)
+
+        chain, cache_name = await _get_request_chain(prepared)
+        logger.info(f"Processing question: {user_query[:100]}...")
+        async with llm_limiter.slot():
+            try:
+                response = await chain.ainvoke(prepared.chain_inputs)
+            except Exception as e:
+                # Retry once without the cached content
+                chain = _discard_cached_content(prepared, cache_name, e)
+                response = await chain.ainvoke(prepared.chain_inputs)
+        prompt_cache_stats.record(response.usage_metadata)
+        answer = message_text(response)
+
+        if settings.RESPONSE_CACHE_ENABLED:
+            response_cache.put(snapshot.version, user_query, answer)
+
+        return answer
+
+    except Exception as e:
+        return _format_error(e)
@@ -0,0 +1,376 @@
+"""
+Hotel Tool Agent
+
+This module implements an agent mode where the LLM doesn't receive the hotel
+catalog in the prompt. Instead it calls local lookup tools (list hotels, room
+prices, meal plan surcharges, room counts and hotel details) backed by the
+in-memory indexes of the current data version, so the prompt size stays
+constant regardless of the number of hotels.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+from util.configuration import settings
+from util.logger_config import logger
+
+from agents.context_builder import HotelContext
+from agents.document_index import document_index, format_matches
+from agents.hotel_query_engine import (
+    CATEGORIES,
+    CATEGORY_WORDS,
+    MEAL_PLAN_PHRASES,
+    ROOM_TYPE_WORDS,
+    ROOM_TYPES,
+    SEASON_WORDS,
+    QueryIntent,
+    is_meal_plan_negated,
+)
+from agents.hotel_retrieval import normalize_text
+from agents.llm_providers import message_text
+
+TOOL_AGENT_INSTRUCTIONS = (
+    "You are a helpful hotel assistant. You don't have the hotel catalog in this conversation: "
+    "use the tools to look up hotels, rooms, prices and meal plans before answering."
+) + """
+
+When answering questions:
+- Call the tools needed to answer; call list_hotels first if you don't know the hotel names
+- Only state facts returned by the tools; if information is not available, say so clearly
+- Format responses in a clear, readable way using markdown
+- Use bullet points and tables when appropriate
+- Include specific prices, addresses, and details when available"""
+
+
+def _parse_choice(
+    value: str, words: Dict[str, str], allowed: Sequence[str], field: str
+) -> Tuple[str, ...]:
+    """
+    Parse an optional tool argument into the allowed values.
+
+    Raises:
+        ValueError: If the value is not recognized
+    """
+    if not value:
+        return tuple(allowed)
+    parsed = next((words[w] for w in normalize_text(value).split() if w in words), None)
+    if parsed is None:
+        raise ValueError(f"Unknown {field} '{value}'. Valid values: {', '.join(allowed)}")
+    return (parsed,)
+
+
+def _parse_meal_plan(value: str) -> Optional[str]:
+    """
+    Parse an optional meal plan argument.
+
+    Raises:
+        ValueError: If the meal plan is not recognized or is excluded ("without breakfast")
+    """
+    if not value:
+        return None
+    text = normalize_text(value)
+    if is_meal_plan_negated(text):
+        raise ValueError(
+            f"Meal plan '{value}' excludes a plan; pass the plan to price instead (e.g. Room Only)"
+        )
+    padded = f" {text} "
+    meal_plan = next((plan for phrase, plan in MEAL_PLAN_PHRASES if f" {phrase} " in padded), None)
+    if meal_plan is None:
+        plans = sorted({plan for _, plan in MEAL_PLAN_PHRASES})
+        raise ValueError(f"Unknown meal plan '{value}'. Valid values: {', '.join(plans)}")
+    return meal_plan
+
+
+class HotelTools:
+    """
+    Lookup tools over the indexes of one hotel data version.
+    """
+
+    def __init__(self, context: HotelContext):
+        """
+        Build the tools.
+
+        Args:
+            context: Cached context of a data version (hotel index and room index)
+        """
+        self._index = context.hotel_index
+        self._engine = context.query_engine
+        self.tools = [
+            StructuredTool.from_function(
+                func=self._guarded(self.list_hotels),
+                name="list_hotels",
+                description="List the hotels, optionally filtered by city and/or country.",
+            ),
+            StructuredTool.from_function(
+                func=self._guarded(self.get_hotel_details),
+                name="get_hotel_details",
+                description=(
+                    "Get the full details of a hotel: address, meal plan multipliers, "
+                    "charges and a table of its rooms with prices and room IDs."
+                ),
+            ),
+            StructuredTool.from_function(
+                func=self._guarded(self.get_room_prices),
+                name="get_room_prices",
+                description=(
+                    "Get room prices per night. All filters are optional: hotel name, city, "
+                    "room_type (Single, Double, Triple), category (Standard, Premium), "
+                    "season (off, peak), meal_plan (Room Only, Room and Breakfast, Half Board, "
+                    "Full Board, All Inclusive) and extreme ('min' or 'max' for the cheapest "
+                    "or most expensive option)."
+                ),
+            ),
+            StructuredTool.from_function(
+                func=self._guarded(self.get_meal_plan_surcharge),
+                name="get_meal_plan_surcharge",
+                description=(
+                    "Get the meal plan price multipliers and surcharges of the hotels, "
+                    "optionally filtered by hotel name, city and meal plan."
+                ),
+            ),
+            StructuredTool.from_function(
+                func=self._guarded(self.count_rooms),
+                name="count_rooms",
+                description=(
+                    "Count rooms per type. All filters are optional: hotel name, city, "
+                    "room_type (Single, Double, Triple) and category (Standard, Premium)."
+                ),
+            ),
+        ]
+        if settings.DOCUMENT_INDEX_ENABLED:
+            self.tools.append(
+                StructuredTool.from_function(
+                    func=self._guarded(self.search_documents),
+                    name="search_documents",
+                    description=(
+                        "Search the hotel documents (hotel details, room lists and bookings "
+                        "with guest origin, dates, meal plan and total price) and return the "
+                        "most relevant passages. Use it for bookings and anything the other "
+                        "tools don't cover."
+                    ),
+                )
+            )
+        self.tools_by_name = {tool.name: tool for tool in self.tools}
+
+    @staticmethod
+    def _guarded(func):
+        """Return invalid arguments as a message the LLM can correct."""
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            try:
+                return func(**kwargs)
+            except ValueError as e:
+                return f"Error: {e}"
+        return wrapper
+
+    def _hotels(self, hotel: str = "", city: str = "", country: str = "") -> Tuple[int, ...]:
+        """
+        Resolve the hotel filters.
+
+        Raises:
+            ValueError: If no hotel matches the filters
+        """
+        positions = tuple(self._index.find(name=hotel, city=city, country=country))
+        if not positions:
+            raise ValueError(
+                "No hotel matches the given filters; call list_hotels to see the hotels"
+            )
+        return positions
+
+    def list_hotels(self, city: str = "", country: str = "") -> str:
+        """List the hotels, optionally filtered by city and country."""
+        hotels = self._hotels(city=city, country=country)
+        return self._engine.render(
+            QueryIntent("list_hotels", hotels, ROOM_TYPES, CATEGORIES, ("off", "peak"))
+        )
+
+    def get_hotel_details(self, hotel: str) -> str:
+        """Get the details of a hotel and its rooms."""
+        return "\n".join(self._index.segment(position) for position in self._hotels(hotel=hotel))
+
+    def get_room_prices(
+        self,
+        hotel: str = "",
+        city: str = "",
+        room_type: str = "",
+        category: str = "",
+        season: str = "",
+        meal_plan: str = "",
+        extreme: str = "",
+    ) -> str:
+        """Get room prices per night."""
+        if extreme and extreme not in ("min", "max"):
+            raise ValueError("extreme must be 'min' or 'max'")
+        intent = QueryIntent(
+            kind="room_prices",
+            hotels=self._hotels(hotel=hotel, city=city),
+            room_types=_parse_choice(room_type, ROOM_TYPE_WORDS, ROOM_TYPES, "room type"),
+            categories=_parse_choice(category, CATEGORY_WORDS, CATEGORIES, "category"),
+            seasons=_parse_choice(season, SEASON_WORDS, ("off", "peak"), "season"),
+            meal_plan=_parse_meal_plan(meal_plan),
+            extreme=extreme or None,
+        )
+        return self._engine.render(intent)
+
+    def get_meal_plan_surcharge(self, hotel: str = "", city: str = "", meal_plan: str = "") -> str:
+        """Get the meal plan surcharges."""
+        hotels = self._hotels(hotel=hotel, city=city)
+        plan = _parse_meal_plan(meal_plan)
+        plans = [plan] if plan else list(dict.fromkeys(p for _, p in MEAL_PLAN_PHRASES))
+        return "\n\n".join(
+            self._engine.render(QueryIntent(
+                "meal_plan_charge", hotels, ROOM_TYPES, CATEGORIES, ("off", "peak"), meal_plan=p
+            ))
+            for p in plans
+        )
+
+    def count_rooms(
+        self, hotel: str = "", city: str = "", room_type: str = "", category: str = ""
+    ) -> str:
+        """Count rooms per type."""
+        intent = QueryIntent(
+            kind="room_counts",
+            hotels=self._hotels(hotel=hotel, city=city),
+            room_types=_parse_choice(room_type, ROOM_TYPE_WORDS, ROOM_TYPES, "room type"),
+            categories=_parse_choice(category, CATEGORY_WORDS, CATEGORIES, "category"),
+            seasons=("off", "peak"),
+        )
+        return self._engine.render(intent)
+
+    def search_documents(self, query: str) -> str:
+        """Search the document index."""
+        if not document_index.ready:
+            raise ValueError("The document index is still being built; try the other tools")
+        matches = document_index.search(query, settings.DOCUMENT_INDEX_TOP_K)
+        return format_matches(matches) or "No matching documents"
+
+
+class ToolAgentStats:
+    """Thread-safe counters of the tool agent."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._questions = 0
+        self._steps = 0
+        self._step_limit_reached = 0
+        self._tool_calls: Dict[str, int] = {}
+        self._tool_seconds = 0.0
+
+    def record_question(self, steps: int, limit_reached: bool) -> None:
+        """Record the LLM steps used to answer a question."""
+        with self._lock:
+            self._questions += 1
+            self._steps += steps
+            self._step_limit_reached += int(limit_reached)
+
+    def record_tool_call(self, name: str, seconds: float) -> None:
+        """Record one tool call."""
+        with self._lock:
+            self._tool_calls[name] = self._tool_calls.get(name, 0) + 1
+            self._tool_seconds += seconds
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return the tool agent metrics.
+
+        Returns:
+            dict: Questions, LLM steps per question, calls per tool and
+            average tool latency in milliseconds
+        """
+        with self._lock:
+            calls = sum(self._tool_calls.values())
+            return {
+                "questions": self._questions,
+                "avg_steps": self._steps / self._questions if self._questions else 0.0,
+                "step_limit_reached": self._step_limit_reached,
+                "tool_calls": dict(self._tool_calls),
+                "avg_tool_ms": self._tool_seconds * 1000 / calls if calls else 0.0,
+            }
+
+
+# Shared counters used by the agents
+tool_agent_stats = ToolAgentStats()
+
+# Tools of the most recent data versions
+_tools_by_version: "OrderedDict[str, HotelTools]" = OrderedDict()
+_tools_lock = threading.Lock()
+
+
+def get_hotel_tools(context: HotelContext) -> HotelTools:
+    """
+    Return the tools of a data version, building them on first use.
+
+    Args:
+        context: Cached context of the data version
+
+    Returns:
+        HotelTools: Tools bound to the indexes of the version
+    """
+    tools = _tools_by_version.get(context.version)
+    if tools is not None:
+        return tools
+    with _tools_lock:
+        if context.version not in _tools_by_version:
+            _tools_by_version[context.version] = HotelTools(context)
+            while len(_tools_by_version) > 2:
+                _tools_by_version.popitem(last=False)
+        return _tools_by_version[context.version]
+
+
+async def answer_with_tools(llm: Any, context: HotelContext, question: str, max_steps: int) -> str:
+    """
+    Answer a question with the tool-calling agent loop.
+
+    Args:
+        llm: LangChain chat model supporting tool calling
+        context: Cached context of the data version
+        question: User's question
+        max_steps: Maximum number of LLM calls that may request tools
+
+    Returns:
+        str: Agent's response
+    """
+    hotel_tools = get_hotel_tools(context)
+    llm_with_tools = llm.bind_tools(hotel_tools.tools)
+    messages: List[Any] = [
+        SystemMessage(content=TOOL_AGENT_INSTRUCTIONS),
+        HumanMessage(content=question),
+    ]
+
+    for step in range(1, max_steps + 1):
+        response = await llm_with_tools.ainvoke(messages)
+        if not response.tool_calls:
+            tool_agent_stats.record_question(step, limit_reached=False)
+            return message_text(response)
+        messages.append(response)
+        for tool_call in response.tool_calls:
+            tool = hotel_tools.tools_by_name.get(tool_call["name"])
+            start = time.perf_counter()
+            if tool is None:
+                result = f"Error: unknown tool {tool_call['name']}"
+            else:
+                try:
+                    result = tool.invoke(tool_call["args"])
+                except ValueError as e:
+                    # Missing or wrongly typed arguments fail validation (pydantic's
+                    # ValidationError is a ValueError) before the guarded tool runs
+                    result = f"Error: invalid arguments for {tool_call['name']}: {e}"
+            tool_agent_stats.record_tool_call(tool_call["name"], time.perf_counter() - start)
+            logger.info(f"Tool {tool_call['name']}({tool_call['args']}) -> {len(result)} chars")
+            messages.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
+
+    # Step limit reached: answer with the information gathered so far
+    response = await llm.ainvoke(messages)
+    tool_agent_stats.record_question(max_steps + 1, limit_reached=True)
+    return message_text(response)
+
+
+def get_tool_agent_stats() -> Dict[str, object]:
+    """Return metrics of the tool agent."""
+    return tool_agent_stats.stats()
@@ -0,0 +1,282 @@
+"""
+LLM Provider Registry
+
+This module builds the LLM clients once per configuration and shares them
+across all requests. The OpenAI client gets explicitly pooled httpx clients
+(max connections, keep-alive, HTTP/2 when the h2 package is installed); the
+Gemini client receives the same pool settings through the client arguments of
+the google-genai SDK. Clients can be warmed up at startup so the first
+question doesn't pay for building the client and opening the TLS connection.
+"""
+
+import importlib.util
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+import httpx
+
+try:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+except ImportError:
+    # Fallback to community package if google_genai not available
+    from langchain_community.chat_models import ChatGoogleGenerativeAI
+
+# Import ChatOpenAI for proxy/custom endpoint support
+try:
+    from langchain_openai import ChatOpenAI
+except ImportError:
+    ChatOpenAI = None
+
+from config.agent_config import AgentConfig
+from util.configuration import settings
+from util.logger_config import logger
+
+# Default endpoint used to open the first OpenAI connection during warm-up
+OPENAI_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+
+def message_text(message: Any) -> str:
+    """
+    Extract the text of a chat model message or streamed message chunk.
+
+    Args:
+        message: Message (or chunk) returned by a LangChain chat model
+
+    Returns:
+        str: Text content of the message (empty for non-text parts)
+    """
+    content = message.content
+    if isinstance(content, str):
+        return content
+    # Some providers return a list of content parts
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for part in content
+    )
+
+
+def _http2_available() -> bool:
+    """Check whether HTTP/2 was requested and the h2 package is installed."""
+    return settings.LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def _pool_limits() -> httpx.Limits:
+    """Return the connection pool limits from the settings."""
+    return httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+@dataclass
+class HTTPClientPool:
+    """Pooled sync and async HTTP clients shared by one LLM client."""
+
+    client: httpx.Client
+    async_client: httpx.AsyncClient
+    http2: bool
+    requests: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def create(cls) -> "HTTPClientPool":
+        """
+        Create the clients with the pool settings.
+
+        Returns:
+            HTTPClientPool: New pool
+        """
+        http2 = _http2_available()
+        limits = _pool_limits()
+        pool = cls(
+            client=httpx.Client(limits=limits, http2=http2),
+            async_client=httpx.AsyncClient(limits=limits, http2=http2),
+            http2=http2,
+        )
+        pool.client.event_hooks["request"].append(pool._count_request)
+        pool.async_client.event_hooks["request"].append(pool._acount_request)
+        return pool
+
+    def _count_request(self, request: httpx.Request) -> None:
+        """Count an outgoing request."""
+        with self._lock:
+            self.requests += 1
+
+    async def _acount_request(self, request: httpx.Request) -> None:
+        """Count an outgoing async request."""
+        self._count_request(request)
+
+    @staticmethod
+    def _connection_stats(client: Any) -> Dict[str, int]:
+        """Count the open and in-use connections of a client's pool."""
+        # httpx doesn't expose its connection pool publicly
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {"open": len(connections), "idle": idle, "in_use": len(connections) - idle}
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return pool metrics.
+
+        Returns:
+            dict: Requests sent, HTTP/2 flag and connection counts per client
+        """
+        sync_stats = self._connection_stats(self.client)
+        async_stats = self._connection_stats(self.async_client)
+        in_use = sync_stats["in_use"] + async_stats["in_use"]
+        max_connections = settings.LLM_MAX_CONNECTIONS
+        return {
+            "requests": self.requests,
+            "http2": self.http2,
+            "sync_connections": sync_stats,
+            "async_connections": async_stats,
+            "utilization": in_use / max_connections if max_connections else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        """Close both clients."""
+        self.client.close()
+        await self.async_client.aclose()
+
+
+class LLMProviderRegistry:
+    """
+    Registry of LLM clients keyed by provider, model and temperature.
+    """
+
+    def __init__(self):
+        """Initialize the registry."""
+        self._lock = threading.Lock()
+        self._llms: Dict[Tuple[str, str, float], Any] = {}
+        self._pools: Dict[Tuple[str, str, float], HTTPClientPool] = {}
+
+    @staticmethod
+    def _key(config: AgentConfig) -> Tuple[str, str, float]:
+        """Return the registry key of a configuration."""
+        return (config.provider, config.model, float(config.temperature))
+
+    def get_llm(self, config: AgentConfig) -> Any:
+        """
+        Return the LLM client for a configuration, building it on first use.
+
+        Args:
+            config: Agent configuration
+
+        Returns:
+            LangChain chat model
+
+        Raises:
+            ImportError: If the provider package is not installed
+        """
+        key = self._key(config)
+        llm = self._llms.get(key)
+        if llm is not None:
+            return llm
+
+        with self._lock:
+            if key not in self._llms:
+                self._llms[key] = self._build_llm(key, config)
+            return self._llms[key]
+
+    def _build_llm(self, key: Tuple[str, str, float], config: AgentConfig) -> Any:
+        """Build the LLM client of a configuration (lock must be held)."""
+        if config.provider == "openai":
+            # Standard OpenAI API
+            if not ChatOpenAI:
+                raise ImportError(
+                    "langchain_openai is required for OpenAI provider. "
+                    "Install with: pip install langchain-openai"
+                )
+            pool = HTTPClientPool.create()
+            self._pools[key] = pool
+            llm = ChatOpenAI(
+                model=config.model,
+                temperature=config.temperature,
+                api_key=config.api_key,
+                http_client=pool.client,
+                http_async_client=pool.async_client,
+                # Report token usage (including cached prompt tokens) when streaming
+                stream_usage=True,
+            )
+            logger.info(f"Using OpenAI API with model: {config.model} (HTTP/2: {pool.http2})")
+            return llm
+
+        # Standard Gemini API usage; the SDK builds its httpx clients from client_args
+        llm = ChatGoogleGenerativeAI(
+            model=config.model,
+            temperature=config.temperature,
+            google_api_key=config.api_key,
+            client_args={"limits": _pool_limits(), "http2": _http2_available()},
+        )
+        logger.info(f"Using Gemini API with model: {config.model}")
+        return llm
+
+    async def warm_up(self, config: AgentConfig) -> None:
+        """
+        Build the client of a configuration and open its first connection.
+
+        Args:
+            config: Agent configuration
+        """
+        llm = self.get_llm(config)
+        pool = self._pools.get(self._key(config))
+        if pool is None or not settings.LLM_WARMUP_CONNECT:
+            return
+
+        base_url = str(getattr(llm, "openai_api_base", None) or OPENAI_DEFAULT_BASE_URL)
+        try:
+            # Any response will do: the point is the TLS handshake and keep-alive connection
+            await pool.async_client.head(base_url, timeout=5.0)
+            logger.info(f"Opened LLM connection to {base_url}")
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not open LLM connection to {base_url}: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return registry metrics.
+
+        Returns:
+            dict: Pool limits, built clients and pool metrics per client
+        """
+        with self._lock:
+            keys = list(self._llms)
+            pools = dict(self._pools)
+        return {
+            "limits": {
+                "max_connections": settings.LLM_MAX_CONNECTIONS,
+                "max_keepalive_connections": settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                "keepalive_expiry": settings.LLM_KEEPALIVE_EXPIRY,
+            },
+            "clients": [
+                {
+                    "provider": provider,
+                    "model": model,
+                    "temperature": temperature,
+                    # Gemini clients are created inside the google-genai SDK
+                    "pool": pools[(provider, model, temperature)].stats()
+                    if (provider, model, temperature) in pools else None,
+                }
+                for provider, model, temperature in keys
+            ],
+        }
+
+    async def aclose(self) -> None:
+        """Close the HTTP clients and forget the built LLM clients."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._llms.clear()
+        for pool in pools:
+            await pool.aclose()
+
+
+# Shared registry used by the agents
+provider_registry = LLMProviderRegistry()
+
+
+def get_provider_stats() -> Dict[str, object]:
+    """Return metrics of the LLM clients and their connection pools."""
+    return provider_registry.stats()
@@ -0,0 +1,289 @@
+"""
+Prompt Cache
+
+This module defines the prompt layout used by the agents and the support for
+provider-side prompt caching. The system message is a static prefix (the
+instructions followed by the hotel context) and the question always comes
+last, so every request on the same context shares a byte-identical prefix:
+
+- OpenAI caches long prefixes automatically; requests are tagged with a
+  prompt_cache_key derived from the prefix so they are routed to the same cache.
+- Gemini supports explicit context caching: when enabled, the prefix of each
+  data version is uploaded once as cached content and requests only send the
+  question.
+
+Cached vs uncached input tokens are tracked from the usage metadata returned
+by the providers.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from util.logger_config import logger
+
+# Instructions placed before the hotel context; must not change between requests
+SYSTEM_INSTRUCTIONS = (
+    "You are a helpful hotel assistant. Use the hotel information below to answer questions."
+) + """
+
+When answering questions:
+- Be accurate and specific
+- Reference hotel names, locations, and details from the data
+- If information is not available, say so clearly
+- Format responses in a clear, readable way using markdown
+- Use bullet points and tables when appropriate
+- Include specific prices, addresses, and details when available
+
+Hotel Data:
+"""
+
+
+def build_prompt_prefix(hotel_context: str) -> str:
+    """
+    Build the static prompt prefix for a hotel context.
+
+    Args:
+        hotel_context: Hotel context text
+
+    Returns:
+        str: System message content (instructions followed by the context)
+    """
+    return f"{SYSTEM_INSTRUCTIONS}{hotel_context}"
+
+
+def prompt_cache_key(hotel_context: str) -> str:
+    """
+    Return a cache routing key for the prefix of a hotel context.
+
+    Args:
+        hotel_context: Hotel context text
+
+    Returns:
+        str: Key shared by every request with the same prefix
+    """
+    digest = hashlib.sha256(hotel_context.encode("utf-8")).hexdigest()[:16]
+    return f"hotel-assistant-{digest}"
+
+
+class PromptCacheStats:
+    """Thread-safe counters of cached and uncached prompt tokens."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._input_tokens = 0
+        self._cached_tokens = 0
+
+    def record(self, usage_metadata: Optional[Dict[str, Any]]) -> None:
+        """
+        Record the token usage of one LLM call.
+
+        Args:
+            usage_metadata: LangChain usage metadata of the response
+        """
+        if not usage_metadata:
+            return
+        details = usage_metadata.get("input_token_details") or {}
+        with self._lock:
+            self._requests += 1
+            self._input_tokens += usage_metadata.get("input_tokens", 0) or 0
+            self._cached_tokens += details.get("cache_read", 0) or 0
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return the prompt token metrics.
+
+        Returns:
+            dict: Requests with usage data, input tokens split into cached and
+            uncached, and the share of cached input tokens
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "input_tokens": self._input_tokens,
+                "cached_input_tokens": self._cached_tokens,
+                "uncached_input_tokens": self._input_tokens - self._cached_tokens,
+                "cached_ratio": (
+                    self._cached_tokens / self._input_tokens if self._input_tokens else 0.0
+                ),
+            }
+
+
+def add_usage(
+    total: Optional[Dict[str, Any]], usage: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Add the usage metadata of a streamed chunk to a running total.
+
+    Args:
+        total: Usage accumulated so far
+        usage: Usage of the new chunk
+
+    Returns:
+        dict: Accumulated input tokens and cached input tokens
+    """
+    if not usage:
+        return total
+    total = total or {"input_tokens": 0, "input_token_details": {"cache_read": 0}}
+    total["input_tokens"] += usage.get("input_tokens", 0) or 0
+    details = usage.get("input_token_details") or {}
+    total["input_token_details"]["cache_read"] += details.get("cache_read", 0) or 0
+    return total
+
+
+class GeminiContextCache:
+    """
+    Explicit Gemini context caches, one per hotel data version.
+
+    The provider deletes a cached content when its TTL runs out, so each name
+    is only used until shortly before that and then recreated. Creation
+    failures (e.g. a context below the provider's minimum cacheable size) are
+    remembered for a short backoff, so the request path falls back to the
+    regular prompt without retrying on every question.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        refresh_margin_seconds: float = 60.0,
+        failure_backoff_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache registry.
+
+        Args:
+            ttl_seconds: Time to live of the cached content at the provider
+            refresh_margin_seconds: How long before the TTL runs out a cache is recreated
+                (at most half the TTL)
+            failure_backoff_seconds: How long a failed creation is remembered before retrying
+            clock: Monotonic clock, in seconds
+        """
+        self._ttl = ttl_seconds
+        self._refresh_margin = min(refresh_margin_seconds, ttl_seconds / 2)
+        self._failure_backoff = failure_backoff_seconds
+        self._clock = clock
+        # Cached content name (None after a failure) and until when it can be used, per version
+        self._entries: Dict[str, Tuple[Optional[str], float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._created = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def _valid_entry(self, version: str) -> Optional[Tuple[Optional[str], float]]:
+        """Return the entry of a version if it can still be used."""
+        entry = self._entries.get(version)
+        if entry is not None and self._clock() < entry[1]:
+            return entry
+        return None
+
+    async def get_cache_name(
+        self, llm: Any, model: str, version: str, prefix: str
+    ) -> Optional[str]:
+        """
+        Return the cached content name of a data version, creating it when needed.
+
+        A cache is (re)created on first use and when it is about to expire.
+
+        Args:
+            llm: ChatGoogleGenerativeAI instance whose client creates the cache
+            model: Model name
+            version: Hotel data version
+            prefix: Static prompt prefix of the version
+
+        Returns:
+            str: Cached content name, or None if caching is unavailable
+        """
+        entry = self._valid_entry(version)
+        if entry is not None:
+            return entry[0]
+
+        lock = self._locks.setdefault(version, asyncio.Lock())
+        async with lock:
+            entry = self._valid_entry(version)
+            if entry is not None:
+                return entry[0]
+            try:
+                from google.genai import types
+
+                created_at = self._clock()
+                cache = await llm.client.aio.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"hotel-context-{version}",
+                        system_instruction=prefix,
+                        ttl=f"{int(self._ttl)}s",
+                    ),
+                )
+                valid_until = created_at + self._ttl - self._refresh_margin
+                self._entries[version] = (cache.name, valid_until)
+                self._created += 1
+                logger.info(
+                    f"Created Gemini context cache {cache.name} for data version {version}"
+                )
+            except Exception as e:
+                self._entries[version] = (None, self._clock() + self._failure_backoff)
+                self._failed += 1
+                logger.warning(
+                    f"Gemini context cache unavailable for data version {version}: {e}"
+                )
+            return self._entries[version][0]
+
+    def discard(self, version: str, name: str, error: Exception) -> None:
+        """
+        Forget a cached content the provider rejected, so the next request recreates it.
+
+        Args:
+            version: Hotel data version
+            name: Cached content name used by the failed request
+            error: Error returned by the provider
+        """
+        entry = self._entries.get(version)
+        if entry is not None and entry[0] == name:
+            self._entries.pop(version, None)
+        self._rejected += 1
+        logger.warning(f"Gemini context cache {name} rejected, retrying without it: {error}")
+
+    def invalidate(self, keep_version: Optional[str] = None) -> None:
+        """
+        Forget the caches of old data versions (they expire at the provider).
+
+        Args:
+            keep_version: Data version whose cache is kept
+        """
+        for version in list(self._entries):
+            if version != keep_version:
+                self._entries.pop(version, None)
+                self._locks.pop(version, None)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return the context cache metrics.
+
+        Returns:
+            dict: Caches created, failed creations, caches rejected by the
+            provider and versions with a usable cache
+        """
+        now = self._clock()
+        return {
+            "created": self._created,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "versions": [
+                version for version, (name, valid_until) in list(self._entries.items())
+                if name and now < valid_until
+            ],
+        }
+
+
+# Shared counters used by the agents
+prompt_cache_stats = PromptCacheStats()
+
+
+def get_prompt_cache_stats() -> Dict[str, object]:
+    """Return metrics of cached and uncached prompt tokens."""
+    return prompt_cache_stats.stats()
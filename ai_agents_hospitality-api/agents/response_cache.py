@@ -0,0 +1,263 @@
+"""
+Response Cache
+
+This module caches LLM answers keyed on the normalized question and the hotel
+data version. Besides exact matches, a similarity tier serves near-duplicate
+questions (different filler words, plurals or small typos) by comparing
+character trigram vectors, but only when both questions have the same content
+words in the same order, up to typos: word order changes the meaning of
+comparisons ("is A cheaper than B" vs "is B cheaper than A"). Trigrams are
+computed over the content words only, so filler words don't lower the
+similarity.
+
+Entries are evicted in LRU order when the entry or memory cap is reached,
+expire after a TTL, and are invalidated when the hotel data is reloaded.
+"""
+
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, Optional, Tuple
+
+from agents.hotel_retrieval import FUZZY_WORD_THRESHOLD, normalize_text
+
+# Words that don't change the meaning of a question
+STOPWORDS = {
+    "a", "an", "the", "of", "for", "in", "at", "on", "to", "and", "or", "is", "are",
+    "me", "tell", "please", "can", "could", "you", "give", "show", "what", "whats",
+    "i", "would", "like", "know", "about", "there", "do", "does", "with", "by", "s",
+}
+
+
+def _stem(word: str) -> str:
+    """Strip a plural "s" so that "rooms" and "room" compare equal."""
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
+
+
+def question_signature(normalized_question: str) -> Tuple[str, ...]:
+    """
+    Return the content words of a normalized question, in order.
+
+    Args:
+        normalized_question: Question normalized with normalize_text
+
+    Returns:
+        tuple: Stemmed words without stopwords
+    """
+    return tuple(_stem(w) for w in normalized_question.split() if w not in STOPWORDS)
+
+
+def _trigrams(text: str) -> Counter:
+    """Return the character trigram counts of a text."""
+    padded = f"  {text} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _cosine(a: Counter, a_norm: float, b: Counter, b_norm: float) -> float:
+    """Cosine similarity of two trigram vectors."""
+    if not a_norm or not b_norm:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(count * b.get(gram, 0) for gram, count in a.items()) / (a_norm * b_norm)
+
+
+def _signatures_compatible(a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+    """
+    Check that two signatures only differ by typos.
+
+    Both must have the same number of content words and the words at each
+    position must be equal or fuzzily match, so "Victora" is compatible with
+    "Victoria" but "Paris" is not compatible with "Nice", and "Imperial Crown
+    cheaper Grand Victoria" is not compatible with the reversed comparison.
+    Words with digits must be equal: "2024" is not a typo of "2025".
+    """
+    return len(a) == len(b) and all(
+        x == y or (
+            not any(c.isdigit() for c in x + y)
+            and SequenceMatcher(None, x, y).ratio() >= FUZZY_WORD_THRESHOLD
+        )
+        for x, y in zip(a, b, strict=True)
+    )
+
+
+@dataclass
+class CacheEntry:
+    """Cached answer of a question for one data version."""
+
+    version: str
+    question: str
+    answer: str
+    signature: Tuple[str, ...]
+    trigrams: Counter
+    norm: float
+    size_bytes: int
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class ResponseCache:
+    """
+    LRU/TTL cache of answers with an optional near-duplicate similarity tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float = 0.9,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            max_bytes: Memory cap for cached questions and answers
+            ttl_seconds: Time to live of an entry (0 means no expiration)
+            similarity_threshold: Minimum trigram cosine similarity for a
+                near-duplicate hit (0 disables the similarity tier)
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._similarity_threshold = similarity_threshold
+        self._entries: OrderedDict[Tuple[str, str], CacheEntry] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "exact_hits": 0,
+            "similar_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def _expired(self, entry: CacheEntry, now: float) -> bool:
+        """Check whether an entry outlived its TTL."""
+        return self._ttl > 0 and now - entry.created_at > self._ttl
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        """Remove an entry (lock must be held)."""
+        entry = self._entries.pop(key)
+        self._size_bytes -= entry.size_bytes
+
+    def get(self, version: str, question: str) -> Optional[str]:
+        """
+        Look up the cached answer of a question.
+
+        Args:
+            version: Hotel data version the answer must belong to
+            question: User's question
+
+        Returns:
+            str: Cached answer, or None on a miss
+        """
+        normalized = normalize_text(question)
+        key = (version, normalized)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters["exact_hits"] += 1
+                return entry.answer
+
+            if self._similarity_threshold > 0:
+                entry = self._find_similar(version, normalized, now)
+                if entry is not None:
+                    self._entries.move_to_end((entry.version, entry.question))
+                    self._counters["similar_hits"] += 1
+                    return entry.answer
+
+            self._counters["misses"] += 1
+            return None
+
+    def _find_similar(self, version: str, normalized: str, now: float) -> Optional[CacheEntry]:
+        """Find the most similar cached question (lock must be held)."""
+        signature = question_signature(normalized)
+        trigrams = _trigrams(" ".join(signature))
+        norm = math.sqrt(sum(c * c for c in trigrams.values()))
+
+        best, best_score = None, self._similarity_threshold
+        for entry in self._entries.values():
+            if entry.version != version or self._expired(entry, now):
+                continue
+            if entry.signature == signature:
+                return entry
+            score = _cosine(trigrams, norm, entry.trigrams, entry.norm)
+            if score >= best_score and _signatures_compatible(signature, entry.signature):
+                best, best_score = entry, score
+        return best
+
+    def put(self, version: str, question: str, answer: str) -> None:
+        """
+        Cache the answer of a question.
+
+        Args:
+            version: Hotel data version the answer was generated from
+            question: User's question
+            answer: Answer to cache
+        """
+        normalized = normalize_text(question)
+        key = (version, normalized)
+        signature = question_signature(normalized)
+        trigrams = _trigrams(" ".join(signature))
+        entry = CacheEntry(
+            version=version,
+            question=normalized,
+            answer=answer,
+            signature=signature,
+            trigrams=trigrams,
+            norm=math.sqrt(sum(c * c for c in trigrams.values())),
+            size_bytes=len(answer.encode("utf-8")) + len(normalized.encode("utf-8")),
+        )
+        if entry.size_bytes > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._size_bytes += entry.size_bytes
+            while len(self._entries) > self._max_entries or self._size_bytes > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate(self, keep_version: Optional[str] = None) -> None:
+        """
+        Drop cached answers, e.g. after the hotel data is reloaded.
+
+        Args:
+            keep_version: Data version whose answers are kept (None drops all)
+        """
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.version != keep_version]
+            for key in stale:
+                self._remove(key)
+            self._counters["invalidations"] += len(stale)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return cache metrics.
+
+        Returns:
+            dict: Hit/miss/eviction counters, hit rate, entries and memory used
+        """
+        with self._lock:
+            hits = self._counters["exact_hits"] + self._counters["similar_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+            }
@@ -0,0 +1,115 @@
+"""
+Benchmark of the hotel context formats.
+
+This script generates synthetic datasets of 5, 50 and 200 hotels with the
+bookings-db hotel generator and compares the size of the legacy context
+(hotel_details.md plus indented JSON) with the compact context (aggregated
+room tables). Tokens are counted with tiktoken when it is installed and
+estimated at 4 characters per token otherwise.
+
+Usage:
+    python benchmark_context_format.py [--sizes 5 50 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+# Add the current directory and the bookings-db project to the path
+sys.path.insert(0, str(Path(__file__).parent))
+BOOKINGS_DB_PATH = Path(__file__).parent.parent / "bookings-db"
+sys.path.insert(0, str(BOOKINGS_DB_PATH))
+
+from agents.context_builder import render_hotel_context  # noqa: E402
+from agents.context_encoder import CONTEXT_FORMAT_COMPACT, CONTEXT_FORMAT_LEGACY  # noqa: E402
+
+
+def get_token_counter():
+    """
+    Return a token counting function and its description.
+
+    Falls back to an estimate when tiktoken is not installed or its encoding
+    can't be downloaded.
+
+    Returns:
+        tuple: (callable returning the number of tokens of a text, name)
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken cl100k_base"
+    except Exception:
+        # tiktoken not installed or its encoding can't be downloaded
+        return (lambda text: len(text) // 4), "estimated (4 chars/token)"
+
+
+def generate_dataset(num_hotels: int) -> tuple:
+    """
+    Generate a synthetic dataset with the bookings-db hotel generator.
+
+    Args:
+        num_hotels: Number of hotels to generate (at most 200)
+
+    Returns:
+        tuple: (hotels_data dict, hotel_details_text str)
+    """
+    from src.generator.hotel_generator import generate_hotels
+    from src.output.hotel_output_writer import generate_file_md_hotel_details
+
+    config_path = BOOKINGS_DB_PATH / "config" / "generate_hotels_param.yaml"
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config["num_of_hotels"] = num_hotels
+
+    hotels = generate_hotels(config)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate_file_md_hotel_details(hotels, tmp_dir + os.sep)
+        with open(Path(tmp_dir) / "hotel_details.md", encoding="utf-8") as f:
+            hotel_details_text = f.read()
+    return {"Hotels": hotels}, hotel_details_text
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(
+        description="Compare the legacy and compact hotel context formats"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[5, 50, 200], help="Dataset sizes in hotels"
+    )
+    args = parser.parse_args()
+
+    count_tokens, counter_name = get_token_counter()
+    print(f"Token counter: {counter_name}\n")
+    print(
+        f"{'hotels':>6} | {'format':>7} | {'bytes':>10} | {'tokens':>9} | "
+        f"{'tokens/hotel':>12} | {'render ms':>9} | {'saving':>6}"
+    )
+    print("-" * 78)
+
+    for size in args.sizes:
+        hotels_data, hotel_details_text = generate_dataset(size)
+        num_hotels = len(hotels_data["Hotels"])
+        legacy_tokens = None
+        for context_format in (CONTEXT_FORMAT_LEGACY, CONTEXT_FORMAT_COMPACT):
+            start = time.perf_counter()
+            text = render_hotel_context(hotels_data, hotel_details_text, context_format)
+            render_ms = (time.perf_counter() - start) * 1000
+            tokens = count_tokens(text)
+            if legacy_tokens is None:
+                legacy_tokens = tokens
+            saving = 1 - tokens / legacy_tokens if legacy_tokens else 0.0
+            print(
+                f"{num_hotels:>6} | {context_format:>7} | {len(text.encode('utf-8')):>10} | "
+                f"{tokens:>9} | {tokens / num_hotels:>12.0f} | {render_ms:>9.1f} | {saving:>6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark of the document index.
+
+This script copies the generator's markdown outputs (hotel_details.md,
+hotel_rooms.md and hotel_bookings.md) to a temporary directory, builds the
+document index from scratch, re-indexes after one file changes, and measures
+the query latency of the brute-force and approximate (IVF) searches together
+with the recall of the approximate search against the exact top-k.
+
+Usage:
+    python benchmark_document_index.py [--data-path PATH] [--copies 1] [--queries 200] [--top-k 8]
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the current directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.document_index import DOCUMENT_FILENAMES, DocumentIndex
+from util.configuration import settings
+
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / "bookings-db" / "output_files" / "hotels"
+
+QUERY_TEMPLATES = [
+    "bookings from {country} at {hotel}",
+    "address and location of {hotel}",
+    "half board bookings at {hotel} in March",
+    "rooms of {hotel}",
+    "premium triple room prices at {hotel}",
+    "guests from {city} with full board",
+    "cheapest single room at {hotel}",
+]
+
+
+def prepare_documents(data_path: Path, target: Path, copies: int) -> None:
+    """
+    Copy the documents, repeating their content to grow the index.
+
+    Args:
+        data_path: Directory with the generator's outputs
+        target: Directory receiving the documents
+        copies: Number of times the content of each document is repeated
+    """
+    target.mkdir(parents=True)
+    for name in DOCUMENT_FILENAMES:
+        source = data_path / name
+        if source.exists():
+            text = source.read_text(encoding="utf-8")
+            (target / name).write_text(text * copies, encoding="utf-8")
+
+
+def build_queries(data_path: Path, count: int) -> list:
+    """Build sample questions from the hotel names found in the documents."""
+    rooms = (data_path / "hotel_rooms.md").read_text(encoding="utf-8")
+    hotels = [line[2:].strip() for line in rooms.splitlines() if line.startswith("# ")]
+    hotels = hotels or ["Grand Victoria"]
+    rng = random.Random(42)
+    return [
+        rng.choice(QUERY_TEMPLATES).format(
+            hotel=rng.choice(hotels),
+            country=rng.choice(["Italy", "Spain", "France", "Germany"]),
+            city=rng.choice(["Rome", "Madrid", "Paris", "Berlin"]),
+        )
+        for _ in range(count)
+    ]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Return a percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(index: DocumentIndex, queries: list, top_k: int, approximate: bool) -> tuple:
+    """
+    Run the queries and time them.
+
+    Returns:
+        tuple: (latencies in milliseconds, results per query)
+    """
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        matches = index.search(query, top_k, approximate=approximate)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({(m.chunk.source, m.chunk.text) for m in matches})
+    return latencies, results
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Benchmark the document index")
+    parser.add_argument(
+        "--data-path", type=Path, default=DEFAULT_DATA_PATH, help="Generator output directory"
+    )
+    parser.add_argument(
+        "--copies", type=int, default=1, help="Repeat the documents to grow the index"
+    )
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=8, help="Chunks returned per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        documents = Path(tmp_dir) / "documents"
+        prepare_documents(args.data_path, documents, args.copies)
+
+        # Build the approximate index regardless of the size, to compare both searches
+        index = DocumentIndex(
+            Path(tmp_dir) / "index",
+            embedding_model=settings.DOCUMENT_INDEX_EMBEDDING_MODEL,
+            dim=settings.DOCUMENT_INDEX_DIM,
+            chunk_chars=settings.DOCUMENT_INDEX_CHUNK_CHARS,
+            approximate_min_chunks=1,
+            nprobe=settings.DOCUMENT_INDEX_NPROBE,
+        )
+
+        start = time.perf_counter()
+        index.refresh(documents)
+        full_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.refresh(documents)
+        unchanged = time.perf_counter() - start
+
+        with open(documents / "hotel_rooms.md", "a", encoding="utf-8") as f:
+            f.write(
+                "\n# Benchmark Hotel\n\n"
+                "| Room ID | Category |\n|---|---|\n| 01-001 | Standard |\n"
+            )
+        start = time.perf_counter()
+        index.refresh(documents)
+        incremental = time.perf_counter() - start
+
+        stats = index.stats()
+        print(f"Embedder: {stats['embedder']}")
+        print(f"Chunks: {stats['chunks']} {stats['files']}\n")
+        print(f"Full build:                {full_build * 1000:>9.1f} ms")
+        print(f"Refresh (no changes):      {unchanged * 1000:>9.1f} ms")
+        print(f"Refresh (one file changed):{incremental * 1000:>9.1f} ms\n")
+
+        queries = build_queries(documents, args.queries)
+        # Warm up the page cache of the memory-mapped vectors
+        measure(index, queries[:10], args.top_k, approximate=False)
+        exact_ms, exact = measure(index, queries, args.top_k, approximate=False)
+        approx_ms, approx = measure(index, queries, args.top_k, approximate=True)
+        recall = statistics.mean(
+            len(a & e) / len(e) for a, e in zip(approx, exact, strict=True) if e
+        )
+
+        recall_header = f"recall@{args.top_k}"
+        print(
+            f"{'search':>12} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | {recall_header:>9}"
+        )
+        print("-" * 56)
+        results = (("brute-force", exact_ms, 1.0), ("approximate", approx_ms, recall))
+        for name, latencies, search_recall in results:
+            print(
+                f"{name:>12} | {percentile(latencies, 50):>7.3f} | "
+                f"{percentile(latencies, 95):>7.3f} | "
+                f"{percentile(latencies, 99):>7.3f} | {search_recall:>9.1%}"
+            )
+
+        shutil.rmtree(documents)
+
+
+if __name__ == "__main__":
+    main()
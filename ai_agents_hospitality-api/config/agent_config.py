@@ -7,6 +7,7 @@ environment variables taking precedence over file configuration.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
@@ -125,3 +126,29 @@ def get_agent_config() -> AgentConfig:
     
     return config
 
+
+@lru_cache(maxsize=1)
+def get_cached_agent_config() -> AgentConfig:
+    """
+    Get the agent configuration, loading it only once per process.
+
+    Use reload_agent_config() to pick up changes to the file or environment.
+
+    Returns:
+        AgentConfig: Configuration object
+
+    Raises:
+        ValueError: If required configuration is missing or invalid
+    """
+    return get_agent_config()
+
+
+def reload_agent_config() -> AgentConfig:
+    """
+    Reload the cached agent configuration.
+
+    Returns:
+        AgentConfig: Newly loaded configuration object
+    """
+    get_cached_agent_config.cache_clear()
+    return get_cached_agent_config()
@@ -11,8 +11,10 @@ Exercise 0 Implementation:
 - Integrates with WebSocket API for real-time chat
 """
 
+import asyncio
 import json
 import re
+import uuid as uuid_lib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.requests import Request
@@ -21,11 +23,30 @@ from fastapi.templating import Jinja2Templates
 
 from util.logger_config import logger
 from util.configuration import settings, PROJECT_ROOT
+from util.connection_tasks import ConnectionTaskManager, QuestionTask, get_task_stats
 
 # Import Exercise 0 agent
 EXERCISE_0_AVAILABLE = False
 try:
-    from agents.hotel_simple_agent import handle_hotel_query_simple, load_hotel_data
+    from agents.hotel_simple_agent import (
+        bookings_database,
+        handle_hotel_query_simple,
+        hotel_data_store,
+        gemini_context_cache,
+        llm_limiter,
+        load_hotel_data,
+        response_cache,
+        stream_hotel_query,
+    )
+    from agents.context_builder import get_context_stats
+    from agents.document_index import get_document_index_stats
+    from agents.bookings_sql import get_sql_stats
+    from agents.llm_providers import get_provider_stats, provider_registry
+    from agents.prompt_cache import get_prompt_cache_stats
+    from agents.hotel_tool_agent import get_tool_agent_stats
+    from config.agent_config import get_cached_agent_config
+    from agents.hotel_query_engine import get_route_stats
+    from agents.hotel_retrieval import get_retrieval_stats
     # Try to load hotel data to verify everything is set up correctly
     try:
         load_hotel_data()
@@ -177,8 +198,20 @@ async def lifespan(app: FastAPI):
     Lifespan event handler for startup and shutdown logic.
     """
     logger.info("Starting AI Hospitality API...")
+    if EXERCISE_0_AVAILABLE:
+        hotel_data_store.start_watching(settings.HOTEL_DATA_RELOAD_INTERVAL)
+        # Build the LLM client once and open its connection before the first question
+        try:
+            await provider_registry.warm_up(get_cached_agent_config())
+        except Exception as e:
+            logger.warning(f"LLM client warm-up skipped: {e}")
     yield
     logger.info("Shutting down AI Hospitality API...")
+    if EXERCISE_0_AVAILABLE:
+        hotel_data_store.stop_watching()
+        await provider_registry.aclose()
+        if bookings_database is not None:
+            await bookings_database.aclose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -200,6 +233,120 @@ async def get(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Expose runtime metrics of the agent caches.
+
+    Returns:
+        dict: Metrics grouped by component
+    """
+    if not EXERCISE_0_AVAILABLE:
+        return {"exercise_0_available": False}
+    return {
+        "exercise_0_available": True,
+        "hotel_data": hotel_data_store.stats(),
+        "hotel_context": get_context_stats(),
+        "retrieval": get_retrieval_stats(),
+        "document_index": get_document_index_stats(),
+        "routing": get_route_stats(),
+        "response_cache": response_cache.stats(),
+        "llm_concurrency": llm_limiter.stats(),
+        "llm_clients": get_provider_stats(),
+        "tool_agent": get_tool_agent_stats(),
+        "bookings_sql": get_sql_stats(),
+        "prompt_cache": {
+            **get_prompt_cache_stats(),
+            "gemini_context_cache": gemini_context_cache.stats(),
+        },
+        "questions": get_task_stats(),
+    }
+
+
+async def send_message(websocket: WebSocket, message: dict) -> None:
+    """
+    Send a message frame to the client.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection instance.
+        message (dict): Message to send.
+    """
+    await websocket.send_text(f"JSONSTART{json.dumps(message)}JSONEND")
+
+
+async def stream_response(websocket: WebSocket, question: QuestionTask) -> None:
+    """
+    Stream the Exercise 0 agent answer over the WebSocket.
+
+    Every piece of the answer is sent as a delta frame as soon as it is
+    generated, followed by a done frame carrying the full answer so the
+    client can render the final markdown.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection instance.
+        question (QuestionTask): Question to answer.
+    """
+    parts = []
+    logger.info(f"Streaming Exercise 0 agent answer for query: {question.query[:100]}...")
+    async for delta in stream_hotel_query(question.query):
+        parts.append(delta)
+        question.add_output(delta)
+        await send_message(websocket, {
+            "role": "assistant",
+            "type": "delta",
+            "id": question.message_id,
+            "content": delta
+        })
+
+    await send_message(websocket, {
+        "role": "assistant",
+        "type": "done",
+        "id": question.message_id,
+        "content": "".join(parts)
+    })
+
+
+async def answer_question(websocket: WebSocket, question: QuestionTask) -> None:
+    """
+    Answer a question received on the WebSocket.
+
+    Uses Exercise 0 agent (LangChain with file context) if available,
+    otherwise falls back to hardcoded responses.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection instance.
+        question (QuestionTask): Question to answer.
+    """
+    user_query = question.query
+
+    # Stream the answer as delta frames followed by a completion frame
+    if EXERCISE_0_AVAILABLE and settings.STREAMING_ENABLED:
+        await stream_response(websocket, question)
+        return
+
+    # Get response from Exercise 0 agent or fallback to hardcoded
+    if EXERCISE_0_AVAILABLE:
+        try:
+            logger.info(f"Using Exercise 0 agent for query: {user_query[:100]}...")
+            response_content = await handle_hotel_query_simple(user_query)
+            logger.info("✅ Exercise 0 agent response generated successfully")
+        except Exception as e:
+            logger.error(f"❌ Error in Exercise 0 agent: {e}", exc_info=True)
+            logger.warning("Falling back to hardcoded response")
+            response_content = find_matching_response(user_query)
+    else:
+        # Fallback to hardcoded responses
+        logger.debug("Using hardcoded responses (Exercise 0 not available)")
+        response_content = find_matching_response(user_query)
+
+    # Send response back to client
+    await send_message(websocket, {
+        "role": "assistant",
+        "id": question.message_id,
+        "content": response_content
+    })
+
+
 @app.websocket("/ws/{uuid}")
 async def websocket_endpoint(websocket: WebSocket, uuid: str):
     """
@@ -208,8 +355,10 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
     This endpoint establishes a WebSocket connection and handles
     bidirectional communication between the client and the server.
     
-    Uses Exercise 0 agent (LangChain with file context) if available,
-    otherwise falls back to hardcoded responses.
+    Questions are queued and answered by a per-connection worker, so the
+    client can cancel a question with {"type": "cancel", "id": ...} (no id
+    cancels all) and, unless disabled, a new question supersedes the one
+    being answered.
 
     Args:
         websocket (WebSocket): The WebSocket connection instance.
@@ -218,6 +367,33 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
     await websocket.accept()
     logger.info("WebSocket connection opened for %s", uuid)
 
+    async def handle_question(question: QuestionTask) -> None:
+        await answer_question(websocket, question)
+        logger.info(f"Sent response to {uuid}")
+
+    async def notify_cancelled(question: QuestionTask, reason: str) -> None:
+        logger.info(f"Question {question.message_id} {reason} for {uuid}")
+        try:
+            await send_message(websocket, {
+                "role": "assistant",
+                "type": "cancelled",
+                "id": question.message_id,
+                "reason": reason,
+                "content": ""
+            })
+        except Exception:
+            # The connection is already closed
+            pass
+
+    # Questions are answered by a worker task so new messages can be read meanwhile
+    task_manager = ConnectionTaskManager(
+        handle_question,
+        notify_cancelled,
+        supersede=settings.WS_SUPERSEDE_QUESTIONS,
+        max_pending=settings.WS_MAX_PENDING_QUESTIONS,
+    )
+    worker = asyncio.create_task(task_manager.run())
+
     try:
         while True:
             try:
@@ -225,38 +401,29 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
                 data = await websocket.receive_text()
                 logger.info(f"Received from {uuid}: {data}")
                 
-                # Parse the query
+                # Parse the message: a question or a cancel frame
                 try:
                     message_data = json.loads(data)
-                    user_query = message_data.get("content", data)
                 except json.JSONDecodeError:
-                    user_query = data
-                
-                # Get response from Exercise 0 agent or fallback to hardcoded
-                if EXERCISE_0_AVAILABLE:
-                    try:
-                        logger.info(f"Using Exercise 0 agent for query: {user_query[:100]}...")
-                        response_content = await handle_hotel_query_simple(user_query)
-                        logger.info(f"✅ Exercise 0 agent response generated successfully for {uuid}")
-                    except Exception as e:
-                        logger.error(f"❌ Error in Exercise 0 agent: {e}", exc_info=True)
-                        logger.warning(f"Falling back to hardcoded response for {uuid}")
-                        response_content = find_matching_response(user_query)
-                else:
-                    # Fallback to hardcoded responses
-                    logger.debug(f"Using hardcoded responses (Exercise 0 not available) for {uuid}")
-                    response_content = find_matching_response(user_query)
+                    message_data = None
+                if not isinstance(message_data, dict):
+                    message_data = {"content": data}
                 
-                # Send response back to client
-                agent_message = {
-                    "role": "assistant",
-                    "content": response_content
-                }
-                
-                await websocket.send_text(
-                    f"JSONSTART{json.dumps(agent_message)}JSONEND"
-                )
-                logger.info(f"Sent response to {uuid}")
+                message_id = str(message_data.get("id") or uuid_lib.uuid4().hex)
+                if message_data.get("type") == "cancel":
+                    cancelled = task_manager.cancel(message_data.get("id"))
+                    logger.info(f"Cancel requested by {uuid}: {cancelled} question(s) cancelled")
+                    continue
+
+                if not task_manager.submit(message_id, message_data.get("content", data)):
+                    await send_message(websocket, {
+                        "role": "assistant",
+                        "id": message_id,
+                        "content": (
+                            "⏳ **Too many pending questions.** "
+                            "Please wait for the current answers."
+                        ),
+                    })
                 
             except WebSocketDisconnect:
                 logger.info("WebSocket connection closed for %s", uuid)
@@ -273,6 +440,9 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
             uuid, str(e)
         )
     finally:
+        # Stop answering: pending LLM calls of a closed connection are cancelled
+        task_manager.close()
+        await asyncio.gather(worker, return_exceptions=True)
         try:
             await websocket.close()
         except (RuntimeError, ConnectionError) as e:
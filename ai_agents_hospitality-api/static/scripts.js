@@ -1,13 +1,76 @@
 let previousTimestamp = null;  
 const ws = new WebSocket("ws://0.0.0.0:8001/ws/fdfb8545-c177-48a2-bdce-b06af2032092_test_poc");
   
+const md = window.markdownit();
+// Messages being streamed, keyed by message id
+const streamingMessages = {};
+
 ws.onmessage = function(event) {  
-    const messages = document.getElementById('messages');  
     const data = event.data;
     const jsonStr = data.substring(data.indexOf("JSONSTART") + 9, data.indexOf("JSONEND"));
     const messageData = JSON.parse(jsonStr);
     
+    if (messageData.type === 'delta' || messageData.type === 'done') {
+        handleStreamFrame(messageData);
+        return;
+    }
+    if (messageData.type === 'cancelled') {
+        handleCancelledFrame(messageData);
+        return;
+    }
+    
     console.log('Received message:', messageData);
+    const message = appendServerMessage(messageData);
+    message.innerHTML = md.render(messageData.content);  
+    scrollToBottom();  
+};
+
+function handleStreamFrame(messageData) {
+    let stream = streamingMessages[messageData.id];
+    if (!stream) {
+        stream = {element: appendServerMessage(messageData), content: '', renderPending: false};
+        streamingMessages[messageData.id] = stream;
+    }
+
+    if (messageData.type === 'delta') {
+        stream.content += messageData.content;
+        // Re-render the partial markdown at most once per animation frame
+        if (!stream.renderPending) {
+            stream.renderPending = true;
+            requestAnimationFrame(() => {
+                stream.renderPending = false;
+                stream.element.innerHTML = md.render(stream.content);
+                scrollToBottom();
+            });
+        }
+    } else {
+        console.log('Received message:', messageData);
+        stream.content = messageData.content;
+        stream.element.innerHTML = md.render(stream.content);
+        delete streamingMessages[messageData.id];
+        scrollToBottom();
+    }
+}
+
+function handleCancelledFrame(messageData) {
+    console.log('Question cancelled:', messageData);
+    const stream = streamingMessages[messageData.id];
+    if (!stream) {
+        return;
+    }
+    delete streamingMessages[messageData.id];
+    stream.element.innerHTML = md.render(stream.content + '\n\n_(' + messageData.reason + ')_');
+    scrollToBottom();
+}
+
+function cancelQuestions(event) {
+    // Without an id the server cancels every pending question of the connection
+    ws.send(JSON.stringify({type: 'cancel'}));
+    event.preventDefault();
+}
+
+function appendServerMessage(messageData) {
+    const messages = document.getElementById('messages');  
     const currentTimestamp = messageData.timestamp;  
     const showTimestamp = previousTimestamp  
         ? (currentTimestamp - previousTimestamp >= 300)  
@@ -35,14 +98,12 @@ ws.onmessage = function(event) {
   
     const message = document.createElement('li');  
     message.classList.add('server-message');  
-    const md = window.markdownit();  
-    message.innerHTML = md.render(messageData.content);  
     messageWrapper.appendChild(icon);  
     messageWrapper.appendChild(role);  
     messageWrapper.appendChild(message);  
     messages.appendChild(messageWrapper);  
-    scrollToBottom();  
-};
+    return message;
+}
   
 function sendMessage(event) {  
     const input = document.getElementById("messageText");  
@@ -72,7 +133,8 @@ function sendMessage(event) {
     messageWrapper.appendChild(userMessage);  
     messages.appendChild(messageWrapper);  
   
-    ws.send(JSON.stringify({content: input.value, timestamp: currentTimestamp}));  
+    const messageId = crypto.randomUUID ? crypto.randomUUID() : String(Date.now()) + Math.random();
+    ws.send(JSON.stringify({id: messageId, content: input.value, timestamp: currentTimestamp}));  
     input.value = '';  
     event.preventDefault();  
     scrollToBottom();  
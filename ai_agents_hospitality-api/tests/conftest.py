@@ -0,0 +1,6 @@
+"""Shared setup of the API tests: import the agents package from the API directory."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
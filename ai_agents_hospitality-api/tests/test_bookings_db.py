@@ -0,0 +1,46 @@
+"""Tests of the errors raised by the SQLite bookings database."""
+
+import asyncio
+import sqlite3
+
+import pytest
+from agents.bookings_db import QueryFailedError, QueryTimeoutError, create_bookings_database
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "bookings.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE bookings (hotel_name TEXT, total_price REAL)")
+    conn.execute("INSERT INTO bookings VALUES ('Grand Victoria', 120.0)")
+    conn.commit()
+    conn.close()
+    return create_bookings_database(
+        f"sqlite:///{path}", pool_size=1, timeout=0.1, max_rows=10, max_scan_rows=0
+    )
+
+
+def test_invalid_sql_raises_query_failed(database):
+    with pytest.raises(QueryFailedError):
+        asyncio.run(database.execute("SELECT guest_name FROM bookings", []))
+
+    # The connection is returned to the pool
+    result = asyncio.run(database.execute("SELECT hotel_name FROM bookings", []))
+    assert result.rows == [("Grand Victoria",)]
+
+
+def test_busy_pool_raises_query_timeout(database):
+    conn = database._acquire()
+    try:
+        with pytest.raises(QueryTimeoutError):
+            asyncio.run(database.execute("SELECT hotel_name FROM bookings", []))
+    finally:
+        database._connections.put(conn)
+
+
+def test_closed_connections_are_reopened_on_next_use(database):
+    for _ in range(3):
+        asyncio.run(database.execute("SELECT hotel_name FROM bookings", []))
+        asyncio.run(database.aclose())
+
+    assert database._opened == 0
@@ -0,0 +1,27 @@
+"""Tests of the LLM concurrency limiter across event loops."""
+
+import asyncio
+
+from util.concurrency import ConcurrencyLimiter
+
+
+async def _hold_slots(limiter, count):
+    """Run count calls that hold a slot briefly, so some of them wait for one."""
+
+    async def call():
+        async with limiter.slot():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(count)))
+
+
+def test_limiter_is_usable_from_successive_event_loops():
+    limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=10, queue_timeout=0)
+
+    asyncio.run(_hold_slots(limiter, 3))
+    asyncio.run(_hold_slots(limiter, 3))
+
+    stats = limiter.stats()
+    assert stats["completed"] == 6
+    assert stats["peak_active"] == 1
+    assert stats["peak_waiting"] == 2
@@ -0,0 +1,42 @@
+"""Tests of the approximate (IVF) search of the document index when clusters are empty."""
+
+import numpy as np
+from agents.document_index import DocumentChunk, DocumentIndex, IVFIndex, _IndexState
+
+
+def _vectors():
+    """Three unit vectors along the first three axes."""
+    return np.eye(3, dtype=np.float32)
+
+
+def _index_with_empty_clusters():
+    """IVF index whose two clusters nearest to the first axis hold no chunks."""
+    centroids = np.array([[1.0, 0.0, 0.0], [0.9, 0.1, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+    return IVFIndex(centroids=centroids, order=np.array([0, 1, 2]), offsets=np.array([0, 0, 0, 3]))
+
+
+def test_candidates_skip_empty_clusters():
+    ivf = _index_with_empty_clusters()
+
+    assert sorted(ivf.candidates(np.array([1.0, 0.0, 0.0]), nprobe=2).tolist()) == [0, 1, 2]
+
+
+def test_candidates_of_an_index_without_chunks_are_empty():
+    ivf = IVFIndex(centroids=_vectors(), order=np.array([], dtype=np.int64),
+                   offsets=np.zeros(4, dtype=np.int64))
+
+    assert len(ivf.candidates(np.array([1.0, 0.0, 0.0]), nprobe=2)) == 0
+
+
+def test_search_falls_back_to_the_exact_scan_without_candidates(tmp_path):
+    index = DocumentIndex(tmp_path, dim=3, nprobe=1)
+    chunks = [DocumentChunk("hotel_details.md", f"Hotel {i}", f"text {i}") for i in range(3)]
+    empty_ivf = IVFIndex(centroids=_vectors(), order=np.array([], dtype=np.int64),
+                         offsets=np.zeros(4, dtype=np.int64))
+    index._state = _IndexState("g", {}, chunks, _vectors(), None, empty_ivf)
+    index._query_vector = lambda state, query: np.array([0.0, 1.0, 0.0], dtype=np.float32)
+
+    matches = index.search("hotel", top_k=2)
+
+    assert [match.chunk.title for match in matches][0] == "Hotel 1"
+    assert len(matches) == 2
@@ -0,0 +1,134 @@
+"""Tests of the routing of questions to the structured lookups."""
+
+import pytest
+from agents.hotel_query_engine import HotelQueryEngine, parse_intent
+from agents.hotel_retrieval import HotelIndex
+
+
+def _hotel(name, city, country, missing=()):
+    """Hotel with one room of each type and category, except the (type, category) missing."""
+    rooms = [
+        {
+            "RoomId": f"01-{number:03d}",
+            "Type": room_type,
+            "Category": category,
+            "Guests": guests,
+            "PriceOffSeason": 100.0 + number,
+            "PricePeakSeason": 150.0 + number,
+        }
+        for number, (room_type, category, guests) in enumerate(
+            (room_type, category, guests)
+            for guests, room_type in enumerate(("Single", "Double", "Triple"), start=1)
+            for category in ("Standard", "Premium")
+            if (room_type, category) not in missing
+        )
+    ]
+    return {
+        "Name": name,
+        "Address": {"City": city, "Country": country},
+        "SyntheticParams": {"MealPlanPrices": {"Room Only": 1.0, "Half Board": 1.3}},
+        "Rooms": rooms,
+    }
+
+
+HOTELS_DATA = {
+    "Hotels": [
+        _hotel("Grand Victoria", "Nice", "France"),
+        _hotel("Imperial Crown", "Paris", "France"),
+        _hotel("Royal Sovereign", "Paris", "France"),
+        _hotel("Obsidian Tower", "Cannes", "France", missing=[("Single", "Premium")]),
+    ]
+}
+ALL_HOTELS = (0, 1, 2, 3)
+
+
+@pytest.fixture(scope="module")
+def hotel_index():
+    return HotelIndex(HOTELS_DATA, "")
+
+
+def _parse(question, hotel_index):
+    return parse_intent(question, hotel_index, len(HOTELS_DATA["Hotels"]))
+
+
+@pytest.mark.parametrize(
+    "question, kind, hotels",
+    [
+        ("List all hotels and their locations", "list_hotels", ALL_HOTELS),
+        ("Which hotels are in Paris?", "list_hotels", (1, 2)),
+        ("What's the price for a single room during peak season in 'Grand Victoria'?",
+         "room_prices", (0,)),
+        ("What is the price of a double room with breakfast in Grand Victora?",
+         "room_prices", (0,)),
+        ("What is the cheapest double room?", "room_prices", ALL_HOTELS),
+        ("tell me the lowest price for a standard sigle room in Nice considering no meal plan",
+         "room_prices", (0,)),
+        ("How many triple rooms are there in 'Imperial Crown'?", "room_counts", (1,)),
+        ("What is the half board surcharge?", "meal_plan_charge", ALL_HOTELS),
+    ],
+)
+def test_supported_lookups(hotel_index, question, kind, hotels):
+    intent = _parse(question, hotel_index)
+    assert intent is not None
+    assert intent.kind == kind
+    assert intent.hotels == hotels
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        # Places and hotels that are not in the index
+        "list the hotels in Germany",
+        "prices for triple premium rooms in Madrid",
+        "What are the prices of double rooms at the Ritz in London?",
+        # A known hotel in a city where it is not
+        "What is the price of a double room at Grand Victoria in Paris?",
+        # Qualifiers the lookups don't understand
+        "which hotels have a spa",
+        "Is breakfast included in the room price?",
+        "What is the mean price for a single room during peak season?",
+        # Comparisons between hotels (questions of hotel_room_queries.csv)
+        "What is the difference in the number of single rooms between Obsidian Tower and "
+        "Imperial Crown?",
+        "What is the difference in the number of single rooms between Royal Sovereign and "
+        "Imperial Crown?",
+        "What is the price difference for a standard single room during off season between "
+        "Royal Sovereign and Imperial Crown?",
+        "How do the prices for a premium single room during off season compare between "
+        "Obsidian Tower and Grand Victoria?",
+        # Room type words that aren't room types
+        "How many rooms are there in a single hotel?",
+        # Qualifiers the lookup would ignore
+        "Which hotels are cheapest?",
+        "How many rooms are there in Paris during peak season?",
+        "What is the price of a double room between 100 and 200?",
+        # Excluded meal plans
+        "price of single rooms without breakfast",
+        "What is the cheapest double room with no half board?",
+    ],
+)
+def test_unsupported_questions_go_to_the_llm(hotel_index, question):
+    assert _parse(question, hotel_index) is None
+    assert HotelQueryEngine(HOTELS_DATA, hotel_index).answer(question) is None
+
+
+def test_season_difference_is_a_lookup(hotel_index):
+    intent = _parse(
+        "What is the difference in price between peak and off season for a triple room in "
+        "'Grand Victoria'?",
+        hotel_index,
+    )
+
+    assert intent is not None
+    assert intent.kind == "room_prices"
+    assert intent.seasons == ("off", "peak")
+
+
+def test_named_hotel_without_the_room_is_reported(hotel_index):
+    answer = HotelQueryEngine(HOTELS_DATA, hotel_index).answer(
+        "What is the price for a premium single room during off season in Obsidian Tower and "
+        "Grand Victoria?"
+    )
+
+    assert "| Grand Victoria (Nice, France) | Single Premium |" in answer
+    assert "No Single Premium rooms at: Obsidian Tower (Cannes, France)" in answer
@@ -0,0 +1,86 @@
+"""Tests of the answers returned by the tool-calling agent loop."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from agents.hotel_tool_agent import _parse_meal_plan, answer_with_tools
+from langchain_core.messages import AIMessage
+
+
+class FakeLLM:
+    """Chat model that answers every call with the same message."""
+
+    def __init__(self, message):
+        self.message = message
+
+    def bind_tools(self, tools):
+        return self
+
+    async def ainvoke(self, messages):
+        return self.message
+
+
+class ScriptedLLM:
+    """Chat model that answers each call with the next message of a script."""
+
+    def __init__(self, *messages):
+        self.messages = list(messages)
+        self.calls = []
+
+    def bind_tools(self, tools):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls.append(list(messages))
+        return self.messages.pop(0)
+
+
+def _context():
+    return SimpleNamespace(version="v1", hotel_index=None, query_engine=None)
+
+
+def test_list_content_parts_are_joined_into_text():
+    llm = FakeLLM(AIMessage(content=[{"type": "text", "text": "Hotel "}, "Cantabria"]))
+
+    answer = asyncio.run(answer_with_tools(llm, _context(), "Which hotel?", max_steps=2))
+
+    assert answer == "Hotel Cantabria"
+
+
+def test_answer_after_the_step_limit_is_text():
+    message = AIMessage(
+        content=[{"type": "text", "text": "Done"}],
+        tool_calls=[{"name": "missing_tool", "args": {}, "id": "call-1"}],
+    )
+
+    llm = FakeLLM(message)
+
+    answer = asyncio.run(answer_with_tools(llm, _context(), "Which hotel?", max_steps=1))
+
+    assert answer == "Done"
+
+
+def test_invalid_tool_arguments_are_returned_to_the_model():
+    llm = ScriptedLLM(
+        AIMessage(content="", tool_calls=[
+            {"name": "get_hotel_details", "args": {}, "id": "call-1"},
+            {"name": "count_rooms", "args": {"hotel": ["a"]}, "id": "call-2"},
+        ]),
+        AIMessage(content="Which hotel do you mean?"),
+    )
+
+    answer = asyncio.run(answer_with_tools(llm, _context(), "Hotel details?", max_steps=2))
+
+    assert answer == "Which hotel do you mean?"
+    tool_messages = llm.calls[1][-2:]
+    assert [message.tool_call_id for message in tool_messages] == ["call-1", "call-2"]
+    assert all(message.content.startswith("Error: invalid arguments") for message in tool_messages)
+
+
+def test_excluded_meal_plan_is_not_parsed_as_that_plan():
+    assert _parse_meal_plan("Room and Breakfast") == "Room and Breakfast"
+    assert _parse_meal_plan("no meal plan") == "Room Only"
+
+    with pytest.raises(ValueError):
+        _parse_meal_plan("without breakfast")
@@ -0,0 +1,78 @@
+"""Tests of the expiry and failure handling of the Gemini context caches."""
+
+import asyncio
+from types import SimpleNamespace
+
+from agents.prompt_cache import GeminiContextCache
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCaches:
+    """Stand-in for client.aio.caches that names caches in order, or fails."""
+
+    def __init__(self):
+        self.created = 0
+        self.fail = False
+
+    async def create(self, model, config):
+        if self.fail:
+            raise RuntimeError("Cached content is too small")
+        self.created += 1
+        return SimpleNamespace(name=f"cachedContents/{self.created}")
+
+
+def _fake_llm(caches):
+    return SimpleNamespace(client=SimpleNamespace(aio=SimpleNamespace(caches=caches)))
+
+
+def _get(cache, llm, version="v1"):
+    return asyncio.run(cache.get_cache_name(llm, "gemini", version, "prefix"))
+
+
+def test_cache_is_recreated_before_its_ttl_runs_out():
+    clock, caches = FakeClock(), FakeCaches()
+    cache = GeminiContextCache(ttl_seconds=600, refresh_margin_seconds=60, clock=clock)
+    llm = _fake_llm(caches)
+
+    assert _get(cache, llm) == "cachedContents/1"
+    clock.now = 539
+    assert _get(cache, llm) == "cachedContents/1"
+    clock.now = 540
+    assert _get(cache, llm) == "cachedContents/2"
+    assert caches.created == 2
+
+
+def test_failed_creation_is_retried_after_the_backoff():
+    clock, caches = FakeClock(), FakeCaches()
+    cache = GeminiContextCache(ttl_seconds=600, failure_backoff_seconds=30, clock=clock)
+    llm = _fake_llm(caches)
+
+    caches.fail = True
+    assert _get(cache, llm) is None
+    caches.fail = False
+    clock.now = 29
+    assert _get(cache, llm) is None
+    clock.now = 30
+    assert _get(cache, llm) == "cachedContents/1"
+    assert cache.stats()["failed"] == 1
+
+
+def test_rejected_cache_is_recreated_on_next_request():
+    clock, caches = FakeClock(), FakeCaches()
+    cache = GeminiContextCache(ttl_seconds=600, clock=clock)
+    llm = _fake_llm(caches)
+
+    name = _get(cache, llm)
+    cache.discard("v1", name, RuntimeError("CachedContent not found"))
+    assert cache.stats()["versions"] == []
+    assert _get(cache, llm) == "cachedContents/2"
+    assert cache.stats()["rejected"] == 1
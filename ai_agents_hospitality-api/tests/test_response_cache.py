@@ -0,0 +1,36 @@
+"""Tests of the exact and near-duplicate tiers of the response cache."""
+
+from agents.response_cache import ResponseCache
+
+
+def test_near_duplicate_question_hits_the_cache():
+    cache = ResponseCache()
+    cache.put("v1", "What is the price of a double room in Grand Victoria?", "answer")
+
+    assert cache.get("v1", "what's the price of double rooms in Grand Victora") == "answer"
+    assert cache.stats()["similar_hits"] == 1
+
+
+def test_reversed_comparison_misses_the_cache():
+    cache = ResponseCache()
+    cache.put("v1", "Is Grand Victoria cheaper than Imperial Crown?", "Yes, Grand Victoria is")
+
+    assert cache.get("v1", "Is Imperial Crown cheaper than Grand Victoria?") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_different_place_misses_the_cache():
+    cache = ResponseCache()
+    cache.put("v1", "Which hotels are in Paris?", "answer")
+
+    assert cache.get("v1", "Which hotels are in Nice?") is None
+    assert cache.get("v2", "Which hotels are in Paris?") is None
+
+
+def test_different_number_misses_the_cache():
+    cache = ResponseCache()
+    cache.put("v1", "How many bookings in 2024 cost over 1000 euros?", "answer")
+
+    assert cache.get("v1", "How many bookings in 2025 cost over 1000 euros?") is None
+    assert cache.get("v1", "How many bookings in 2024 cost over 10000 euros?") is None
+    assert cache.get("v1", "how many bookings in 2024 cost over 1000 euro") == "answer"
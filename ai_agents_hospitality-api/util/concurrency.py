@@ -0,0 +1,124 @@
+"""
+Concurrency Limiter
+
+This module provides an asyncio limiter for outbound LLM calls. At most
+max_concurrency calls run at the same time; further calls wait in a bounded
+queue and are rejected when the queue is full or when they wait longer than
+the queue timeout, so an overloaded worker sheds load instead of piling up
+requests.
+
+Each event loop gets its own semaphore, created on first use: the API awaits
+the limiter on the server loop, while the synchronous entry point runs each
+question in a new loop with asyncio.run, and an asyncio.Semaphore can't be
+shared between loops.
+"""
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+
+class ConcurrencyLimitError(Exception):
+    """Raised when a call is rejected by the concurrency limiter."""
+
+
+class ConcurrencyLimiter:
+    """
+    Semaphore with a bounded wait queue and a queue timeout.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrency: Maximum number of calls running at the same time
+            max_queue: Maximum number of calls waiting for a slot
+            queue_timeout: Maximum seconds a call waits for a slot (0 waits forever)
+        """
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        # Semaphore of each event loop, dropped with its loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+        self._peak_active = 0
+        self._peak_waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def _loop_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore of the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._max_concurrency)
+                self._semaphores[loop] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            ConcurrencyLimitError: If the wait queue is full or the queue
+                timeout expires before a slot is free
+        """
+        semaphore = self._loop_semaphore()
+        if semaphore.locked():
+            if self._waiting >= self._max_queue:
+                self._rejected += 1
+                raise ConcurrencyLimitError(
+                    f"Too many pending requests ({self._waiting} waiting)"
+                )
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+            try:
+                if self._queue_timeout > 0:
+                    await asyncio.wait_for(semaphore.acquire(), self._queue_timeout)
+                else:
+                    await semaphore.acquire()
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise ConcurrencyLimitError(
+                    f"No capacity available after waiting {self._queue_timeout}s"
+                ) from None
+            finally:
+                self._waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        self._active += 1
+        self._peak_active = max(self._peak_active, self._active)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._completed += 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return limiter metrics.
+
+        Returns:
+            dict: Limits, active/waiting calls, peaks and rejection counters
+        """
+        return {
+            "max_concurrency": self._max_concurrency,
+            "max_queue": self._max_queue,
+            "active": self._active,
+            "waiting": self._waiting,
+            "peak_active": self._peak_active,
+            "peak_waiting": self._peak_waiting,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+        }
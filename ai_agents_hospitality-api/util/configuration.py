@@ -29,6 +29,89 @@ class Settings(BaseSettings):
     # CORS settings
     CORS_ORIGINS: List[str] = Field(default=["*"])
 
+    # Hotel data settings (polling interval in seconds, 0 disables hot-reload)
+    HOTEL_DATA_RELOAD_INTERVAL: float = Field(default=5.0)
+
+    # Hotel context sent to the LLM: "filtered" (only the hotels the question is about), "full"
+    # or "documents" (the chunks of the document index most similar to the question)
+    HOTEL_CONTEXT_MODE: str = Field(default="filtered")
+
+    # Hotel rendering in the context: "compact" (aggregated room tables) or "legacy"
+    # (hotel_details.md plus indented JSON)
+    HOTEL_CONTEXT_FORMAT: str = Field(default="compact")
+
+    # Local retrieval index over hotel_details.md, hotel_rooms.md and hotel_bookings.md, kept
+    # in DOCUMENT_INDEX_PATH (empty: data/document_index) and updated incrementally when the
+    # files change. DOCUMENT_INDEX_EMBEDDING_MODEL names a sentence-transformers model run on
+    # CPU; when empty or not installed, chunks are hashed TF-IDF vectors of DOCUMENT_INDEX_DIM.
+    # It is only built with HOTEL_CONTEXT_MODE="documents" or AGENT_MODE="tools", its readers
+    DOCUMENT_INDEX_ENABLED: bool = Field(default=True)
+    DOCUMENT_INDEX_PATH: str = Field(default="")
+    DOCUMENT_INDEX_EMBEDDING_MODEL: str = Field(default="")
+    DOCUMENT_INDEX_DIM: int = Field(default=4096)
+    DOCUMENT_INDEX_CHUNK_CHARS: int = Field(default=1500)
+    DOCUMENT_INDEX_TOP_K: int = Field(default=8)
+    # Approximate (IVF) search once the index has this many chunks (0 disables it),
+    # scanning the DOCUMENT_INDEX_NPROBE clusters nearest to the query
+    DOCUMENT_INDEX_APPROXIMATE_MIN_CHUNKS: int = Field(default=5000)
+    DOCUMENT_INDEX_NPROBE: int = Field(default=8)
+
+    # Answer exact lookups (room counts, prices, meal plan charges) without calling the LLM
+    STRUCTURED_QUERIES_ENABLED: bool = Field(default=True)
+
+    # Agent mode: "context" (hotel data in the prompt) or "tools" (the LLM calls lookup
+    # tools; TOOL_AGENT_MAX_STEPS limits the LLM calls that may request tools)
+    AGENT_MODE: str = Field(default="context")
+    TOOL_AGENT_MAX_STEPS: int = Field(default=5)
+
+    # Analytics questions (bookings, occupancy, revenue) are answered with read-only SQL
+    # generated by the LLM over the bookings database: a postgresql:// DSN or a sqlite:///path
+    # stand-in (empty disables the SQL path). Queries time out after BOOKINGS_SQL_TIMEOUT
+    # seconds, return at most BOOKINGS_SQL_MAX_ROWS rows and are rejected when their plan
+    # scans a table of more than BOOKINGS_SQL_MAX_SCAN_ROWS rows sequentially (0 disables it)
+    BOOKINGS_DB_URL: str = Field(default="")
+    BOOKINGS_DB_POOL_SIZE: int = Field(default=10)
+    BOOKINGS_SQL_TIMEOUT: float = Field(default=5.0)
+    BOOKINGS_SQL_MAX_ROWS: int = Field(default=200)
+    BOOKINGS_SQL_MAX_SCAN_ROWS: int = Field(default=100000)
+
+    # Response cache for LLM answers (TTL in seconds, 0 never expires;
+    # similarity threshold for near-duplicate questions, 0 disables that tier)
+    RESPONSE_CACHE_ENABLED: bool = Field(default=True)
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=1000)
+    RESPONSE_CACHE_MAX_BYTES: int = Field(default=16 * 1024 * 1024)
+    RESPONSE_CACHE_TTL_SECONDS: float = Field(default=3600.0)
+    RESPONSE_CACHE_SIMILARITY_THRESHOLD: float = Field(default=0.9)
+
+    # Stream answers over the WebSocket as delta frames followed by a done frame
+    STREAMING_ENABLED: bool = Field(default=True)
+
+    # Concurrent LLM calls per worker; extra calls wait in a bounded queue and are
+    # rejected when it is full or after the queue timeout in seconds (0 waits forever)
+    LLM_MAX_CONCURRENCY: int = Field(default=64)
+    LLM_MAX_QUEUE: int = Field(default=256)
+    LLM_QUEUE_TIMEOUT: float = Field(default=30.0)
+
+    # HTTP connection pool shared by all LLM calls (keep-alive expiry in seconds;
+    # HTTP/2 is used only when the h2 package is installed)
+    LLM_MAX_CONNECTIONS: int = Field(default=100)
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20)
+    LLM_KEEPALIVE_EXPIRY: float = Field(default=60.0)
+    LLM_HTTP2: bool = Field(default=True)
+    # Open the first LLM connection at startup
+    LLM_WARMUP_CONNECT: bool = Field(default=True)
+
+    # Provider-side prompt caching of the static prefix (instructions + hotel context);
+    # Gemini explicit context caching applies only with HOTEL_CONTEXT_MODE="full"
+    PROMPT_CACHE_ENABLED: bool = Field(default=True)
+    GEMINI_CONTEXT_CACHE_ENABLED: bool = Field(default=False)
+    GEMINI_CONTEXT_CACHE_TTL_SECONDS: float = Field(default=3600.0)
+
+    # WebSocket questions: a new question cancels the previous ones (otherwise they are
+    # queued, up to WS_MAX_PENDING_QUESTIONS per connection)
+    WS_SUPERSEDE_QUESTIONS: bool = Field(default=True)
+    WS_MAX_PENDING_QUESTIONS: int = Field(default=8)
+
     class Config:
         """
         Configuration for the settings class.
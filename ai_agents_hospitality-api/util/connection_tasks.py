@@ -0,0 +1,227 @@
+"""
+Connection Task Manager
+
+This module manages the questions of a single WebSocket connection. Incoming
+questions are queued and answered one at a time by a worker task, so reading
+from the socket is never blocked by an LLM call. The client can cancel a
+question with a cancel frame, and (when superseding is enabled) a newer
+question cancels the one being answered and drops the ones still queued, so
+abandoned questions stop occupying LLM capacity.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+from util.logger_config import logger
+
+# Rough number of characters per token, used to estimate wasted output tokens
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class QuestionTask:
+    """A question submitted on a connection."""
+
+    message_id: str
+    query: str
+    output_chars: int = 0
+    cancel_reason: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def add_output(self, text: str) -> None:
+        """Record answer text already generated for the question."""
+        self.output_chars += len(text)
+
+
+# Answers a question; called with the task so progress can be recorded
+QuestionHandler = Callable[[QuestionTask], Awaitable[None]]
+# Notifies the client that a question was cancelled (task, reason)
+CancelHandler = Callable[[QuestionTask, str], Awaitable[None]]
+
+
+class TaskStats:
+    """Thread-safe counters of the questions handled on all connections."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self._lock = threading.Lock()
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "superseded": 0,
+            "rejected": 0,
+            "failed": 0,
+            "wasted_output_tokens": 0,
+        }
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            counter: Name of the counter
+            amount: Amount to add
+        """
+        with self._lock:
+            self._counters[counter] += amount
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the task metrics.
+
+        Returns:
+            dict: Submitted, completed, cancelled (by the client), superseded,
+            rejected and failed questions, and the estimated output tokens generated
+            for questions that were cancelled or superseded
+        """
+        with self._lock:
+            return dict(self._counters)
+
+
+# Shared counters of all connections
+task_stats = TaskStats()
+
+
+def get_task_stats() -> Dict[str, int]:
+    """Return metrics of the per-connection question tasks."""
+    return task_stats.stats()
+
+
+class ConnectionTaskManager:
+    """
+    Queue of the questions of one connection with cancellation support.
+    """
+
+    def __init__(
+        self,
+        handler: QuestionHandler,
+        on_cancel: CancelHandler,
+        supersede: bool = True,
+        max_pending: int = 8,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            handler: Coroutine answering a question
+            on_cancel: Coroutine notifying the client of a cancelled question
+            supersede: Whether a new question cancels the previous ones
+            max_pending: Maximum number of queued questions
+        """
+        self._handler = handler
+        self._on_cancel = on_cancel
+        self._supersede = supersede
+        self._max_pending = max_pending
+        self._pending: Deque[QuestionTask] = deque()
+        self._current: Optional[QuestionTask] = None
+        self._wakeup = asyncio.Event()
+        self._notifications = set()
+        self._closed = False
+
+    def submit(self, message_id: str, query: str) -> bool:
+        """
+        Queue a question.
+
+        Args:
+            message_id: Identifier of the question, used for its answer frames
+            query: User's question
+
+        Returns:
+            bool: False if the question was rejected because the queue is full
+        """
+        if self._supersede:
+            self._cancel_all("superseded")
+        elif len(self._pending) >= self._max_pending:
+            task_stats.record("rejected")
+            return False
+
+        self._pending.append(QuestionTask(message_id=message_id, query=query))
+        task_stats.record("submitted")
+        self._wakeup.set()
+        return True
+
+    def cancel(self, message_id: Optional[str] = None) -> int:
+        """
+        Cancel a question, or every question when no id is given.
+
+        Args:
+            message_id: Identifier of the question to cancel
+
+        Returns:
+            int: Number of cancelled questions
+        """
+        if message_id is None:
+            return self._cancel_all("cancelled")
+
+        current = self._current
+        if current is not None and current.message_id == message_id:
+            return int(self._cancel_current("cancelled"))
+        for question in self._pending:
+            if question.message_id == message_id:
+                self._pending.remove(question)
+                self._drop_pending(question, "cancelled")
+                return 1
+        return 0
+
+    def _cancel_current(self, reason: str) -> bool:
+        """Cancel the question being answered."""
+        current = self._current
+        if current is None or current.task is None or current.task.done():
+            return False
+        if current.cancel_reason is None:
+            current.cancel_reason = reason
+            current.task.cancel()
+        return True
+
+    def _drop_pending(self, question: QuestionTask, reason: str) -> None:
+        """Record a queued question removed before it started."""
+        task_stats.record(reason)
+        notification = asyncio.create_task(self._on_cancel(question, reason))
+        self._notifications.add(notification)
+        notification.add_done_callback(self._notifications.discard)
+
+    def _cancel_all(self, reason: str) -> int:
+        """Cancel the current question and drop the queued ones."""
+        cancelled = int(self._cancel_current(reason))
+        while self._pending:
+            self._drop_pending(self._pending.popleft(), reason)
+            cancelled += 1
+        return cancelled
+
+    async def run(self) -> None:
+        """Answer the queued questions until the manager is closed."""
+        while not self._closed:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            question = self._pending.popleft()
+            question.task = asyncio.create_task(self._handler(question))
+            self._current = question
+            try:
+                await question.task
+                task_stats.record("completed")
+            except asyncio.CancelledError:
+                if question.cancel_reason is None:
+                    # The worker itself is being cancelled
+                    question.task.cancel()
+                    raise
+                task_stats.record(question.cancel_reason)
+                task_stats.record("wasted_output_tokens", question.output_chars // CHARS_PER_TOKEN)
+                await self._on_cancel(question, question.cancel_reason)
+            except Exception as e:
+                task_stats.record("failed")
+                logger.error(f"Error answering question {question.message_id}: {e}", exc_info=True)
+            finally:
+                self._current = None
+
+    def close(self) -> None:
+        """Cancel every question and stop the worker, e.g. when the connection is closed."""
+        self._closed = True
+        self._cancel_all("cancelled")
+        self._wakeup.set()
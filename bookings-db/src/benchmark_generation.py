@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Benchmark the stages of the synthetic data generation.
+
+For every combination of hotels and booking years (5/50/200 hotels x 1/3/5
+years by default) the pipeline of gen_synthetic_hotels.py is run into a
+temporary directory, in a fresh process, timing each stage separately:
+
+- generate_hotels: hotels and rooms
+- write_hotels: the hotel files of hotel_output_writer (JSON, Excel, CSV, Markdown)
+- guest_pool: loading or generating the guest pool (when configured)
+- generate_hotel_bookings: the bookings of each hotel, one hotel at a time,
+  as column chunks of process.bookings_chunk_size bookings
+- booking_rows: the booking dictionaries of the Markdown and Excel writers
+- arrow_batches: the Arrow record batches of the Parquet and Arrow writers
+- write_markdown, write_parquet, write_arrow (and write_excel with --excel):
+  each booking writer of src/output, fed chunk by chunk
+- load_db (with --db): the COPY load of the Parquet dataset into a scratch
+  schema (bench_loader) of the database
+
+The high-water RSS of the process is recorded after every stage and for the
+whole case. Results are printed and written as JSON; when a baseline file
+exists, every stage slower (or case bigger) than the baseline by more than
+the tolerance is reported as a regression and the script exits with 1.
+
+Usage:
+    python benchmark_generation.py [--hotels 5 50 200] [--years 1 3 5] [--save-baseline]
+    POSTGRES_USER=... POSTGRES_PASSWORD=... POSTGRES_DB=... python benchmark_generation.py --db
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+# Add parent directory to path to allow running directly: python benchmark_generation.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generator.booking_generator import (
+    booking_rows,
+    generate_hotel_booking_chunks,
+    get_guest_pool,
+)
+from src.generator.hotel_generator import generate_hotels
+from src.output.booking_columnar_writer import (
+    PartitionedBookingsWriter,
+    booking_columns_to_record_batch,
+)
+from src.output.booking_output_writer import ExcelBookingsWriter, MarkdownBookingsWriter
+from src.output.hotel_output_writer import (
+    generate_file_csv_for_all_hotels,
+    generate_file_csv_for_hotels,
+    generate_file_excel_for_hotels,
+    generate_file_json_for_hotels,
+    generate_file_md_hotel_details,
+    generate_file_md_hotel_rooms,
+)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(SRC_DIR, "../config/generate_hotels_param.yaml")
+BENCHMARKS_DIR = os.path.join(os.path.dirname(SRC_DIR), "benchmarks")
+DEFAULT_OUTPUT = os.path.join(BENCHMARKS_DIR, "generation_results.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "generation_baseline.json")
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process, in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT / 2**20
+
+
+@contextlib.contextmanager
+def timed(stages, name):
+    """Add the time of the block to a stage, and record the RSS high-water mark after it."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage = stages.setdefault(name, {"seconds": 0.0})
+        stage["seconds"] += time.perf_counter() - start
+        stage["peak_rss_mb"] = round(peak_rss_mb(), 1)
+
+
+def load_config(hotels, years, guest_pool):
+    """Generation configuration for a number of hotels and booking years."""
+    with open(CONFIG_PATH, encoding="utf-8") as file:
+        config = yaml.safe_load(file)
+    config["num_of_hotels"] = hotels
+    # Years are added before the configured end year: bookings after
+    # current_month are a thinning forecast
+    booking_year = config["hotel_occupancy"]["booking_year"]
+    booking_year["start"] = booking_year["end"] - years + 1
+    if not guest_pool:
+        config.pop("guest_pool", None)
+    return config
+
+
+def load_into_database(stages, dataset_path, host):
+    """Time the COPY load of a dataset into the scratch schema bench_loader."""
+    import psycopg2
+    sys.path.insert(0, os.path.join(SRC_DIR, "db"))
+    from benchmark_loader import reset_schema
+    from load_data import load_bookings, open_bookings
+
+    conn = psycopg2.connect(
+        host=host,
+        database=os.getenv('POSTGRES_DB'),
+        user=os.getenv('POSTGRES_USER'),
+        password=os.getenv('POSTGRES_PASSWORD')
+    )
+    try:
+        reset_schema(conn)
+        with timed(stages, "load_db"):
+            load_bookings(conn, open_bookings(dataset_path), "copy")
+    finally:
+        cursor = conn.cursor()
+        cursor.execute("DROP SCHEMA IF EXISTS bench_loader CASCADE")
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+
+def run_case(hotels_count, years, options):
+    """Run the generation pipeline for one size and return its timings."""
+    stages = {}
+    config = load_config(hotels_count, years, options["guest_pool"])
+    seed = config["process"].get("booking_seed")
+
+    # The generator and writers print progress; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as output_dir:
+        hotels_path = os.path.join(output_dir, "hotels", "")
+        bookings_path = os.path.join(output_dir, "bookings")
+        os.makedirs(hotels_path)
+        os.makedirs(bookings_path)
+
+        with timed(stages, "generate_hotels"):
+            hotels = generate_hotels(config)
+
+        with timed(stages, "write_hotels"):
+            generate_file_excel_for_hotels(hotels, hotels_path)
+            generate_file_json_for_hotels(hotels, hotels_path)
+            generate_file_csv_for_hotels(hotels, hotels_path)
+            generate_file_csv_for_all_hotels(hotels, hotels_path)
+            generate_file_md_hotel_details(hotels, hotels_path)
+            generate_file_md_hotel_rooms(hotels, hotels_path)
+
+        if config.get("guest_pool"):
+            with timed(stages, "guest_pool"):
+                get_guest_pool(config, seed)
+
+        parquet_path = os.path.join(bookings_path, "all_bookings.parquet")
+        row_writers = {"write_markdown": MarkdownBookingsWriter(hotels_path)}
+        if options["excel"]:
+            row_writers["write_excel"] = ExcelBookingsWriter(
+                os.path.join(bookings_path, "all_bookings.xlsx")
+            )
+        dataset_writers = {
+            "write_parquet": PartitionedBookingsWriter(parquet_path, "parquet"),
+            "write_arrow": PartitionedBookingsWriter(
+                os.path.join(bookings_path, "all_bookings.arrow"), "arrow"
+            ),
+        }
+        chunk_size = config["process"].get("bookings_chunk_size", 20000)
+
+        bookings_count = 0
+        hotel_seconds = []
+        for hotel in hotels:
+            start = time.perf_counter()
+            with timed(stages, "generate_hotel_bookings"):
+                chunks = list(generate_hotel_booking_chunks(hotel, config, chunk_size, seed))
+            hotel_seconds.append(time.perf_counter() - start)
+            for chunk in chunks:
+                columns = chunk["Columns"]
+                bookings_count += len(columns["ReservationID"])
+                with timed(stages, "booking_rows"):
+                    hotel_bookings = {
+                        "HotelKey": chunk["HotelKey"],
+                        "HotelName": chunk["HotelName"],
+                        "Bookings": booking_rows(columns),
+                    }
+                for name, writer in row_writers.items():
+                    with timed(stages, name):
+                        writer.write(hotel_bookings)
+                with timed(stages, "arrow_batches"):
+                    batch = booking_columns_to_record_batch(chunk["HotelName"], columns)
+                for name, writer in dataset_writers.items():
+                    with timed(stages, name):
+                        writer.write_batch(chunk["HotelKey"], chunk["HotelName"], batch)
+            # Release the hotel's bookings before generating the next one (bound or not)
+            chunks = hotel_bookings = batch = None
+        writers = {**row_writers, **dataset_writers}
+        for name, writer in writers.items():
+            with timed(stages, name):
+                writer.close()
+
+        stages["generate_hotel_bookings"]["per_hotel_mean"] = statistics.mean(hotel_seconds)
+        stages["generate_hotel_bookings"]["per_hotel_max"] = max(hotel_seconds)
+        stages["generate_hotel_bookings"]["bookings_per_second"] = round(
+            bookings_count / stages["generate_hotel_bookings"]["seconds"]
+        )
+
+        if options["db"]:
+            load_into_database(stages, parquet_path, options["host"])
+
+    return {
+        "hotels": hotels_count,
+        "years": years,
+        "bookings": bookings_count,
+        "stages": stages,
+        "seconds": sum(stage["seconds"] for stage in stages.values()),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_case_in_new_process(hotels_count, years, options):
+    """Run a case in a fresh process, so its peak RSS and caches are its own."""
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+        return executor.submit(run_case, hotels_count, years, options).result()
+
+
+def environment():
+    """Versions and hardware the results were measured with."""
+    import faker
+    import numpy
+    import pyarrow
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+        "faker": faker.VERSION,
+    }
+
+
+def find_regressions(results, baseline, tolerance, min_seconds, min_rss_mb):
+    """
+    Compare the results with a baseline of the same cases.
+
+    A stage regresses when it takes more than (1 + tolerance) times its
+    baseline and at least min_seconds more; a case regresses in memory when
+    its peak RSS grows by more than the tolerance and at least min_rss_mb.
+
+    Returns:
+    - list: One description per regression
+    """
+    baseline_cases = {(case["hotels"], case["years"]): case for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        base = baseline_cases.get((case["hotels"], case["years"]))
+        if base is None:
+            continue
+        label = f"{case['hotels']} hotels x {case['years']} years"
+        for name, stage in case["stages"].items():
+            base_stage = base["stages"].get(name)
+            if base_stage is None:
+                continue
+            seconds, base_seconds = stage["seconds"], base_stage["seconds"]
+            if seconds > base_seconds * (1 + tolerance) and seconds - base_seconds >= min_seconds:
+                regressions.append(f"{label}: {name} {base_seconds:.2f}s -> {seconds:.2f}s")
+        rss, base_rss = case["peak_rss_mb"], base["peak_rss_mb"]
+        if rss > base_rss * (1 + tolerance) and rss - base_rss >= min_rss_mb:
+            regressions.append(f"{label}: peak RSS {base_rss:.0f} MB -> {rss:.0f} MB")
+    return regressions
+
+
+def print_results(results):
+    """Print the time of every stage of every case."""
+    print(f"\n{'case':<18} | {'stage':<23} | {'seconds':>8} | {'peak MB':>8}")
+    print("-" * 66)
+    for case in results["cases"]:
+        label = f"{case['hotels']} hotels x {case['years']}y"
+        for name, stage in case["stages"].items():
+            print(
+                f"{label:<18} | {name:<23} | {stage['seconds']:>8.2f} "
+                f"| {stage['peak_rss_mb']:>8.0f}"
+            )
+        bookings_per_second = case["stages"]["generate_hotel_bookings"]["bookings_per_second"]
+        print(
+            f"{label:<18} | {'total':<23} | {case['seconds']:>8.2f} "
+            f"| {case['peak_rss_mb']:>8.0f}   "
+            f"{case['bookings']} bookings, {bookings_per_second:,} bookings/s generated"
+        )
+        print("-" * 66)
+
+
+def main():
+    """Run every case, print and save the results, and compare them with the baseline."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the stages of the synthetic data generation"
+    )
+    parser.add_argument("--hotels", type=int, nargs="+", default=[5, 50, 200],
+                        help="Numbers of hotels")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 5],
+                        help="Numbers of booking years")
+    parser.add_argument("--excel", action="store_true", help="Also time the Excel export")
+    parser.add_argument("--no-guest-pool", dest="guest_pool", action="store_false",
+                        help="Generate every guest with Faker instead of the guest pool")
+    parser.add_argument("--db", action="store_true", help="Also time the load into the database")
+    parser.add_argument("--host", default=os.getenv("POSTGRES_HOST", "bookings-db"),
+                        help="Database host")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file of the results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="JSON file of the baseline results")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown over the baseline (0.2 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.1,
+                        help="Ignore slowdowns smaller than this")
+    parser.add_argument("--min-rss-mb", type=float, default=20,
+                        help="Ignore memory growth smaller than this")
+    args = parser.parse_args()
+
+    options = {
+        "excel": args.excel, "guest_pool": args.guest_pool, "db": args.db, "host": args.host
+    }
+    results = {"environment": environment(), "options": options, "cases": []}
+    for hotels_count in args.hotels:
+        for years in args.years:
+            print(f"Running {hotels_count} hotels x {years} years...", flush=True)
+            results["cases"].append(run_case_in_new_process(hotels_count, years, options))
+    print_results(results)
+
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        results["regressions"] = find_regressions(
+            results, baseline, args.tolerance, args.min_seconds, args.min_rss_mb
+        )
+        print(f"\nRegressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for regression in results["regressions"] or ["none"]:
+            print(f"  {regression}")
+
+    output_paths = [args.output] + ([args.baseline] if args.save_baseline else [])
+    for path in output_paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to: {path}")
+
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the batched booking pricing against the per-booking loop.
+
+Random bookings (0 to 13 nights over several years, any guests, extra bed,
+meal plan and promotion) are priced for the rooms of a generated hotel,
+once with get_total_price per booking and once with get_total_prices for
+all of them. The time of each version is printed together with the number
+of prices that differ in value or type (expected: 0).
+
+Usage:
+    python benchmark_pricing.py [--bookings 100000] [--years 3] [--runs 3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+import yaml
+
+# Add parent directory to path to allow running directly: python benchmark_pricing.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generator import parametric_utils as ParUt
+from src.generator.hotel_generator import generate_hotels
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "../config/generate_hotels_param.yaml"
+)
+
+
+def build_bookings(hotel, count, years, rng):
+    """Draw random bookings for the rooms of a hotel, as a list of dicts."""
+    first_day = np.datetime64("2025-01-01")
+    days = 365 * years
+    meal_plans = list(hotel["SyntheticParams"]["MealPlanPrices"])
+    bookings = []
+    for _ in range(count):
+        room = rng.choice(hotel["Rooms"])
+        check_in = first_day + rng.randrange(days)
+        bookings.append({
+            "CheckInDate": str(check_in),
+            "CheckOutDate": str(check_in + rng.randint(0, 13)),
+            "NumberOfGuests": rng.randint(1, room["Guests"]),
+            "ExtraBed": rng.choice(["Yes", "No", "N/A"]),
+            "MealPlan": rng.choice(meal_plans),
+            "Promotion": rng.choice(["Yes", "No"]),
+            "Room": room,
+        })
+    return bookings
+
+
+def booking_columns(bookings):
+    """Columns of the bookings and their rooms, as expected by get_total_prices."""
+    columns = {
+        name: [booking[name] for booking in bookings]
+        for name in (
+            "CheckInDate", "CheckOutDate", "NumberOfGuests", "ExtraBed", "MealPlan", "Promotion"
+        )
+    }
+    for name in ("PriceOffSeason", "PricePeakSeason", "Type"):
+        columns[name] = [booking["Room"][name] for booking in bookings]
+    return columns
+
+
+def main():
+    """Price the bookings with both versions and print the timings."""
+    parser = argparse.ArgumentParser(description="Benchmark the batched booking pricing")
+    parser.add_argument("--bookings", type=int, default=100_000, help="Number of bookings")
+    parser.add_argument("--years", type=int, default=3, help="Years covered by the check-in dates")
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Runs per version (the median is reported)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the random bookings")
+    args = parser.parse_args()
+
+    with open(CONFIG_PATH, encoding="utf-8") as file:
+        config = yaml.safe_load(file)
+    config["num_of_hotels"] = 1
+    hotel = generate_hotels(config)[0]
+    peak_season_months = config["peak_season_months"]
+    params = hotel["SyntheticParams"]
+    bookings = build_bookings(hotel, args.bookings, args.years, random.Random(args.seed))
+    columns = booking_columns(bookings)
+
+    loop_times, batch_times = [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        loop_prices = [ParUt.get_total_price(booking, booking["Room"], peak_season_months, params)
+                       for booking in bookings]
+        loop_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch_prices = ParUt.get_total_prices(columns, peak_season_months, params)
+        batch_times.append(time.perf_counter() - start)
+
+    different = sum(
+        loop != batch or type(loop) is not type(batch)
+        for loop, batch in zip(loop_prices, batch_prices, strict=True)
+    )
+    loop_time, batch_time = statistics.median(loop_times), statistics.median(batch_times)
+    print(f"\n{args.bookings} bookings over {args.years} years, median of {args.runs} runs\n")
+    print(f"{'version':<20} | {'seconds':>8} | {'bookings/s':>12}")
+    print("-" * 48)
+    print(f"{'get_total_price':<20} | {loop_time:>8.3f} | {args.bookings / loop_time:>12,.0f}")
+    print(f"{'get_total_prices':<20} | {batch_time:>8.3f} | {args.bookings / batch_time:>12,.0f}")
+    print(f"\nSpeed-up: {loop_time / batch_time:.1f}x")
+    print(f"Prices different from the per-booking loop: {different}")
+
+
+if __name__ == "__main__":
+    main()
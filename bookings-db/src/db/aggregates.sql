@@ -0,0 +1,67 @@
+-- Pre-aggregated occupancy and revenue, refreshed after every data load
+-- (see refresh_aggregates in load_data.py). Each view has a unique index so it
+-- can be refreshed CONCURRENTLY without blocking readers.
+
+-- Occupancy per hotel and day. Every hotel has a row for every day between the
+-- first check-in and the last check-out, including days without guests. A
+-- booking occupies its room from check-in (inclusive) to check-out (exclusive),
+-- and its price is spread evenly over its nights. The room count of a hotel
+-- comes from the rooms table.
+CREATE MATERIALIZED VIEW IF NOT EXISTS hotel_daily_occupancy AS
+WITH hotel_rooms AS (
+    SELECT h.name AS hotel_name, COUNT(*) AS total_rooms
+    FROM hotels h
+    JOIN rooms r ON r.hotel_id = h.id
+    GROUP BY h.name
+),
+calendar AS (
+    SELECT generate_series(MIN(check_in_date), MAX(check_out_date) - 1, INTERVAL '1 day')::date AS stay_date
+    FROM bookings
+),
+nights AS (
+    SELECT
+        hotel_name,
+        room_id,
+        generate_series(check_in_date, check_out_date - 1, INTERVAL '1 day')::date AS stay_date,
+        total_price / (check_out_date - check_in_date) AS nightly_price
+    FROM bookings
+    WHERE check_out_date > check_in_date
+),
+occupied AS (
+    SELECT hotel_name, stay_date, COUNT(DISTINCT room_id) AS occupied_rooms, SUM(nightly_price) AS room_revenue
+    FROM nights
+    GROUP BY hotel_name, stay_date
+)
+SELECT
+    r.hotel_name,
+    c.stay_date,
+    COALESCE(o.occupied_rooms, 0) AS occupied_rooms,
+    r.total_rooms,
+    ROUND(COALESCE(o.occupied_rooms, 0)::numeric / r.total_rooms, 4) AS occupancy_rate,
+    COALESCE(o.room_revenue, 0)::numeric(12, 2) AS room_revenue
+FROM hotel_rooms r
+CROSS JOIN calendar c
+LEFT JOIN occupied o ON o.hotel_name = r.hotel_name AND o.stay_date = c.stay_date;
+
+CREATE UNIQUE INDEX IF NOT EXISTS hotel_daily_occupancy_key
+    ON hotel_daily_occupancy (hotel_name, stay_date);
+CREATE INDEX IF NOT EXISTS hotel_daily_occupancy_stay_date
+    ON hotel_daily_occupancy (stay_date);
+
+-- Revenue per hotel and check-in month, by room type and meal plan
+CREATE MATERIALIZED VIEW IF NOT EXISTS hotel_monthly_revenue AS
+SELECT
+    hotel_name,
+    date_trunc('month', check_in_date)::date AS month,
+    room_type,
+    meal_plan,
+    COUNT(*) AS bookings,
+    SUM(check_out_date - check_in_date) AS room_nights,
+    SUM(total_price)::numeric(14, 2) AS revenue
+FROM bookings
+GROUP BY hotel_name, date_trunc('month', check_in_date)::date, room_type, meal_plan;
+
+CREATE UNIQUE INDEX IF NOT EXISTS hotel_monthly_revenue_key
+    ON hotel_monthly_revenue (hotel_name, month, room_type, meal_plan);
+CREATE INDEX IF NOT EXISTS hotel_monthly_revenue_month
+    ON hotel_monthly_revenue (month);
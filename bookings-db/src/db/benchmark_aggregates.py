@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Benchmark analytics questions on the raw bookings table vs the materialized aggregates.
+
+Each question is answered twice, once from `bookings` and once from the views
+in aggregates.sql, and the median time of each version is printed together
+with a check that both return the same result.
+
+Usage:
+    POSTGRES_USER=... POSTGRES_PASSWORD=... POSTGRES_DB=... \\
+        python benchmark_aggregates.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import psycopg2
+
+# (question, raw SQL, aggregate SQL); both return a single row
+QUERIES = [
+    (
+        "Average occupancy of a hotel in August",
+        """
+        WITH days AS (
+            SELECT generate_series(%(start)s::date, %(end)s::date - 1, INTERVAL '1 day')::date
+                AS stay_date
+        ),
+        per_day AS (
+            SELECT d.stay_date, COUNT(DISTINCT b.room_id) AS occupied
+            FROM days d
+            LEFT JOIN bookings b
+                ON b.hotel_name = %(hotel)s
+                AND b.check_in_date <= d.stay_date
+                AND b.check_out_date > d.stay_date
+            GROUP BY d.stay_date
+        )
+        SELECT ROUND(AVG(occupied)::numeric
+                     / (SELECT COUNT(DISTINCT room_id) FROM bookings
+                        WHERE hotel_name = %(hotel)s), 4)
+        FROM per_day
+        """,
+        """
+        SELECT ROUND(AVG(occupied_rooms)::numeric / MAX(total_rooms), 4)
+        FROM hotel_daily_occupancy
+        WHERE hotel_name = %(hotel)s AND stay_date >= %(start)s AND stay_date < %(end)s
+        """,
+    ),
+    (
+        "Busiest day across all hotels",
+        """
+        WITH nights AS (
+            SELECT generate_series(check_in_date, check_out_date - 1, INTERVAL '1 day')::date
+                AS stay_date
+            FROM bookings
+            WHERE check_out_date > check_in_date
+        )
+        SELECT COUNT(*) FROM nights GROUP BY stay_date ORDER BY COUNT(*) DESC, stay_date LIMIT 1
+        """,
+        """
+        SELECT SUM(occupied_rooms) FROM hotel_daily_occupancy
+        GROUP BY stay_date ORDER BY SUM(occupied_rooms) DESC, stay_date LIMIT 1
+        """,
+    ),
+    (
+        "Revenue of a hotel by meal plan in a year",
+        """
+        SELECT string_agg(meal_plan || '=' || revenue, ', ' ORDER BY meal_plan)
+        FROM (
+            SELECT meal_plan, SUM(total_price)::numeric(14, 2) AS revenue
+            FROM bookings
+            WHERE hotel_name = %(hotel)s
+                AND check_in_date >= %(year_start)s AND check_in_date < %(year_end)s
+            GROUP BY meal_plan
+        ) r
+        """,
+        """
+        SELECT string_agg(meal_plan || '=' || revenue, ', ' ORDER BY meal_plan)
+        FROM (
+            SELECT meal_plan, SUM(revenue)::numeric(14, 2) AS revenue
+            FROM hotel_monthly_revenue
+            WHERE hotel_name = %(hotel)s AND month >= %(year_start)s AND month < %(year_end)s
+            GROUP BY meal_plan
+        ) r
+        """,
+    ),
+    (
+        "Total revenue per room type, all hotels",
+        """
+        SELECT string_agg(room_type || '=' || revenue, ', ' ORDER BY room_type)
+        FROM (
+            SELECT room_type, SUM(total_price)::numeric(14, 2) AS revenue
+            FROM bookings
+            GROUP BY room_type
+        ) r
+        """,
+        """
+        SELECT string_agg(room_type || '=' || revenue, ', ' ORDER BY room_type)
+        FROM (
+            SELECT room_type, SUM(revenue)::numeric(14, 2) AS revenue
+            FROM hotel_monthly_revenue
+            GROUP BY room_type
+        ) r
+        """,
+    ),
+]
+
+
+def time_query(cursor, sql, params, runs):
+    """Run a query several times and return its median time in ms and its result."""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        result = cursor.fetchone()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description="Benchmark raw vs aggregated analytics queries")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Runs per query (the median is reported)"
+    )
+    parser.add_argument(
+        "--host", default=os.getenv("POSTGRES_HOST", "bookings-db"), help="Database host"
+    )
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=args.host,
+        database=os.getenv('POSTGRES_DB'),
+        user=os.getenv('POSTGRES_USER'),
+        password=os.getenv('POSTGRES_PASSWORD')
+    )
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT hotel_name, MIN(check_in_date) FROM bookings "
+            "GROUP BY hotel_name ORDER BY hotel_name LIMIT 1"
+        )
+        hotel, first_day = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) FROM bookings")
+        total_bookings = cursor.fetchone()[0]
+        year = first_day.year
+        params = {
+            "hotel": hotel,
+            "start": f"{year}-08-01",
+            "end": f"{year}-09-01",
+            "year_start": f"{year}-01-01",
+            "year_end": f"{year + 1}-01-01",
+        }
+
+        print(f"{total_bookings} bookings, sample hotel: {hotel}\n")
+        print(
+            f"{'question':<42} | {'raw ms':>9} | {'aggregate ms':>12} | {'speed-up':>8} "
+            "| same result"
+        )
+        print("-" * 95)
+        for question, raw_sql, aggregate_sql in QUERIES:
+            raw_ms, raw_result = time_query(cursor, raw_sql, params, args.runs)
+            aggregate_ms, aggregate_result = time_query(cursor, aggregate_sql, params, args.runs)
+            print(
+                f"{question:<42} | {raw_ms:>9.2f} | {aggregate_ms:>12.2f} | "
+                f"{raw_ms / aggregate_ms if aggregate_ms else 0:>7.1f}x | "
+                f"{raw_result == aggregate_result}"
+            )
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
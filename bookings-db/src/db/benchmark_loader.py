@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark the bookings load methods of load_data.py.
+
+The bookings of the generator's output (Parquet or Arrow IPC dataset, or
+Excel file) are repeated to grow the dataset (each copy under new hotel
+names, so stays never overlap) and loaded with every method
+into a fresh copy of the schema in the scratch schema bench_loader: COPY
+through the staging table, execute_values through the staging table, and
+the original one INSERT per booking. The time, rows per second and a
+checksum of the loaded data are printed for each method.
+
+Usage:
+    POSTGRES_USER=... POSTGRES_PASSWORD=... POSTGRES_DB=... \\
+        python benchmark_loader.py [--copies 8] [--methods copy values rows]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+import pyarrow as pa
+import pyarrow.compute as pc
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from load_data import LOAD_METHODS, load_bookings, read_bookings
+
+SQL_DIR = Path(__file__).parent
+BOOKINGS_PATH = SQL_DIR.parent.parent / "output_files" / "bookings"
+DEFAULT_DATA_FILE = next(
+    (
+        BOOKINGS_PATH / name
+        for name in ("all_bookings.parquet", "all_bookings.arrow")
+        if (BOOKINGS_PATH / name).exists()
+    ),
+    BOOKINGS_PATH / "all_bookings.xlsx",
+)
+
+
+def build_dataset(data_file, copies):
+    """Read the bookings and repeat them under new hotel names."""
+    table = read_bookings(str(data_file))
+    hotel_names = table.schema.get_field_index('hotel_name')
+    tables = [table]
+    for copy in range(1, copies):
+        renamed = pc.binary_join_element_wise(table['hotel_name'], f" #{copy + 1}", "")
+        tables.append(table.set_column(hotel_names, 'hotel_name', renamed))
+    return pa.concat_tables(tables)
+
+
+def reset_schema(conn):
+    """Create an empty copy of the schema in bench_loader."""
+    cursor = conn.cursor()
+    cursor.execute("DROP SCHEMA IF EXISTS bench_loader CASCADE")
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    cursor.execute("CREATE SCHEMA bench_loader")
+    cursor.execute("SET search_path = bench_loader, public")
+    cursor.execute((SQL_DIR / "init.sql").read_text(encoding="utf-8"))
+    conn.commit()
+    cursor.close()
+
+
+def checksum(conn):
+    """Return the number of bookings, rooms and the total price loaded."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*), COUNT(DISTINCT room_id), SUM(total_price) FROM room_bookings")
+    result = cursor.fetchone()
+    cursor.close()
+    return result
+
+
+def main():
+    """Load the dataset with each method and print the timings."""
+    parser = argparse.ArgumentParser(description="Benchmark the bookings load methods")
+    parser.add_argument(
+        "--data-file", type=Path, default=DEFAULT_DATA_FILE, help="Bookings dataset or Excel file"
+    )
+    parser.add_argument(
+        "--copies", type=int, default=8, help="Repeat the bookings to grow the dataset"
+    )
+    parser.add_argument(
+        "--methods", nargs="+", choices=LOAD_METHODS, default=list(LOAD_METHODS),
+        help="Methods to run"
+    )
+    parser.add_argument(
+        "--host", default=os.getenv("POSTGRES_HOST", "bookings-db"), help="Database host"
+    )
+    args = parser.parse_args()
+
+    table = build_dataset(args.data_file, args.copies)
+    print(f"{table.num_rows} bookings ({args.copies} copies of {args.data_file.name})\n")
+
+    conn = psycopg2.connect(
+        host=args.host,
+        database=os.getenv('POSTGRES_DB'),
+        user=os.getenv('POSTGRES_USER'),
+        password=os.getenv('POSTGRES_PASSWORD')
+    )
+    results = []
+    try:
+        for method in args.methods:
+            reset_schema(conn)
+            rows, seconds = load_bookings(conn, table, method)
+            results.append((method, rows, seconds, checksum(conn)))
+    finally:
+        cursor = conn.cursor()
+        cursor.execute("DROP SCHEMA IF EXISTS bench_loader CASCADE")
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+    baseline = next((seconds for method, _, seconds, _ in results if method == 'rows'), None)
+    print(
+        f"\n{'method':<8} | {'rows':>9} | {'seconds':>8} | {'rows/s':>10} | {'vs rows':>8} "
+        "| checksum"
+    )
+    print("-" * 80)
+    for method, rows, seconds, result in results:
+        speed_up = f"{baseline / seconds:.1f}x" if baseline else "-"
+        print(
+            f"{method:<8} | {rows:>9} | {seconds:>8.2f} | {rows / seconds:>10,.0f} "
+            f"| {speed_up:>8} | {result}"
+        )
+
+
+if __name__ == "__main__":
+    main()
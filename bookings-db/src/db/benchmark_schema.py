@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Benchmark availability and occupancy queries on the flat vs the normalized schema.
+
+A synthetic dataset (1M bookings by default) is generated in the original
+flat bookings table in the schema bench_flat, and migrated with
+migrate_to_normalized.sql into the schema of init.sql in bench_normalized.
+Each question is then answered from both schemas: with the same query on
+`bookings` (the flat table, or the compatibility view) and, when it helps,
+with a query written for the normalized tables. The median time of each
+version is printed together with a check that they return the same result,
+followed by the size of the tables and their indexes.
+
+Usage:
+    POSTGRES_USER=... POSTGRES_PASSWORD=... POSTGRES_DB=... \\
+        python benchmark_schema.py [--bookings 1000000] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+
+import psycopg2
+
+SQL_DIR = Path(__file__).parent
+
+# Definition of the bookings table before the normalized schema
+FLAT_SCHEMA = """
+CREATE TABLE bookings (
+    id SERIAL PRIMARY KEY,
+    hotel_name VARCHAR(255),
+    room_id VARCHAR(50),
+    room_type VARCHAR(100),
+    room_category VARCHAR(100),
+    check_in_date DATE,
+    check_out_date DATE,
+    total_nights INTEGER,
+    guest_first_name VARCHAR(100),
+    guest_last_name VARCHAR(100),
+    guest_email VARCHAR(255),
+    guest_phone VARCHAR(50),
+    guest_country VARCHAR(100),
+    guest_city VARCHAR(100),
+    guest_address TEXT,
+    guest_zip_code VARCHAR(20),
+    meal_plan VARCHAR(50),
+    total_price DECIMAL(10, 2)
+)
+"""
+
+# Every room gets one booking per week from 2024-01-01, of 0 to 6 nights
+# inside its week, so the stays of a room never overlap
+FLAT_DATA = """
+INSERT INTO bookings (
+    hotel_name, room_id, room_type, room_category, check_in_date, check_out_date, total_nights,
+    guest_first_name, guest_last_name, guest_email, guest_phone, guest_country, guest_city,
+    guest_address, guest_zip_code, meal_plan, total_price
+)
+SELECT
+    'Hotel ' || lpad(h::text, 3, '0'),
+    lpad((r / 20 + 1)::text, 2, '0') || '-' || lpad((r %% 20 + 1)::text, 3, '0'),
+    (ARRAY['Single', 'Double', 'Triple'])[1 + r %% 3],
+    (ARRAY['Standard', 'Premium'])[1 + (r / 3) %% 2],
+    s.check_in,
+    s.check_in + s.nights,
+    s.nights,
+    'Guest', 'Number ' || k, 'guest' || k || '@example.com', '+34 600 000 000',
+    (ARRAY['Spain', 'Italy', 'France', 'Germany', 'Portugal', 'United Kingdom'])
+        [1 + (h * 7 + k) %% 6],
+    'City', 'Street 1', '28001',
+    (ARRAY['Room Only', 'Room and Breakfast', 'Half Board', 'Full Board', 'All Inclusive'])
+        [1 + (r + k) %% 5],
+    s.nights * 95.50
+FROM generate_series(1, %(hotels)s) h
+CROSS JOIN generate_series(0, %(rooms)s - 1) r
+CROSS JOIN generate_series(0, %(weeks)s - 1) k
+CROSS JOIN LATERAL (
+    SELECT
+        DATE '2024-01-01' + k * 7
+            + (h + r + k) %% (7 - (h * 31 + r * 17 + k * 13) %% 7) AS check_in,
+        (h * 31 + r * 17 + k * 13) %% 7 AS nights
+) s
+ORDER BY h, r, k
+"""
+
+# (question, query on bookings, query on the normalized tables or None)
+QUERIES = [
+    (
+        "Rooms occupied at a hotel on a day",
+        """
+        SELECT COUNT(*) FROM bookings
+        WHERE hotel_name = %(hotel)s AND check_in_date <= %(day)s AND check_out_date > %(day)s
+        """,
+        """
+        SELECT COUNT(*) FROM room_bookings b
+        JOIN rooms r ON r.id = b.room_id
+        JOIN hotels h ON h.id = r.hotel_id
+        WHERE h.name = %(hotel)s AND b.stay @> %(day)s::date
+        """,
+    ),
+    (
+        "Free rooms of a hotel for a stay",
+        """
+        SELECT COUNT(*) FROM (
+            SELECT room_id FROM bookings WHERE hotel_name = %(hotel)s
+            EXCEPT
+            SELECT room_id FROM bookings
+            WHERE hotel_name = %(hotel)s AND check_in_date < %(end)s AND check_out_date > %(start)s
+        ) free
+        """,
+        """
+        SELECT COUNT(*) FROM rooms r
+        JOIN hotels h ON h.id = r.hotel_id
+        WHERE h.name = %(hotel)s
+        AND NOT EXISTS (
+            SELECT 1 FROM room_bookings b
+            WHERE b.room_id = r.id AND b.stay && daterange(%(start)s::date, %(end)s::date)
+        )
+        """,
+    ),
+    (
+        "Calendar of a room",
+        """
+        SELECT COUNT(*), MIN(check_in_date), MAX(check_out_date) FROM bookings
+        WHERE hotel_name = %(hotel)s AND room_id = %(room)s
+        """,
+        None,
+    ),
+    (
+        "Occupied room nights in a week, all hotels",
+        """
+        SELECT SUM(LEAST(check_out_date, %(end)s::date) - GREATEST(check_in_date, %(start)s::date))
+        FROM bookings
+        WHERE check_in_date < %(end)s AND check_out_date > %(start)s
+        """,
+        """
+        SELECT SUM(upper(stay * daterange(%(start)s::date, %(end)s::date))
+                   - lower(stay * daterange(%(start)s::date, %(end)s::date)))
+        FROM room_bookings
+        WHERE stay && daterange(%(start)s::date, %(end)s::date)
+        """,
+    ),
+    (
+        "Check-ins in a month",
+        """
+        SELECT COUNT(*) FROM bookings
+        WHERE check_in_date >= %(month_start)s AND check_in_date < %(month_end)s
+        """,
+        None,
+    ),
+    (
+        "Bookings from a country in a month",
+        """
+        SELECT COUNT(*) FROM bookings
+        WHERE guest_country = %(country)s
+            AND check_in_date >= %(month_start)s AND check_in_date < %(month_end)s
+        """,
+        None,
+    ),
+]
+
+
+def time_query(cursor, sql, params, runs):
+    """Run a query several times and return its median time in ms and its result."""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        result = cursor.fetchone()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def build_schemas(conn, cursor, hotels, rooms, weeks):
+    """Create the flat and normalized benchmark schemas and fill them."""
+    cursor.execute(
+        "DROP SCHEMA IF EXISTS bench_flat CASCADE; DROP SCHEMA IF EXISTS bench_normalized CASCADE"
+    )
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    cursor.execute("CREATE SCHEMA bench_flat; CREATE SCHEMA bench_normalized")
+
+    start = time.perf_counter()
+    cursor.execute("SET search_path = bench_flat, public")
+    cursor.execute(FLAT_SCHEMA)
+    cursor.execute(FLAT_DATA, {"hotels": hotels, "rooms": rooms, "weeks": weeks})
+    cursor.execute("ANALYZE bookings")
+    conn.commit()
+    print(f"Flat table filled in {time.perf_counter() - start:.1f}s")
+
+    # Migrate the flat table exactly as init-db.sh does, reading it through bookings_legacy
+    start = time.perf_counter()
+    cursor.execute("SET search_path = bench_normalized, public")
+    cursor.execute("CREATE VIEW bookings_legacy AS SELECT * FROM bench_flat.bookings")
+    cursor.execute((SQL_DIR / "init.sql").read_text(encoding="utf-8"))
+    cursor.execute((SQL_DIR / "migrate_to_normalized.sql").read_text(encoding="utf-8"))
+    cursor.execute("DROP VIEW bookings_legacy")
+    conn.commit()
+    print(f"Normalized schema migrated in {time.perf_counter() - start:.1f}s\n")
+
+
+def print_sizes(cursor):
+    """Print the size of the tables and indexes of both schemas."""
+    cursor.execute("""
+        SELECT n.nspname, c.relname, pg_total_relation_size(c.oid), pg_indexes_size(c.oid)
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname IN ('bench_flat', 'bench_normalized') AND c.relkind = 'r'
+        ORDER BY n.nspname, c.relname
+    """)
+    print(f"\n{'table':<32} | {'total MB':>9} | {'indexes MB':>10}")
+    print("-" * 57)
+    for schema, table, total, indexes in cursor.fetchall():
+        print(f"{schema + '.' + table:<32} | {total / 2**20:>9.1f} | {indexes / 2**20:>10.1f}")
+
+
+def main():
+    """Build the schemas, run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the flat vs the normalized bookings schema"
+    )
+    parser.add_argument(
+        "--bookings", type=int, default=1_000_000, help="Approximate number of bookings"
+    )
+    parser.add_argument("--hotels", type=int, default=200, help="Number of hotels")
+    parser.add_argument("--rooms", type=int, default=100, help="Rooms per hotel")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Runs per query (the median is reported)"
+    )
+    parser.add_argument(
+        "--host", default=os.getenv("POSTGRES_HOST", "bookings-db"), help="Database host"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the benchmark schemas afterwards"
+    )
+    args = parser.parse_args()
+    weeks = max(1, round(args.bookings / (args.hotels * args.rooms)))
+
+    conn = psycopg2.connect(
+        host=args.host,
+        database=os.getenv('POSTGRES_DB'),
+        user=os.getenv('POSTGRES_USER'),
+        password=os.getenv('POSTGRES_PASSWORD')
+    )
+    cursor = conn.cursor()
+    try:
+        print(
+            f"{args.hotels * args.rooms * weeks} bookings: "
+            f"{args.hotels} hotels x {args.rooms} rooms x {weeks} weeks"
+        )
+        build_schemas(conn, cursor, args.hotels, args.rooms, weeks)
+
+        params = {
+            "hotel": "Hotel 001",
+            "room": "02-005",
+            "day": "2024-03-15",
+            "start": "2024-03-11",
+            "end": "2024-03-18",
+            "month_start": "2024-03-01",
+            "month_end": "2024-04-01",
+            "country": "Spain",
+        }
+        print(
+            f"{'question':<42} | {'flat ms':>9} | {'view ms':>9} | {'normalized ms':>13} "
+            "| same result"
+        )
+        print("-" * 100)
+        for question, flat_sql, normalized_sql in QUERIES:
+            cursor.execute("SET search_path = bench_flat, public")
+            flat_ms, flat_result = time_query(cursor, flat_sql, params, args.runs)
+            cursor.execute("SET search_path = bench_normalized, public")
+            view_ms, view_result = time_query(cursor, flat_sql, params, args.runs)
+            results = [flat_result, view_result]
+            normalized = "-"
+            if normalized_sql:
+                normalized_ms, normalized_result = time_query(
+                    cursor, normalized_sql, params, args.runs
+                )
+                results.append(normalized_result)
+                normalized = f"{normalized_ms:.2f}"
+            print(
+                f"{question:<42} | {flat_ms:>9.2f} | {view_ms:>9.2f} | {normalized:>13} | "
+                f"{all(result == flat_result for result in results)}"
+            )
+        print_sizes(cursor)
+    finally:
+        if not args.keep:
+            cursor.execute(
+                "DROP SCHEMA IF EXISTS bench_flat CASCADE; "
+                "DROP SCHEMA IF EXISTS bench_normalized CASCADE"
+            )
+            conn.commit()
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
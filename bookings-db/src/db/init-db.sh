@@ -18,14 +18,24 @@ else
     echo "Database '$POSTGRES_DB' already exists."
 fi
 
-# Check if table exists
-if ! PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -c "\dt" | grep -qw bookings; then
-    echo "Table 'bookings' does not exist. Creating it..."
-    PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -f /app/db/init.sql
-else
-    echo "Table 'bookings' already exists."
+# Migrate a database created with the original flat bookings table
+if [ "$(PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -t -A -c "SELECT relkind FROM pg_class WHERE relname = 'bookings' AND relnamespace = 'public'::regnamespace;")" = "r" ]; then
+    echo "Flat table 'bookings' found. Migrating it to the normalized schema..."
+    PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -v ON_ERROR_STOP=1 -1 \
+        -c "DROP MATERIALIZED VIEW IF EXISTS hotel_daily_occupancy, hotel_monthly_revenue; ALTER TABLE bookings RENAME TO bookings_legacy;" \
+        -f /app/db/init.sql -f /app/db/migrate_to_normalized.sql -f /app/db/aggregates.sql \
+        || { echo "Migration failed; the flat table was left unchanged."; exit 1; }
+    echo "Migration completed. The original rows are kept in 'bookings_legacy'."
 fi
 
+# Create the normalized tables and the bookings view (no-op if they exist)
+echo "Creating the schema if it doesn't exist..."
+PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -f /app/db/init.sql
+
+# Create the materialized occupancy and revenue aggregates (no-op if they exist)
+echo "Creating aggregates if they don't exist..."
+PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -f /app/db/aggregates.sql
+
 # Check if table is empty
 if [ "$(PGPASSWORD=$POSTGRES_PASSWORD psql -h bookings-db -U $POSTGRES_USER -d $POSTGRES_DB -t -c "SELECT COUNT(*) FROM bookings;")" -eq 0 ]; then
     echo "Table 'bookings' is empty. Loading data..."
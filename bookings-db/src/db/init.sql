@@ -1,13 +1,35 @@
--- Create the bookings table
-CREATE TABLE IF NOT EXISTS bookings (
+-- Normalized bookings schema: hotels, their rooms, and the bookings of each
+-- room. The `bookings` view joins them back into the columns of the original
+-- flat table, so existing readers (aggregates.sql, the API's SQL analytics)
+-- keep working unchanged. Every statement is idempotent.
+
+-- GiST operator classes for scalar columns, used by the double-booking constraint
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Create the hotels table
+CREATE TABLE IF NOT EXISTS hotels (
     id SERIAL PRIMARY KEY,
-    hotel_name VARCHAR(255),
-    room_id VARCHAR(50),
-    room_type VARCHAR(100),
-    room_category VARCHAR(100),
-    check_in_date DATE,
-    check_out_date DATE,
-    total_nights INTEGER,
+    name VARCHAR(255) NOT NULL UNIQUE
+);
+
+-- Create the rooms table; code is the room number within its hotel (e.g. '01-004')
+CREATE TABLE IF NOT EXISTS rooms (
+    id SERIAL PRIMARY KEY,
+    hotel_id INTEGER NOT NULL REFERENCES hotels (id) ON DELETE CASCADE,
+    code VARCHAR(50) NOT NULL,
+    room_type VARCHAR(100) NOT NULL,
+    room_category VARCHAR(100) NOT NULL,
+    UNIQUE (hotel_id, code)
+);
+
+-- Create the room_bookings table. stay is the half-open range of occupied
+-- nights [check_in_date, check_out_date); it is empty for same-day bookings.
+CREATE TABLE IF NOT EXISTS room_bookings (
+    id SERIAL PRIMARY KEY,
+    room_id INTEGER NOT NULL REFERENCES rooms (id) ON DELETE CASCADE,
+    check_in_date DATE NOT NULL,
+    check_out_date DATE NOT NULL,
+    stay DATERANGE GENERATED ALWAYS AS (daterange(check_in_date, check_out_date)) STORED,
     guest_first_name VARCHAR(100),
     guest_last_name VARCHAR(100),
     guest_email VARCHAR(255),
@@ -16,6 +38,48 @@ CREATE TABLE IF NOT EXISTS bookings (
     guest_city VARCHAR(100),
     guest_address TEXT,
     guest_zip_code VARCHAR(20),
-    meal_plan VARCHAR(50),
-    total_price DECIMAL(10, 2)
-);
\ No newline at end of file
+    meal_plan VARCHAR(50) NOT NULL,
+    total_price DECIMAL(10, 2) NOT NULL CHECK (total_price >= 0),
+    CHECK (check_out_date >= check_in_date),
+    -- A room can't be booked twice for the same night; the constraint's
+    -- GiST index also answers "is this room free between two dates"
+    CONSTRAINT room_bookings_no_overlap EXCLUDE USING gist (room_id WITH =, stay WITH &&)
+);
+
+-- Bookings of a room in date order (room calendars, foreign key checks)
+CREATE INDEX IF NOT EXISTS room_bookings_room_check_in
+    ON room_bookings (room_id, check_in_date) INCLUDE (check_out_date);
+-- Bookings overlapping a date range across all rooms (occupancy)
+CREATE INDEX IF NOT EXISTS room_bookings_stay
+    ON room_bookings USING gist (stay);
+-- Check-in date ranges; the loader inserts in check-in order, so a BRIN index
+-- stays small and selective
+CREATE INDEX IF NOT EXISTS room_bookings_check_in_brin
+    ON room_bookings USING brin (check_in_date) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS room_bookings_guest_country
+    ON room_bookings (guest_country);
+
+-- Flat view with the columns of the original bookings table
+CREATE OR REPLACE VIEW bookings AS
+SELECT
+    b.id,
+    h.name AS hotel_name,
+    r.code AS room_id,
+    r.room_type,
+    r.room_category,
+    b.check_in_date,
+    b.check_out_date,
+    b.check_out_date - b.check_in_date AS total_nights,
+    b.guest_first_name,
+    b.guest_last_name,
+    b.guest_email,
+    b.guest_phone,
+    b.guest_country,
+    b.guest_city,
+    b.guest_address,
+    b.guest_zip_code,
+    b.meal_plan,
+    b.total_price
+FROM room_bookings b
+JOIN rooms r ON r.id = b.room_id
+JOIN hotels h ON h.id = r.hotel_id;
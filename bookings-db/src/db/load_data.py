@@ -1,16 +1,103 @@
 #!/usr/bin/env python3
-"""Script to load booking data from Excel into PostgreSQL database."""
+"""Script to load booking data into PostgreSQL database.
 
+The bookings are read from the generator's columnar output: a Parquet or
+Arrow IPC dataset partitioned by hotel and month (all_bookings.parquet or
+all_bookings.arrow), or the optional Excel export (all_bookings.xlsx). Arrow
+IPC files are memory-mapped, so their columns are read without copying.
+Datasets are streamed to the database in record batches of COPY_CHUNK_ROWS,
+so the loader's memory does not grow with the number of bookings.
+
+The bookings are stored in the normalized schema of init.sql. They are bulk
+loaded into a temporary staging table with COPY FROM STDIN (or execute_values
+batches when COPY is not available), then moved into hotels, rooms and
+room_bookings with set-based statements. The whole load is one transaction,
+so readers keep seeing the previous bookings until the new ones replace them
+at commit.
+
+The input can be chosen with the BOOKINGS_DATA_FILE environment variable
+(default: the first of DATA_FILES that exists), and the method with
+LOAD_METHOD:
+- copy: COPY into the staging table, falling back to values on error (default)
+- values: execute_values batches into the staging table
+- rows: one INSERT per booking, without staging (the original loader, kept for comparison)
+"""
+
+import io
 import os
+import time
+
 import pandas as pd
 import psycopg2
-from psycopg2 import OperationalError, DatabaseError
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+from psycopg2 import DatabaseError, OperationalError
+from psycopg2.extras import execute_values
+from pyarrow import fs
+
+# Materialized aggregates defined in aggregates.sql
+AGGREGATES_SQL_FILE = '/app/db/aggregates.sql'
+AGGREGATE_VIEWS = ('hotel_daily_occupancy', 'hotel_monthly_revenue')
+
+# Bookings inputs, in order of preference
+DATA_FILES = (
+    '/app/data/all_bookings.parquet',
+    '/app/data/all_bookings.arrow',
+    '/app/data/all_bookings.xlsx',
+)
+
+LOAD_METHODS = ('copy', 'values', 'rows')
+# Rows sent per COPY statement / per execute_values page
+COPY_CHUNK_ROWS = 50000
+VALUES_PAGE_SIZE = 1000
+
+# Columns of the staging table, as read from the datasets
+STAGING_SCHEMA = pa.schema([
+    ('hotel_name', pa.string()),
+    ('room_id', pa.string()),
+    ('room_type', pa.string()),
+    ('room_category', pa.string()),
+    ('check_in_date', pa.date32()),
+    ('check_out_date', pa.date32()),
+    ('guest_first_name', pa.string()),
+    ('guest_last_name', pa.string()),
+    ('guest_email', pa.string()),
+    ('guest_phone', pa.string()),
+    ('guest_country', pa.string()),
+    ('guest_city', pa.string()),
+    ('guest_address', pa.string()),
+    ('guest_zip_code', pa.string()),
+    ('meal_plan', pa.string()),
+    ('total_price', pa.float64()),
+])
+STAGING_COLUMN_LIST = ', '.join(STAGING_SCHEMA.names)
+
+# Excel column of each staging column
+EXCEL_COLUMNS = {
+    'hotel_name': 'Hotel Name',
+    'room_id': 'Room ID',
+    'room_type': 'Room Type',
+    'room_category': 'Room Category',
+    'check_in_date': 'Check-in Date',
+    'check_out_date': 'Check-out Date',
+    'guest_first_name': 'Guest First Name',
+    'guest_last_name': 'Guest Last Name',
+    'guest_email': 'Guest Email',
+    'guest_phone': 'Guest Phone',
+    'guest_country': 'Guest Country',
+    'guest_city': 'Guest City',
+    'guest_address': 'Guest Address',
+    'guest_zip_code': 'Guest Zip Code',
+    'meal_plan': 'Meal Plan',
+    'total_price': 'Total Price',
+}
 
 def check_table_exists(cursor, table_name):
     """Check if a table exists in the database."""
     cursor.execute("""
         SELECT EXISTS (
-            SELECT FROM information_schema.tables 
+            SELECT FROM information_schema.tables
             WHERE table_name = %s
         );
     """, (table_name,))
@@ -18,12 +105,362 @@ def check_table_exists(cursor, table_name):
 
 def execute_sql_file(cursor, file_path):
     """Execute SQL commands from a file."""
-    with open(file_path, 'r', encoding='utf-8') as file:
+    with open(file_path, encoding='utf-8') as file:
         sql_commands = file.read()
         cursor.execute(sql_commands)
 
-def load_excel_to_postgres():
-    """Load booking data from Excel file into PostgreSQL database."""
+def read_excel_bookings(excel_file):
+    """Read the bookings of the Excel export as an Arrow table with the staging columns."""
+    df = pd.read_excel(excel_file).rename(
+        columns={excel: column for column, excel in EXCEL_COLUMNS.items()}
+    )
+    for column in ('check_in_date', 'check_out_date'):
+        df[column] = pd.to_datetime(df[column]).dt.date
+    # Excel reads zip codes (and other digit-only text) as numbers
+    for field in STAGING_SCHEMA:
+        if pa.types.is_string(field.type):
+            values = df[field.name]
+            df[field.name] = values.astype(object).where(values.isna(), values.astype(str))
+    return pa.Table.from_pandas(
+        df[STAGING_SCHEMA.names], schema=STAGING_SCHEMA, preserve_index=False
+    )
+
+def open_bookings(path):
+    """Open the bookings without reading them: a Parquet or Arrow IPC dataset, or an Excel file.
+
+    Datasets are opened with their hive partitioning (hotel_name and month in
+    the paths); Arrow IPC files are memory-mapped, so the columns reference
+    the files' pages instead of being copied. The Excel export has to be
+    parsed whole and is returned as a table.
+
+    Args:
+        path: all_bookings.parquet or all_bookings.arrow directory (or a single
+            file), or all_bookings.xlsx
+
+    Returns:
+        Arrow dataset, or Arrow table with the STAGING_SCHEMA columns
+    """
+    if path.endswith('.xlsx'):
+        return read_excel_bookings(path)
+    file_format = 'ipc' if path.rstrip('/').endswith(('.arrow', '.feather')) else 'parquet'
+    return ds.dataset(
+        path,
+        format=file_format,
+        partitioning='hive',
+        filesystem=fs.LocalFileSystem(use_mmap=True)
+    )
+
+def read_bookings(path):
+    """Read all the bookings of a dataset or an Excel file (see open_bookings) into memory.
+
+    Returns:
+        Arrow table with the STAGING_SCHEMA columns
+    """
+    bookings = open_bookings(path)
+    if isinstance(bookings, ds.Dataset):
+        # Casting only copies columns whose type differs (e.g. dictionary-encoded partition values)
+        return bookings.to_table(columns=STAGING_SCHEMA.names).cast(STAGING_SCHEMA)
+    return bookings
+
+def iter_staging_batches(bookings):
+    """Yield the bookings of a dataset or table as tables with the staging columns.
+
+    Each table has up to COPY_CHUNK_ROWS rows.
+    """
+    if isinstance(bookings, ds.Dataset):
+        batches = bookings.to_batches(columns=STAGING_SCHEMA.names, batch_size=COPY_CHUNK_ROWS)
+    else:
+        batches = bookings.select(STAGING_SCHEMA.names).to_batches(max_chunksize=COPY_CHUNK_ROWS)
+    # Dataset batches follow the partition files; small ones are coalesced into one chunk
+    pending, pending_rows = [], 0
+    for batch in batches:
+        pending.append(pa.Table.from_batches([batch]).cast(STAGING_SCHEMA))
+        pending_rows += batch.num_rows
+        if pending_rows >= COPY_CHUNK_ROWS:
+            yield pa.concat_tables(pending)
+            pending, pending_rows = [], 0
+    if pending_rows:
+        yield pa.concat_tables(pending)
+
+def count_bookings(bookings):
+    """Return the number of bookings of a dataset or table.
+
+    The rows of a dataset are counted from the file metadata when possible.
+    """
+    if isinstance(bookings, ds.Dataset):
+        return bookings.count_rows()
+    return bookings.num_rows
+
+def find_data_file():
+    """Return the bookings input: BOOKINGS_DATA_FILE, or the first of DATA_FILES that exists."""
+    path = os.getenv('BOOKINGS_DATA_FILE')
+    if path:
+        return path
+    for path in DATA_FILES:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No bookings data found, expected one of {', '.join(DATA_FILES)}")
+
+def create_staging_table(cursor):
+    """Create the temporary staging table, dropped when the load transaction ends."""
+    cursor.execute("""
+        CREATE TEMP TABLE bookings_staging (
+            hotel_name VARCHAR(255),
+            room_id VARCHAR(50),
+            room_type VARCHAR(100),
+            room_category VARCHAR(100),
+            check_in_date DATE,
+            check_out_date DATE,
+            guest_first_name VARCHAR(100),
+            guest_last_name VARCHAR(100),
+            guest_email VARCHAR(255),
+            guest_phone VARCHAR(50),
+            guest_country VARCHAR(100),
+            guest_city VARCHAR(100),
+            guest_address TEXT,
+            guest_zip_code VARCHAR(20),
+            meal_plan VARCHAR(50),
+            total_price DECIMAL(10, 2)
+        ) ON COMMIT DROP
+    """)
+
+def copy_to_staging(cursor, bookings):
+    """Stream the bookings into the staging table with COPY FROM STDIN, one CSV chunk at a time."""
+    options = pa_csv.WriteOptions(include_header=False)
+    for batch in iter_staging_batches(bookings):
+        buffer = io.BytesIO()
+        pa_csv.write_csv(batch, buffer, options)
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY bookings_staging ({STAGING_COLUMN_LIST}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+
+def values_to_staging(cursor, bookings):
+    """Insert the bookings into the staging table with multi-row INSERT batches."""
+    for batch in iter_staging_batches(bookings):
+        rows = zip(*(batch.column(name).to_pylist() for name in STAGING_SCHEMA.names), strict=True)
+        execute_values(
+            cursor,
+            f"INSERT INTO bookings_staging ({STAGING_COLUMN_LIST}) VALUES %s",
+            rows,
+            page_size=VALUES_PAGE_SIZE
+        )
+
+def swap_from_staging(cursor):
+    """Replace the bookings, rooms and hotels with those of the staged rows.
+
+    Hotels and rooms missing from the staged rows are deleted and the type and
+    category of the remaining rooms updated, so the room counts of the
+    aggregates (hotel_daily_occupancy.total_rooms) match the loaded data.
+
+    Returns:
+        Number of bookings loaded
+    """
+    # DELETE rather than TRUNCATE, so readers aren't blocked while the new rows are inserted
+    cursor.execute("DELETE FROM room_bookings")
+    cursor.execute("""
+        DELETE FROM rooms r
+        USING hotels h
+        WHERE h.id = r.hotel_id
+          AND NOT EXISTS (
+              SELECT 1 FROM bookings_staging s
+              WHERE s.hotel_name = h.name AND s.room_id = r.code
+          )
+    """)
+    cursor.execute("""
+        DELETE FROM hotels h
+        WHERE NOT EXISTS (SELECT 1 FROM bookings_staging s WHERE s.hotel_name = h.name)
+    """)
+    cursor.execute("""
+        INSERT INTO hotels (name)
+        SELECT DISTINCT hotel_name FROM bookings_staging ORDER BY hotel_name
+        ON CONFLICT (name) DO NOTHING
+    """)
+    cursor.execute("""
+        INSERT INTO rooms (hotel_id, code, room_type, room_category)
+        SELECT DISTINCT ON (h.id, s.room_id) h.id, s.room_id, s.room_type, s.room_category
+        FROM bookings_staging s
+        JOIN hotels h ON h.name = s.hotel_name
+        ORDER BY h.id, s.room_id
+        ON CONFLICT (hotel_id, code) DO UPDATE
+        SET room_type = EXCLUDED.room_type, room_category = EXCLUDED.room_category
+        WHERE (rooms.room_type, rooms.room_category)
+            IS DISTINCT FROM (EXCLUDED.room_type, EXCLUDED.room_category)
+    """)
+    # Insert in check-in order, which keeps the BRIN index on check_in_date selective
+    cursor.execute("""
+        INSERT INTO room_bookings (
+            room_id, check_in_date, check_out_date, guest_first_name,
+            guest_last_name, guest_email, guest_phone,
+            guest_country, guest_city, guest_address,
+            guest_zip_code, meal_plan, total_price
+        )
+        SELECT
+            r.id, s.check_in_date, s.check_out_date, s.guest_first_name,
+            s.guest_last_name, s.guest_email, s.guest_phone,
+            s.guest_country, s.guest_city, s.guest_address,
+            s.guest_zip_code, s.meal_plan, s.total_price
+        FROM bookings_staging s
+        JOIN hotels h ON h.name = s.hotel_name
+        JOIN rooms r ON r.hotel_id = h.id AND r.code = s.room_id
+        ORDER BY s.check_in_date, s.hotel_name, s.room_id
+    """)
+    return cursor.rowcount
+
+def load_hotels_and_rooms(cursor, bookings):
+    """Replace the hotels and rooms with those of the bookings.
+
+    Hotels and rooms without bookings are deleted and the type and category
+    of the remaining rooms updated, as in swap_from_staging.
+
+    Returns:
+        Room ids by (hotel name, room code)
+    """
+    hotel_names = sorted({booking['hotel_name'] for booking in bookings})
+    cursor.execute("DELETE FROM hotels WHERE name <> ALL(%s)", (hotel_names,))
+    for hotel_name in hotel_names:
+        cursor.execute(
+            "INSERT INTO hotels (name) VALUES (%s) ON CONFLICT (name) DO NOTHING",
+            (hotel_name,)
+        )
+    rooms = {
+        (booking['hotel_name'], booking['room_id']): (
+            booking['room_type'], booking['room_category']
+        )
+        for booking in reversed(bookings)
+    }
+    for (hotel_name, code), (room_type, room_category) in rooms.items():
+        cursor.execute("""
+            INSERT INTO rooms (hotel_id, code, room_type, room_category)
+            SELECT id, %s, %s, %s FROM hotels WHERE name = %s
+            ON CONFLICT (hotel_id, code) DO UPDATE
+            SET room_type = EXCLUDED.room_type, room_category = EXCLUDED.room_category
+        """, (code, room_type, room_category, hotel_name))
+    cursor.execute("SELECT h.name, r.code, r.id FROM rooms r JOIN hotels h ON h.id = r.hotel_id")
+    room_ids = {}
+    stale_room_ids = []
+    for hotel_name, code, room_id in cursor.fetchall():
+        if (hotel_name, code) in rooms:
+            room_ids[(hotel_name, code)] = room_id
+        else:
+            stale_room_ids.append(room_id)
+    if stale_room_ids:
+        cursor.execute("DELETE FROM rooms WHERE id = ANY(%s)", (stale_room_ids,))
+    return room_ids
+
+def insert_rows(cursor, bookings):
+    """Replace the bookings with one INSERT per booking (the original, slow loader).
+
+    The bookings are read whole to sort them, so this method does not stream.
+
+    Returns:
+        Number of bookings loaded
+    """
+    batches = list(iter_staging_batches(bookings))
+    table = pa.concat_tables(batches) if batches else STAGING_SCHEMA.empty_table()
+    # Insert in check-in order, which keeps the BRIN index on check_in_date selective
+    bookings = table.sort_by([('check_in_date', 'ascending'), ('hotel_name', 'ascending'),
+                              ('room_id', 'ascending')]).to_pylist()
+    room_ids = load_hotels_and_rooms(cursor, bookings)
+    cursor.execute("DELETE FROM room_bookings")
+    for booking in bookings:
+        cursor.execute("""
+            INSERT INTO room_bookings (
+                room_id, check_in_date, check_out_date, guest_first_name,
+                guest_last_name, guest_email, guest_phone,
+                guest_country, guest_city, guest_address,
+                guest_zip_code, meal_plan, total_price
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, (
+            room_ids[(booking['hotel_name'], booking['room_id'])],
+            booking['check_in_date'], booking['check_out_date'],
+            booking['guest_first_name'], booking['guest_last_name'], booking['guest_email'],
+            booking['guest_phone'], booking['guest_country'], booking['guest_city'],
+            booking['guest_address'], booking['guest_zip_code'], booking['meal_plan'],
+            booking['total_price']
+        ))
+    return len(bookings)
+
+def load_bookings(conn, bookings, method='copy'):
+    """Replace the bookings in the database with the rows of an Arrow dataset or table.
+
+    The replacement runs in one transaction.
+
+    Args:
+        conn: Database connection
+        bookings: Dataset or table with the STAGING_SCHEMA columns (see open_bookings)
+        method: 'copy', 'values' or 'rows' (see the module docstring)
+
+    Returns:
+        Tuple of (number of bookings loaded, seconds taken)
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(
+            f"Unknown load method '{method}', expected one of {', '.join(LOAD_METHODS)}"
+        )
+
+    start = time.perf_counter()
+    cursor = conn.cursor()
+    try:
+        if method == 'rows':
+            rows = insert_rows(cursor, bookings)
+        else:
+            create_staging_table(cursor)
+            if method == 'copy':
+                try:
+                    copy_to_staging(cursor, bookings)
+                except DatabaseError as error:
+                    # e.g. a connection pooler that doesn't support COPY
+                    print(f"COPY failed ({error}), falling back to execute_values")
+                    method = 'values'
+                    conn.rollback()
+                    create_staging_table(cursor)
+            if method == 'values':
+                values_to_staging(cursor, bookings)
+            rows = swap_from_staging(cursor)
+
+        # Update the planner statistics of the new rows
+        cursor.execute("ANALYZE hotels; ANALYZE rooms; ANALYZE room_bookings;")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Loaded {rows} bookings with '{method}' in {elapsed:.2f}s "
+        f"({rows / elapsed:,.0f} rows/s)"
+    )
+    return rows, elapsed
+
+def refresh_aggregates(conn):
+    """Refresh the materialized aggregates after a data load and print their timings.
+
+    Views that already hold data are refreshed CONCURRENTLY, so queries keep
+    reading the previous version while the new one is computed.
+    """
+    cursor = conn.cursor()
+    try:
+        for view in AGGREGATE_VIEWS:
+            start = time.perf_counter()
+            cursor.execute("SELECT relispopulated FROM pg_class WHERE relname = %s", (view,))
+            populated = cursor.fetchone()[0]
+            concurrently = "CONCURRENTLY " if populated else ""
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {concurrently}{view}")
+            # Update the planner statistics of the new contents
+            cursor.execute(f"ANALYZE {view}")
+            conn.commit()
+            cursor.execute(f"SELECT COUNT(*) FROM {view}")
+            rows = cursor.fetchone()[0]
+            print(f"Refreshed {view}: {rows} rows in {time.perf_counter() - start:.2f}s")
+    finally:
+        cursor.close()
+
+def load_bookings_to_postgres():
+    """Load booking data from the generator's output into PostgreSQL database."""
+    conn = None
     try:
         # Connect to PostgreSQL using environment variables
         conn = psycopg2.connect(
@@ -36,46 +473,28 @@ def load_excel_to_postgres():
         # Create a cursor
         cursor = conn.cursor()
 
-        # Check if table exists and create it if it doesn't
-        if not check_table_exists(cursor, 'bookings'):
-            print("Table 'bookings' does not exist. Creating it...")
+        # Check if the schema exists and create it if it doesn't
+        if not check_table_exists(cursor, 'room_bookings'):
+            print("Table 'room_bookings' does not exist. Creating the schema...")
             execute_sql_file(cursor, '/app/db/init.sql')
             conn.commit()
 
-        # Read the Excel file
-        excel_file = "/app/data/all_bookings.xlsx"
-        df = pd.read_excel(excel_file)
-
-        # Convert date columns to datetime
-        df['Check-in Date'] = pd.to_datetime(df['Check-in Date'])
-        df['Check-out Date'] = pd.to_datetime(df['Check-out Date'])
-        
-        # Calculate total nights
-        df['Total Nights'] = (df['Check-out Date'] - df['Check-in Date']).dt.days
-
-        # Insert data into the database
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT INTO bookings (
-                    hotel_name, room_id, room_type, room_category,
-                    check_in_date, check_out_date, total_nights, guest_first_name,
-                    guest_last_name, guest_email, guest_phone,
-                    guest_country, guest_city, guest_address,
-                    guest_zip_code, meal_plan, total_price
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                row['Hotel Name'], row['Room ID'], row['Room Type'],
-                row['Room Category'], row['Check-in Date'], row['Check-out Date'],
-                row['Total Nights'], row['Guest First Name'], row['Guest Last Name'], row['Guest Email'],
-                row['Guest Phone'], row['Guest Country'], row['Guest City'],
-                row['Guest Address'], row['Guest Zip Code'], row['Meal Plan'],
-                row['Total Price']
-            ))
-
-        # Commit the transaction
+        # Create the materialized aggregates if they don't exist yet
+        execute_sql_file(cursor, AGGREGATES_SQL_FILE)
         conn.commit()
+
+        # Open the bookings dataset; it is read batch by batch while loading
+        data_file = find_data_file()
+        bookings = open_bookings(data_file)
+        print(f"Loading {count_bookings(bookings)} bookings from {data_file}")
+
+        # Load the bookings through the staging table
+        load_bookings(conn, bookings, os.getenv('LOAD_METHOD', 'copy'))
         print("Data loaded successfully into the database.")
 
+        # Rebuild the occupancy and revenue aggregates from the new rows
+        refresh_aggregates(conn)
+
     except (OperationalError, DatabaseError, FileNotFoundError, ValueError) as error:
         print(f"Error while connecting to PostgreSQL: {error}")
     finally:
@@ -85,4 +504,4 @@ def load_excel_to_postgres():
             print("PostgreSQL connection is closed.")
 
 if __name__ == "__main__":
-    load_excel_to_postgres()
+    load_bookings_to_postgres()
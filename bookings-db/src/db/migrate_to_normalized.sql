@@ -0,0 +1,53 @@
+-- Copies the rows of the original flat bookings table, renamed to
+-- bookings_legacy, into the normalized schema of init.sql. init-db.sh runs it
+-- in one transaction after renaming the table and creating the schema:
+--
+--   DROP MATERIALIZED VIEW IF EXISTS hotel_daily_occupancy, hotel_monthly_revenue;
+--   ALTER TABLE bookings RENAME TO bookings_legacy;
+--   \i init.sql
+--   \i migrate_to_normalized.sql
+--   \i aggregates.sql
+--
+-- Booking ids are kept. A room keeps the type and category of its first
+-- booking. Any row violating the new constraints (missing hotel, room or
+-- meal plan, check-out before check-in, overlapping stays of a room) aborts
+-- the transaction and leaves the flat table untouched. bookings_legacy is
+-- kept for verification and can be dropped afterwards.
+
+INSERT INTO hotels (name)
+SELECT DISTINCT hotel_name
+FROM bookings_legacy
+ORDER BY hotel_name
+ON CONFLICT (name) DO NOTHING;
+
+INSERT INTO rooms (hotel_id, code, room_type, room_category)
+SELECT DISTINCT ON (h.id, l.room_id) h.id, l.room_id, l.room_type, l.room_category
+FROM bookings_legacy l
+JOIN hotels h ON h.name = l.hotel_name
+ORDER BY h.id, l.room_id, l.id
+ON CONFLICT (hotel_id, code) DO NOTHING;
+
+-- Inserted in check-in order, which keeps the BRIN index selective
+INSERT INTO room_bookings (
+    id, room_id, check_in_date, check_out_date,
+    guest_first_name, guest_last_name, guest_email, guest_phone,
+    guest_country, guest_city, guest_address, guest_zip_code,
+    meal_plan, total_price
+)
+SELECT
+    l.id, r.id, l.check_in_date, l.check_out_date,
+    l.guest_first_name, l.guest_last_name, l.guest_email, l.guest_phone,
+    l.guest_country, l.guest_city, l.guest_address, l.guest_zip_code,
+    l.meal_plan, l.total_price
+FROM bookings_legacy l
+JOIN hotels h ON h.name = l.hotel_name
+JOIN rooms r ON r.hotel_id = h.id AND r.code = l.room_id
+ORDER BY l.check_in_date, l.id;
+
+-- Continue the id sequence after the copied ids
+SELECT setval(pg_get_serial_sequence('room_bookings', 'id'), COALESCE(MAX(id), 0) + 1, false)
+FROM room_bookings;
+
+ANALYZE hotels;
+ANALYZE rooms;
+ANALYZE room_bookings;
@@ -9,11 +9,14 @@ import yaml
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.generator.hotel_generator import generate_hotels
-from src.generator.booking_generator import generate_hotel_bookings
+from src.generator.booking_generator import booking_rows, generate_booking_chunks
 from src.generator.hotel_query_generator import HotelQueryGenerator
 from src.output.booking_output_writer import \
-    generate_file_md_hotel_bookings, \
-    generate_file_excel_all_bookings
+    ExcelBookingsWriter, \
+    MarkdownBookingsWriter
+from src.output.booking_columnar_writer import \
+    PartitionedBookingsWriter, \
+    booking_columns_to_record_batch
 from src.output.hotel_output_writer import \
     generate_file_json_for_hotels, \
     generate_file_excel_for_hotels, \
@@ -118,19 +121,52 @@ if __name__ == "__main__":
     generate_file_md_hotel_rooms(hotel_list, OUTPUT_PATH_HOTELS)
 
 
-    hotel_booking_list = []
-
-    for hotel_to_book in hotel_list:
-        hotel_bookings = generate_hotel_bookings(hotel_to_book, hotelGenerationConfig)
-        # generate_file_json_for_bookings(hotel_bookings, hotel_to_book["hotelkey"],
-        #       hotel_to_book["Name"], OUTPUT_PATH_BOOKINGS)
-        # generate_file_excel_for_bookings(hotel_bookings, hotel_to_book["hotelkey"],
-        #           hotel_to_book["Name"], OUTPUT_PATH_BOOKINGS)
-        hotel_booking_list.append(hotel_bookings)
+    # Bookings are generated in chunks and streamed to every output, so
+    # memory is bounded by the chunk size instead of the whole dataset.
+    # Columnar datasets are the interchange format; Excel is an optional export
+    bookings_formats = hotelGenerationConfig["process"].get(
+        "bookings_output_formats", ["parquet", "arrow"]
+    )
+    chunk_size = hotelGenerationConfig["process"].get("bookings_chunk_size", 20000)
+    # Hotels are generated in parallel worker processes when booking_workers > 1
+    booking_seed = hotelGenerationConfig["process"].get("booking_seed")
+    booking_workers = hotelGenerationConfig["process"].get("booking_workers", 1) or os.cpu_count()
+    # The chunks are columns: the datasets receive them as Arrow record batches,
+    # and booking dictionaries are only built for the Markdown and Excel writers
+    row_writers = [MarkdownBookingsWriter(OUTPUT_PATH_HOTELS)]
+    dataset_writers = []
+    if "parquet" in bookings_formats:
+        dataset_writers.append(PartitionedBookingsWriter(
+            os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.parquet"), "parquet"))
+    if "arrow" in bookings_formats:
+        dataset_writers.append(PartitionedBookingsWriter(
+            os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.arrow"), "arrow"))
+    if "excel" in bookings_formats:
+        row_writers.append(
+            ExcelBookingsWriter(os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.xlsx"))
+        )
 
-    generate_file_md_hotel_bookings(hotel_booking_list, OUTPUT_PATH_HOTELS)
-    generate_file_excel_all_bookings(hotel_booking_list,
-                                     os.path.join(OUTPUT_PATH_BOOKINGS, "all_bookings.xlsx"))
+    bookings_count = 0
+    bookings_start_time = time.time()
+    try:
+        for chunk in generate_booking_chunks(hotel_list, hotelGenerationConfig, chunk_size,
+                                             booking_seed, booking_workers):
+            columns = chunk["Columns"]
+            bookings_count += len(columns["ReservationID"])
+            if dataset_writers:
+                batch = booking_columns_to_record_batch(chunk["HotelName"], columns)
+                for writer in dataset_writers:
+                    writer.write_batch(chunk["HotelKey"], chunk["HotelName"], batch)
+            hotel_bookings = {"HotelKey": chunk["HotelKey"], "HotelName": chunk["HotelName"],
+                              "Bookings": booking_rows(columns)}
+            for writer in row_writers:
+                writer.write(hotel_bookings)
+    finally:
+        for writer in row_writers + dataset_writers:
+            writer.close()
+    bookings_time = time.time() - bookings_start_time
+    print(f"{bookings_count} bookings generated and written in {bookings_time:.2f} sg "
+          f"({bookings_count / bookings_time:,.0f} bookings/s)")
 
     end_time = time.time()
     elapsed_time = end_time - start_time
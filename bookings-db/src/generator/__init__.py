@@ -1,7 +1,23 @@
 """Generator package for creating synthetic hotel and booking data."""
 
 from .hotel_generator import generate_hotels
-from .booking_generator import generate_hotel_bookings, all_date_slots, adjust_slots_forecast
+from .booking_generator import (
+    generate_hotel_bookings,
+    generate_hotel_booking_chunks,
+    generate_booking_chunks,
+    iter_hotel_bookings,
+    iter_hotel_booking_columns,
+    generate_room_booking_columns,
+    booking_rows,
+    derive_seed,
+    get_guest_pool,
+    all_date_slots,
+    adjust_slots_forecast,
+    date_slot_arrays,
+    adjust_slot_arrays_occupancy,
+    adjust_slot_arrays_forecast
+)
+from .guest_pool import GuestPool
 from .hotel_query_generator import HotelQueryGenerator
 from .hotel_name_location_generator import HotelNameLocationGenerator
 from .parametric_utils import *
@@ -29,7 +45,13 @@ from .parametric_utils import (
     get_number_of_guests,
     get_extra_bed,
     get_meal_plan_prices,
-    get_total_price
+    get_total_price,
+    get_total_prices,
+    get_peak_season_mask,
+    get_cumulative_weight_table,
+    sample_from_weight_table,
+    get_meal_plan_table,
+    sample_booking_attributes
 )
 
 __all__ = [
@@ -39,8 +61,20 @@ __all__ = [
 
     # Booking generation
     'generate_hotel_bookings',
+    'generate_hotel_booking_chunks',
+    'generate_booking_chunks',
+    'iter_hotel_bookings',
+    'iter_hotel_booking_columns',
+    'generate_room_booking_columns',
+    'booking_rows',
+    'derive_seed',
+    'get_guest_pool',
+    'GuestPool',
     'all_date_slots',
     'adjust_slots_forecast',
+    'date_slot_arrays',
+    'adjust_slot_arrays_occupancy',
+    'adjust_slot_arrays_forecast',
 
     # Query generation
     'HotelQueryGenerator',
@@ -67,5 +101,11 @@ __all__ = [
     'get_number_of_guests',
     'get_extra_bed',
     'get_meal_plan_prices',
-    'get_total_price'
+    'get_total_price',
+    'get_total_prices',
+    'get_peak_season_mask',
+    'get_cumulative_weight_table',
+    'sample_from_weight_table',
+    'get_meal_plan_table',
+    'sample_booking_attributes'
 ]
@@ -1,296 +1,331 @@
-"""Module for generating synthetic hotel booking data with realistic patterns and parameters."""
-
-from datetime import timedelta
+"""Module for generating synthetic hotel booking data with realistic patterns and parameters.
+
+The bookings of each room are generated as columns: slots are computed as
+date arrays, the booking attributes are drawn in batches with a numpy
+Generator and the prices are computed in one batch.
+
+Bookings are reproducible in two ways. Without a seed they are drawn from
+the module-level random, Faker and numpy state seeded below, so the output
+depends on the order in which the hotels are generated. With a master seed,
+that state is reseeded at the start of every room from (seed, hotel key,
+room id), so the bookings of a room depend only on those and hotels can be
+generated in any order, or in parallel worker processes
+(generate_booking_chunks), with byte-identical results.
+
+When the configuration has a guest_pool section, guests are taken from a
+pre-generated pool of identities (see guest_pool) instead of being created
+with Faker for every booking, and a share of each hotel's bookings is made
+by guests who already booked at the hotel.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
 import random
 import calendar
+import numpy as np
 import pandas as pd
 from faker import Faker
 from . import parametric_utils as ParUt
 from . import hotel_name_location_generator
+from .guest_pool import GuestPool
 
 # Name and entity generation
 fake = Faker()
 Faker.seed(42)
 random.seed(42)
+# Batch sampling of the booking attributes
+attributes_rng = np.random.default_rng(42)
 
-def calculate_slot_duration(slot_params: dict, current_date):
-    """
-    Calculate the duration of a slot based on the current slot count, weekend count, 
-    and the current date.
+# Fields of a booking record, in order
+BOOKING_FIELDS = (
+    "ReservationID", "ReservationDate", "Guest", "NumberOfGuests", "ExtraBed", "WorkTravel",
+    "CheckInDate", "CheckOutDate", "RoomAssigned", "RoomCategory", "RoomType", "MealPlan",
+    "FreeCancellation", "Promotion", "NonRefundable", "CancellationFee", "CancellationStatus",
+    "TotalPrice"
+)
 
-    Parameters:
-    - slot_params (dict): Dictionary containing slot parameters:
-        - week_count (int): The number of weeks that have been processed so far
-        - number_count (int): The total number of slots that have been processed so far
-        - weekend_count (int): The number of weekend slots that have been processed so far
-        - min_duration (int): The minimum possible duration for a slot
-        - max_duration (int): The maximum possible duration for a slot
-    - current_date (datetime): The current date for which the slot duration is being 
-      calculated
+# datetime64 day 0 (1970-01-01) is a Thursday
+EPOCH_WEEKDAY = 3
+FRIDAY = 4
 
-    Returns:
-    - int: The calculated duration for the slot
-
-    Logic:
-    - For the first 6 slots or if less than 1 week has been processed, the duration is chosen 
-      randomly between min_duration and max_duration.
-    - If the ratio of weekend slots to total weeks processed is greater than 1, the duration 
-      is chosen randomly between min_duration and max_duration.
-    - If the current date is before Friday, the duration is chosen randomly between 1 and 4 
-      days.
-    - If the current date is Friday, the duration is set to 3 days.
-    """
-    if slot_params['number_count'] < 6 or slot_params['week_count'] < 1:
-        slot_duration = random.randint(slot_params['min_duration'], slot_params['max_duration'])
-    else:
-        if (slot_params['weekend_count']/slot_params['week_count']) > 1:
-            slot_duration = random.randint(slot_params['min_duration'], slot_params['max_duration'])
-        else:
-            if current_date.weekday() < 4:  # Before Friday
-                slot_duration = random.randint(1, 4)
-            else:  # Friday
-                slot_duration = 3  # Duration of 3 days
-    return slot_duration
+# Hotels queued per worker process, so results are written while the next ones are generated
+HOTELS_QUEUED_PER_WORKER = 2
 
-def all_date_slots(start_date: pd.Timestamp,
-                end_date: pd.Timestamp,
-                min_slot: int = 1,
-                max_slot: int = 13):
+# bookings-db/, base of the relative paths of the configuration
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seed of the guest pool when the bookings are not seeded
+DEFAULT_GUEST_POOL_SEED = 42
+
+# Guest pools of this process by (size, seed); inherited by forked workers
+_guest_pools = {}
+
+def derive_seed(master_seed, *keys):
     """
-    Generate a list of date slots between start_date and end_date.
+    Derive a seed from a master seed and keys, stable across processes and runs.
+
+    Python's hash() of strings is randomized per process, so the seed is
+    taken from a SHA-256 digest instead.
 
     Parameters:
-    - start_date (pd.Timestamp): The start date for slot generation
-    - end_date (pd.Timestamp): The end date for slot generation
-    - min_slot (int): Minimum slot duration in days
-    - max_slot (int): Maximum slot duration in days
+    - master_seed (int): Master seed of the generation
+    - keys: Values identifying the stream (e.g. hotel key and room id)
 
     Returns:
-    - List[Tuple[pd.Timestamp, pd.Timestamp]]: List of (start, end) date tuples for each slot
+    - int: 64-bit seed
     """
-    current_date = start_date
-    slots = []
+    text = ":".join(str(part) for part in (master_seed, *keys))
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
 
-    slot_params = {
-        'week_count': 0,
-        'number_count': 0,
-        'weekend_count': 0,
-        'min_duration': min_slot,
-        'max_duration': max_slot
-    }
 
-    while current_date <= end_date:
-        max_possible_duration = min(max_slot, (end_date - current_date).days + 1)
-        slot_params['max_duration'] = max_possible_duration
+def seed_room_generators(master_seed, hotel, room):
+    """
+    Reseed the random and Faker state used by the generator for a room.
 
-        slot_duration = calculate_slot_duration(slot_params, current_date)
+    Parameters:
+    - master_seed (int): Master seed of the generation
+    - hotel (dict): Hotel information
+    - room (dict): Room information
 
-        slot_end = current_date + pd.Timedelta(days=slot_duration - 1)
+    Returns:
+    - np.random.Generator: Generator of the room's booking attributes
+    """
+    room_seed = derive_seed(master_seed, hotel["hotelkey"], room["RoomId"])
+    random.seed(room_seed)
+    fake.seed_instance(room_seed)
+    return np.random.default_rng(room_seed)
 
-        # Calculate slot end date
-        slot_end = min(slot_end, end_date)
+def date_slot_arrays(start_date, end_date, min_slot: int = 1, max_slot: int = 13):
+    """
+    Generate consecutive date slots covering start_date to end_date.
 
-        if current_date.weekday() == 4 and slot_duration == 1:
-            slot_params['weekend_count'] += 1
+    Each duration depends on the slots before it, so they are drawn one after
+    another, but on integer day numbers instead of timestamps:
+    - For the first 6 slots or if less than 1 week has been processed, or if
+      the ratio of Friday one-day slots to weeks processed is greater than 1,
+      the duration is chosen randomly between min_slot and max_slot.
+    - Otherwise, a slot starting before Friday lasts 1 to 4 days, and one
+      starting from Friday lasts 3 days.
 
-        slots.append((current_date, slot_end))
+    Parameters:
+    - start_date (pd.Timestamp): The start date for slot generation
+    - end_date (pd.Timestamp): The end date for slot generation
+    - min_slot (int): Minimum slot duration in days
+    - max_slot (int): Maximum slot duration in days
 
-        # Move to the next day after the current slot ends
-        current_date = slot_end + pd.Timedelta(days=1)
-        slot_params['number_count'] += 1
+    Returns:
+    - Tuple[np.ndarray, np.ndarray]: Start and end dates (datetime64[D]) of each slot
+    """
+    first_day = np.datetime64(start_date, 'D')
+    total_days = int((np.datetime64(end_date, 'D') - first_day).astype(np.int64)) + 1
+    first_weekday = int(_weekdays(first_day))
+
+    starts, ends = [], []
+    week_count = number_count = weekend_count = 0
+    day = 0
+    while day < total_days:
+        max_duration = min(max_slot, total_days - day)
+        weekday = (first_weekday + day) % 7
+        if number_count < 6 or week_count < 1 or weekend_count / week_count > 1:
+            duration = random.randint(min_slot, max_duration)
+        elif weekday < FRIDAY:
+            duration = random.randint(1, 4)
+        else:
+            duration = 3
 
-        # Calculate week count
-        days_since_start = (current_date - start_date).days + 1
-        slot_params['week_count'] += (days_since_start // 7) - slot_params['week_count']
+        end = min(day + duration - 1, total_days - 1)
+        if weekday == FRIDAY and duration == 1:
+            weekend_count += 1
+        starts.append(day)
+        ends.append(end)
 
-    # Verify if there are remaining days and add single-day slots to cover them
-    remaining_days = (end_date - current_date).days + 1
-    for _ in range(remaining_days):
-        slots.append((current_date, current_date))
-        current_date += pd.Timedelta(days=1)
+        # Move to the next day after the current slot ends
+        day = end + 1
+        number_count += 1
+        week_count = (day + 1) // 7
 
-    return slots
+    return first_day + np.array(starts, dtype=np.int64), first_day + np.array(ends, dtype=np.int64)
 
 
-def adjust_slots_occupancy(all_slots, peak_season_months, occupancy_peak, occupancy_offseason):
+def adjust_slot_arrays_occupancy(
+    starts, ends, peak_season_months, occupancy_peak, occupancy_offseason
+):
     """
-    Adjust slot occupancy based on peak and off-season parameters.
+    Remove slots from the months above their target occupancy.
+
+    Month totals, targets and weekend slots are computed with array operations;
+    only the months above target are visited, to remove random non-weekend
+    slots until the excess is covered (and one weekend slot off-season).
 
     Parameters:
-    - all_slots (List[Tuple[pd.Timestamp, pd.Timestamp]]): List of date slots
+    - starts, ends (np.ndarray): Start and end dates (datetime64[D]) of the slots, in
+      chronological order
     - peak_season_months (Tuple[str]): Months considered peak season
     - occupancy_peak (int): Target occupancy percentage for peak season
     - occupancy_offseason (int): Target occupancy percentage for off-season
 
     Returns:
-    - List[Tuple[pd.Timestamp, pd.Timestamp]]: Adjusted list of date slots
+    - Tuple[np.ndarray, np.ndarray]: Start and end dates of the remaining slots
     """
-    slots_by_month = get_slots_by_month(all_slots)
-    adjusted_slots = []
-
-    for month, slots in slots_by_month.items():
-        # Calculate month parameters
-        month_params = {
-            'year': int(month.split('-')[0]),
-            'month_num': int(month.split('-')[1]),
-            'is_peak': calendar.month_name[int(month.split('-')[1])] in peak_season_months,
-            'total_days': calendar.monthrange(int(month.split('-')[0]),
-                                              int(month.split('-')[1]))[1],
-            'current_days': sum((end - start).days + 1 for start, end in slots)
-        }
-        month_params['target_occupancy'] = (
-            occupancy_peak if month_params['is_peak'] else occupancy_offseason
-        )
-        month_params['target_days'] = int(
-            (month_params['target_occupancy'] / 100) * month_params['total_days']
-        )
-
-        if month_params['current_days'] > month_params['target_days']:
-            # Calculate excess days and slot types
-            excess_days = month_params['current_days'] - month_params['target_days']
-            slot_types = {
-                'non_weekend': [
-                    slot for slot in slots
-                    if not all(
-                        (slot[0] + timedelta(days=i)).weekday() in [4, 5, 6]
-                        for i in range((slot[1] - slot[0]).days + 1)
-                    )
-                ],
-                'weekend': [
-                    slot for slot in slots
-                    if all(
-                        (slot[0] + timedelta(days=i)).weekday() in [4, 5, 6]
-                        for i in range((slot[1] - slot[0]).days + 1)
-                    )
-                ]
-            }
-
-            # Remove slots to match target occupancy
-            while excess_days > 0 and slot_types['non_weekend']:
-                slot_to_remove = random.choice(slot_types['non_weekend'])
-                slot_types['non_weekend'].remove(slot_to_remove)
-                slots.remove(slot_to_remove)
-                excess_days -= (slot_to_remove[1] - slot_to_remove[0]).days + 1
-
-            if not month_params['is_peak'] and slot_types['weekend']:
-                slot_to_remove = random.choice(slot_types['weekend'])
-                slot_types['weekend'].remove(slot_to_remove)
-                slots.remove(slot_to_remove)
-
-        adjusted_slots.extend(slots)
-
-    return adjusted_slots
-
-
-def adjust_slots_forecast(all_slots, current_month, reduce_booking_list):
+    if not len(starts):
+        return starts, ends
+    lengths = (ends - starts).astype(np.int64) + 1
+    months = starts.astype('datetime64[M]')
+    month_first_slot = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    month_bounds = np.r_[month_first_slot, len(starts)]
+    slot_months = months[month_first_slot]
+
+    is_peak = np.array(
+        [calendar.month_name[number] in peak_season_months for number in range(13)]
+    )[slot_months.astype(np.int64) % 12 + 1]
+    days_in_month = (
+        (slot_months + 1).astype('datetime64[D]') - slot_months.astype('datetime64[D]')
+    ).astype(np.int64)
+    target_days = (
+        (np.where(is_peak, occupancy_peak, occupancy_offseason) / 100) * days_in_month
+    ).astype(np.int64)
+    current_days = np.add.reduceat(lengths, month_first_slot)
+
+    # Slots whose days all fall on Friday, Saturday or Sunday
+    weekdays = _weekdays(starts)
+    weekend = (weekdays >= FRIDAY) & (weekdays + lengths - 1 <= 6)
+
+    keep = np.ones(len(starts), dtype=bool)
+    for month in np.flatnonzero(current_days > target_days):
+        excess_days = int(current_days[month] - target_days[month])
+        slots = np.arange(month_bounds[month], month_bounds[month + 1])
+        non_weekend_slots = slots[~weekend[slots]].tolist()
+        weekend_slots = slots[weekend[slots]].tolist()
+
+        # Remove slots to match target occupancy
+        while excess_days > 0 and non_weekend_slots:
+            slot = random.choice(non_weekend_slots)
+            non_weekend_slots.remove(slot)
+            keep[slot] = False
+            excess_days -= int(lengths[slot])
+
+        if not is_peak[month] and weekend_slots:
+            keep[random.choice(weekend_slots)] = False
+
+    return starts[keep], ends[keep]
+
+
+def adjust_slot_arrays_forecast(starts, ends, current_month, reduce_booking_list):
     """
-    Adjust the slots to reduce the occupancy progressively starting from the current month.
+    Keep the slots up to the current month and a decreasing share of the following months.
 
     Parameters:
-    - all_slots (List[Tuple[pd.Timestamp, pd.Timestamp]]): List of slots.
-    - current_month (str): The current month in "YYYY-MM" format.
-    - reduce_booking_list (List[int]): List of reduction percentages for each month.
+    - starts, ends (np.ndarray): Start and end dates (datetime64[D]) of the slots, in
+      chronological order
+    - current_month (str): The current month in "YYYY-MM" format
+    - reduce_booking_list (List[int]): Reduction percentage for each month after the current one
 
     Returns:
-    - List[Tuple[pd.Timestamp, pd.Timestamp]]: Adjusted list of slots.
+    - Tuple[np.ndarray, np.ndarray]: Start and end dates of the remaining slots
     """
-    slots_by_month = get_slots_by_month(all_slots)
-    adjusted_slots, current_month_num, current_year = get_slots_till_current_month(current_month,
-                                                                                   slots_by_month)
-    adjust_future_slots(slots_by_month, adjusted_slots,
-                        current_month_num,
-                        current_year,
-                        reduce_booking_list)
-    return adjusted_slots
+    lengths = (ends - starts).astype(np.int64) + 1
+    months = starts.astype('datetime64[M]')
+    past = months <= np.datetime64(current_month, 'M')
+    adjusted_starts, adjusted_ends = [starts[past]], [ends[past]]
+
+    current_year, current_month_num = map(int, current_month.split('-'))
+    for i, reduction in enumerate(reduce_booking_list):
+        # Calculate month to adjust
+        year_to_adjust = current_year + (current_month_num + i - 1) // 12
+        month_to_adjust = (current_month_num + i) % 12 + 1
+        month = np.datetime64(f"{year_to_adjust:04d}-{month_to_adjust:02d}", 'M')
+        slots = np.flatnonzero(months == month)
+        if not len(slots):
+            continue
+
+        slot_lengths = lengths[slots]
+        target_days = int(int(slot_lengths.sum()) * (1 - (reduction / 100)))
+        if target_days <= 0:
+            continue
 
+        # Keep the first slots of the month until target_days, shortening the last one
+        days_before = np.cumsum(slot_lengths) - slot_lengths
+        kept = days_before < target_days
+        kept_lengths = np.minimum(slot_lengths[kept], target_days - days_before[kept])
+        adjusted_starts.append(starts[slots[kept]])
+        adjusted_ends.append(starts[slots[kept]] + (kept_lengths - 1))
 
-def get_slots_by_month(all_slots):
+    return np.concatenate(adjusted_starts), np.concatenate(adjusted_ends)
+
+
+def _weekdays(days):
+    """Weekday (Monday is 0) of datetime64[D] values."""
+    return (days.astype('datetime64[D]').astype(np.int64) + EPOCH_WEEKDAY) % 7
+
+
+def _slot_arrays(slots):
+    """Convert a list of (start, end) timestamps to start and end datetime64[D] arrays."""
+    return (np.array([start for start, _ in slots], dtype='datetime64[D]'),
+            np.array([end for _, end in slots], dtype='datetime64[D]'))
+
+
+def _slot_list(starts, ends):
+    """Convert start and end datetime64[D] arrays to a list of (start, end) timestamps."""
+    return [
+        (pd.Timestamp(start), pd.Timestamp(end)) for start, end in zip(starts, ends, strict=True)
+    ]
+
+
+def all_date_slots(start_date: pd.Timestamp,
+                end_date: pd.Timestamp,
+                min_slot: int = 1,
+                max_slot: int = 13):
     """
-    Group slots by month.
+    Generate a list of date slots between start_date and end_date.
 
     Parameters:
-    - all_slots (List[Tuple[pd.Timestamp, pd.Timestamp]]): List of date slots
+    - start_date (pd.Timestamp): The start date for slot generation
+    - end_date (pd.Timestamp): The end date for slot generation
+    - min_slot (int): Minimum slot duration in days
+    - max_slot (int): Maximum slot duration in days
+
+    Returns:
+    - List[Tuple[pd.Timestamp, pd.Timestamp]]: List of (start, end) date tuples for each slot
     """
-    slots_by_month = {}
-    for start, end in all_slots:
-        month = start.strftime("%Y-%m")
-        if month not in slots_by_month:
-            slots_by_month[month] = []
-        slots_by_month[month].append((start, end))
-    return slots_by_month
+    return _slot_list(*date_slot_arrays(start_date, end_date, min_slot, max_slot))
 
 
-def get_slots_till_current_month(current_month, slots_by_month):
+def adjust_slots_occupancy(all_slots, peak_season_months, occupancy_peak, occupancy_offseason):
     """
-    Get slots from months before and including the current month.
+    Adjust slot occupancy based on peak and off-season parameters.
 
     Parameters:
-    - current_month (str): The current month in "YYYY-MM" format
-    - slots_by_month (Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]): 
-        Dictionary of slots grouped by month
+    - all_slots (List[Tuple[pd.Timestamp, pd.Timestamp]]): List of date slots
+    - peak_season_months (Tuple[str]): Months considered peak season
+    - occupancy_peak (int): Target occupancy percentage for peak season
+    - occupancy_offseason (int): Target occupancy percentage for off-season
 
     Returns:
-    - List[Tuple[pd.Timestamp, pd.Timestamp]]: List of slots from months before
-        and including the current month
-    - int: Current month number
-    - int: Current year
+    - List[Tuple[pd.Timestamp, pd.Timestamp]]: Adjusted list of date slots
     """
-    adjusted_slots = []
-    current_year, current_month_num = map(int, current_month.split('-'))
-    # Add slots from months before and including the current month
-    for month, slots in slots_by_month.items():
-        year, month_num = map(int, month.split('-'))
-        if year < current_year or (year == current_year and month_num <= current_month_num):
-            adjusted_slots.extend(slots)
-    return adjusted_slots, current_month_num, current_year
+    starts, ends = _slot_arrays(all_slots)
+    return _slot_list(*adjust_slot_arrays_occupancy(starts, ends, peak_season_months,
+                                                    occupancy_peak, occupancy_offseason))
 
-def adjust_future_slots(slots_by_month,
-                        adjusted_slots,
-                        current_month_num,
-                        current_year,
-                        reduce_booking_list):
+
+def adjust_slots_forecast(all_slots, current_month, reduce_booking_list):
     """
-    Adjust future slots based on the reduction percentage for each month.
+    Adjust the slots to reduce the occupancy progressively starting from the current month.
 
     Parameters:
-    - slots_by_month (Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]): 
-        Dictionary of slots grouped by month
-    - adjusted_slots (List[Tuple[pd.Timestamp, pd.Timestamp]]): List of adjusted slots
-    - current_month_num (int): Current month number
-    - current_year (int): Current year
-    - reduce_booking_list (List[int]): List of reduction percentages for each month
+    - all_slots (List[Tuple[pd.Timestamp, pd.Timestamp]]): List of slots.
+    - current_month (str): The current month in "YYYY-MM" format.
+    - reduce_booking_list (List[int]): List of reduction percentages for each month.
+
+    Returns:
+    - List[Tuple[pd.Timestamp, pd.Timestamp]]: Adjusted list of slots.
     """
-    for i, reduction in enumerate(reduce_booking_list):
-        # Calculate month to adjust
-        year_to_adjust = current_year + (current_month_num + i - 1) // 12
-        month_to_adjust = (current_month_num + i) % 12 + 1
-        month_params = {
-            'month': month_to_adjust,
-            'year': year_to_adjust,
-            'str': f"{year_to_adjust:04d}-{month_to_adjust:02d}"
-        }
-
-        if month_params['str'] in slots_by_month:
-            slots = slots_by_month[month_params['str']]
-            total_days = sum((end - start).days + 1 for start, end in slots)
-            slot_stats = {
-                'total_days': total_days,
-                'target_days': int(total_days * (1 - (reduction / 100))),
-                'current_days': 0
-            }
-
-            if slot_stats['target_days'] <= 0:
-                continue
-
-            for slot in slots:
-                if slot_stats['current_days'] >= slot_stats['target_days']:
-                    break
-                slot_days = (slot[1] - slot[0]).days + 1
-                if slot_stats['current_days'] + slot_days > slot_stats['target_days']:
-                    slot_days = slot_stats['target_days'] - slot_stats['current_days']
-                    slot = (slot[0], slot[0] + pd.Timedelta(days=slot_days - 1))
-                adjusted_slots.append(slot)
-                slot_stats['current_days'] += slot_days
+    starts, ends = _slot_arrays(all_slots)
+    return _slot_list(
+        *adjust_slot_arrays_forecast(starts, ends, current_month, reduce_booking_list)
+    )
 
 def _generate_guest_info():
     """Generate guest information."""
@@ -307,116 +342,117 @@ def _generate_guest_info():
         "Phone": fake.phone_number()
     }
 
-def _generate_booking_params(room, check_in_date):
-    """Generate booking parameters."""
-    params = {
-        'six_months_before': check_in_date - timedelta(days=6 * 30),
-        'room_type_guests': room["Guests"],
-        'non_refundable': ParUt.get_non_refundable(),
-        'extra_bed': ParUt.get_extra_bed(room["Guests"]),
-        'number_of_guests': ParUt.get_number_of_guests(room["Guests"])
-    }
-    if params['extra_bed'] == "Yes":
-        params['number_of_guests'] += 1
-    return params
-
-def _create_booking_dict(booking_data: dict):
+def get_guest_pool(config, seed=None):
     """
-    Create the complete booking dictionary.
+    Get the guest pool of the configuration, loading or generating it once per process.
 
     Parameters:
-    - booking_data (dict): Dictionary containing booking information:
-        - guest (dict): Guest information
-        - params (dict): Booking parameters
-        - room (dict): Room information
-        - check_in_date (pd.Timestamp): Check-in date
-        - check_out_date (pd.Timestamp): Check-out date
-        - synthetic_params (dict): Synthetic parameters
+    - config (dict): Configuration
+    - seed (int): Master seed of the bookings, also used as the seed of the pool
 
     Returns:
-    - dict: Complete booking dictionary
+    - GuestPool: The guest pool, or None if the configuration has no guest_pool section
     """
-    return {
-        "ReservationID": str(random.randint(1, 999999)).zfill(6),
-        "ReservationDate": fake.date_time_between_dates(
-            booking_data['params']['six_months_before'],
-            booking_data['check_in_date']
-        ).strftime("%Y-%m-%d"),
-        "Guest": booking_data['guest'],
-        "NumberOfGuests": booking_data['params']['number_of_guests'],
-        "ExtraBed": booking_data['params']['extra_bed'],
-        "WorkTravel": ParUt.get_work_travel(),
-        "CheckInDate": booking_data['check_in_date'].strftime("%Y-%m-%d"),
-        "CheckOutDate": booking_data['check_out_date'].strftime("%Y-%m-%d"),
-        "RoomAssigned": booking_data['room']["RoomId"],
-        "RoomCategory": booking_data['room']["Category"],
-        "RoomType": booking_data['room']["Type"],
-        "MealPlan": ParUt.get_meal_plan(booking_data['synthetic_params']["MealPlanWeights"]),
-        "FreeCancellation": ParUt.get_free_cancellation(),
-        "Promotion": ParUt.get_promotion(),
-        "NonRefundable": booking_data['params']['non_refundable'],
-        "CancellationFee": ParUt.get_cancellation_fee(booking_data['params']['non_refundable']),
-        "CancellationStatus": ParUt.get_cancellation_status()
-    }
+    pool_config = config.get("guest_pool")
+    if not pool_config:
+        return None
+    pool_seed = seed if seed is not None else DEFAULT_GUEST_POOL_SEED
+    key = (pool_config["size"], pool_seed)
+    if key not in _guest_pools:
+        cache_dir = pool_config.get("cache_dir")
+        if cache_dir and not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(PROJECT_ROOT, cache_dir)
+        location_generator = hotel_name_location_generator.HotelNameLocationGenerator()
+        guest_locations = location_generator.get_guest_locations()
+        _guest_pools[key] = GuestPool.load_or_generate(
+            pool_config["size"], pool_seed, guest_locations, cache_dir
+        )
+    return _guest_pools[key]
 
-def generate_booking(room, check_in_date, check_out_date, synthetic_params, config):
+def generate_room_booking_columns(room, starts, ends, synthetic_params, config, rng, guests=None):
     """
-    Generate a synthetic booking record.
+    Generate the bookings of a room's slots as columns.
+
+    Attributes, reservation ids and reservation dates are drawn for all the
+    bookings at once with a numpy Generator and the bookings are priced in
+    one batch. Guests not given are generated one at a time, with Faker.
 
     Parameters:
     - room (dict): Room information
-    - check_in_date (pd.Timestamp): Check-in date
-    - check_out_date (pd.Timestamp): Check-out date
-    - synthetic_params (dict): Synthetic parameters
+    - starts, ends (np.ndarray): Check-in and check-out dates (datetime64[D]) of the bookings
+    - synthetic_params (dict): Synthetic parameters of the hotel
     - config (dict): Configuration
+    - rng (np.random.Generator): Random generator of the booking attributes
+    - guests (list): Guest of each booking (e.g. taken from a GuestPool)
 
     Returns:
-    - dict: Synthetic booking record
-    """
-    # Generate guest information and booking parameters
-    guest = _generate_guest_info()
-    params = _generate_booking_params(room, check_in_date)
-
-    # Create booking dictionary
-    booking_data = {
-        'guest': guest,
-        'params': params,
-        'room': room,
-        'check_in_date': check_in_date,
-        'check_out_date': check_out_date,
-        'synthetic_params': synthetic_params
+    - dict: Column of values for each of BOOKING_FIELDS
+    """
+    size = len(starts)
+    attributes = ParUt.sample_booking_attributes(
+        rng, size, room["Guests"], ParUt.get_meal_plan_table(synthetic_params["MealPlanWeights"])
+    )
+
+    # Reservations are made at any time in the six months before check-in
+    reservation_window = np.timedelta64(6 * 30, 'D')
+    reservation_dates = (starts - reservation_window).astype('datetime64[s]') + rng.integers(
+        0, reservation_window.astype('timedelta64[s]').astype(np.int64), size, endpoint=True
+    ).astype('timedelta64[s]')
+
+    columns = {
+        "ReservationID": [
+            str(number).zfill(6)
+            for number in rng.integers(1, 999999, size, endpoint=True).tolist()
+        ],
+        "ReservationDate": np.datetime_as_string(reservation_dates, unit='D').tolist(),
+        "Guest": guests if guests is not None else [_generate_guest_info() for _ in range(size)],
+        "NumberOfGuests": attributes["NumberOfGuests"],
+        "ExtraBed": attributes["ExtraBed"],
+        "WorkTravel": attributes["WorkTravel"],
+        "CheckInDate": np.datetime_as_string(starts, unit='D').tolist(),
+        "CheckOutDate": np.datetime_as_string(ends, unit='D').tolist(),
+        "RoomAssigned": [room["RoomId"]] * size,
+        "RoomCategory": [room["Category"]] * size,
+        "RoomType": [room["Type"]] * size,
+        "MealPlan": attributes["MealPlan"],
+        "FreeCancellation": attributes["FreeCancellation"],
+        "Promotion": attributes["Promotion"],
+        "NonRefundable": attributes["NonRefundable"],
+        "CancellationFee": attributes["CancellationFee"],
+        "CancellationStatus": attributes["CancellationStatus"],
     }
-    booking = _create_booking_dict(booking_data)
 
-    # Calculate and add total price
-    booking["TotalPrice"] = ParUt.get_total_price(
-        booking,  # Use the booking dictionary directly
-        room,
+    # Price all the bookings of the room at once
+    columns["TotalPrice"] = ParUt.get_total_prices(
+        {
+            "CheckInDate": starts,
+            "CheckOutDate": ends,
+            "NumberOfGuests": columns["NumberOfGuests"],
+            "ExtraBed": columns["ExtraBed"],
+            "MealPlan": columns["MealPlan"],
+            "Promotion": columns["Promotion"],
+            "PriceOffSeason": [room["PriceOffSeason"]] * size,
+            "PricePeakSeason": [room["PricePeakSeason"]] * size,
+            "Type": columns["RoomType"]
+        },
         config["peak_season_months"],
         synthetic_params
     )
+    return columns
 
-    return booking
 
-
-def generate_hotel_bookings(hotel, config):
+def iter_hotel_booking_columns(hotel, config, seed=None):
     """
-    Generate synthetic hotel bookings for a given hotel.
+    Generate the synthetic bookings of a hotel as columns, one room at a time.
 
     Parameters:
     - hotel (dict): Hotel information
     - config (dict): Configuration
+    - seed (int): Master seed; if given, each room is generated from its own seed
 
-    Returns:
-    - dict: Synthetic hotel bookings list
+    Yields:
+    - dict: Columns of the bookings of a room (see generate_room_booking_columns)
     """
-    # Initialize hotel bookings list
-    hotel_bookings_list = {
-        "HotelKey": hotel["hotelkey"],
-        "HotelName": hotel["Name"],
-        "Bookings": []
-    }
-
     # Extract configuration parameters
     booking_config = {
         'synthetic_params': hotel["SyntheticParams"],
@@ -433,34 +469,222 @@ def generate_hotel_bookings(hotel, config):
         'end': pd.Timestamp(year=booking_config['end_year'], month=12, day=31)
     }
 
+    # Guests come from the guest pool, if configured; returning guests are
+    # drawn from the hotel's previous guests
+    guest_pool = get_guest_pool(config, seed)
+    repeat_guest_rate = (
+        config["guest_pool"].get("repeat_guest_rate", 0.0) if guest_pool is not None else 0.0
+    )
+    hotel_guests = np.empty(0, dtype=np.int64)
+
     # Process each room
     for room in hotel["Rooms"]:
-        # Generate and adjust slots
-        all_slots = all_date_slots(date_range['start'], date_range['end'])
+        room_rng = seed_room_generators(seed, hotel, room) if seed is not None else attributes_rng
+
+        # Generate and adjust slots, as start and end date arrays
+        starts, ends = date_slot_arrays(date_range['start'], date_range['end'])
 
-        adjusted_slots = adjust_slots_occupancy(
-            all_slots,
+        starts, ends = adjust_slot_arrays_occupancy(
+            starts,
+            ends,
             booking_config['peak_season_months'],
             booking_config['synthetic_params']["OccupancyPeakSeasonWeight"],
             booking_config['synthetic_params']["OccupancyOffSeasonWeight"]
         )
 
-        forecast_adjust_slots = adjust_slots_forecast(
-            adjusted_slots,
+        starts, ends = adjust_slot_arrays_forecast(
+            starts,
+            ends,
             booking_config['current_month'],
             booking_config['forecast_reduction']
         )
 
-        # Generate bookings for each slot
-        for slot in forecast_adjust_slots:
-            check_in_date, check_out_date = slot
-            booking = generate_booking(
-                room,
-                check_in_date,
-                check_out_date,
-                hotel["SyntheticParams"],
-                config
+        guests = None
+        if guest_pool is not None:
+            guest_indices = guest_pool.sample(
+                room_rng, len(starts), hotel_guests, repeat_guest_rate
             )
-            hotel_bookings_list["Bookings"].append(booking)
+            hotel_guests = np.concatenate([hotel_guests, guest_indices])
+            guests = guest_pool.guests(guest_indices)
+
+        yield generate_room_booking_columns(
+            room, starts, ends, booking_config['synthetic_params'], config, room_rng, guests
+        )
+
+
+def iter_hotel_bookings(hotel, config, seed=None):
+    """
+    Generate the synthetic bookings of a hotel as booking records.
+
+    The records are the rows of iter_hotel_booking_columns, room after room
+    in the order of hotel["Rooms"] and in check-in order within a room. Only
+    the columns of one room are held in memory at a time.
+
+    Without a seed, the bookings are drawn from the module-level random, Faker
+    and numpy state, so they depend on the hotels generated before. With a
+    seed, each room is drawn from its own seed, derived from (seed, hotel key,
+    room id), so the bookings only depend on those.
+
+    Parameters:
+    - hotel (dict): Hotel information
+    - config (dict): Configuration
+    - seed (int): Master seed, or None to use the module-level random state
+
+    Yields:
+    - dict: Booking record with the fields of BOOKING_FIELDS
+    """
+    for columns in iter_hotel_booking_columns(hotel, config, seed):
+        yield from booking_rows(columns)
+
+
+def booking_rows(columns):
+    """
+    Build the booking records of booking columns.
+
+    Parameters:
+    - columns (dict): One list per field of BOOKING_FIELDS
 
-    return hotel_bookings_list
+    Returns:
+    - list: A booking dictionary per row, with the fields in BOOKING_FIELDS order
+    """
+    rows = zip(*(columns[field] for field in BOOKING_FIELDS), strict=True)
+    return [dict(zip(BOOKING_FIELDS, values, strict=True)) for values in rows]
+
+
+def _booking_chunk(hotel, columns):
+    """Build a chunk of the bookings of a hotel from its columns."""
+    return {"HotelKey": hotel["hotelkey"], "HotelName": hotel["Name"], "Columns": columns}
+
+
+def _chunk_hotel_columns(hotel, room_columns, chunk_size):
+    """Group the booking columns of a hotel's rooms into chunks of up to chunk_size bookings.
+
+    A hotel always produces at least one chunk, which is empty if it has no bookings.
+    """
+    chunk = {field: [] for field in BOOKING_FIELDS}
+    chunk_rows = 0
+    emitted = False
+    for columns in room_columns:
+        size = len(columns["ReservationID"])
+        start = 0
+        while start < size:
+            end = min(size, start + chunk_size - chunk_rows)
+            for field in BOOKING_FIELDS:
+                chunk[field].extend(columns[field][start:end])
+            chunk_rows += end - start
+            start = end
+            if chunk_rows >= chunk_size:
+                yield _booking_chunk(hotel, chunk)
+                chunk = {field: [] for field in BOOKING_FIELDS}
+                chunk_rows = 0
+                emitted = True
+    if chunk_rows or not emitted:
+        yield _booking_chunk(hotel, chunk)
+
+
+def generate_hotel_booking_chunks(hotel, config, chunk_size, seed=None):
+    """
+    Generate the synthetic bookings of a hotel in chunks of bounded size.
+
+    Each chunk holds the bookings as columns (one list per field of
+    BOOKING_FIELDS), so the columnar writers can convert them to Arrow
+    without building a dictionary per booking; booking_rows builds the
+    records for the writers that need them. A hotel always produces at
+    least one chunk, which is empty if it has no bookings.
+
+    Parameters:
+    - hotel (dict): Hotel information
+    - config (dict): Configuration
+    - chunk_size (int): Maximum number of bookings per chunk
+    - seed (int): Master seed; if given, each room is generated from its own seed
+
+    Yields:
+    - dict: Hotel key, hotel name and the columns of up to chunk_size bookings
+    """
+    yield from _chunk_hotel_columns(
+        hotel, iter_hotel_booking_columns(hotel, config, seed), chunk_size
+    )
+
+
+def _init_booking_worker():
+    """Load the guest locations in a worker process (needed when it is not forked)."""
+    hotel_name_location_generator.HotelNameLocationGenerator(
+        base_path=os.path.join(PROJECT_ROOT, "config"),
+        config_filename="hotel_naming_location.yaml"
+    )
+
+
+def _generate_seeded_hotel_booking_columns(hotel, config, seed):
+    """Generate the booking columns of a hotel's rooms in a worker process."""
+    return list(iter_hotel_booking_columns(hotel, config, seed))
+
+
+def generate_booking_chunks(hotels, config, chunk_size, seed=None, workers=1):
+    """
+    Generate the synthetic bookings of several hotels in chunks, in hotel order.
+
+    With more than one worker, the hotels are generated in a process pool
+    (a few hotels ahead of the one being consumed) and their bookings are
+    yielded in the original hotel order. Each room is then generated from
+    its own seed, so the output for a given seed is the same whatever the
+    number of workers.
+
+    Parameters:
+    - hotels (list): Hotels to generate bookings for
+    - config (dict): Configuration
+    - chunk_size (int): Maximum number of bookings per chunk
+    - seed (int): Master seed (required with more than one worker)
+    - workers (int): Number of worker processes
+
+    Yields:
+    - dict: Hotel key, hotel name and the columns of up to chunk_size bookings
+      (see generate_hotel_booking_chunks)
+    """
+    if workers <= 1:
+        for hotel in hotels:
+            yield from generate_hotel_booking_chunks(hotel, config, chunk_size, seed)
+        return
+    if seed is None:
+        raise ValueError("Parallel booking generation requires a seed")
+
+    # Build (or load) the guest pool before starting the workers, which inherit it
+    # when forked and otherwise load it from the cache written here
+    get_guest_pool(config, seed)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_booking_worker) as executor:
+        hotels_to_submit = iter(hotels)
+        pending = deque()
+
+        def submit_next():
+            hotel = next(hotels_to_submit, None)
+            if hotel is not None:
+                future = executor.submit(
+                    _generate_seeded_hotel_booking_columns, hotel, config, seed
+                )
+                pending.append((hotel, future))
+
+        for _ in range(workers * HOTELS_QUEUED_PER_WORKER):
+            submit_next()
+        while pending:
+            hotel, future = pending.popleft()
+            room_columns = future.result()
+            submit_next()
+            yield from _chunk_hotel_columns(hotel, room_columns, chunk_size)
+
+
+def generate_hotel_bookings(hotel, config):
+    """
+    Generate synthetic hotel bookings for a given hotel.
+
+    Parameters:
+    - hotel (dict): Hotel information
+    - config (dict): Configuration
+
+    Returns:
+    - dict: Synthetic hotel bookings list
+    """
+    return {
+        "HotelKey": hotel["hotelkey"],
+        "HotelName": hotel["Name"],
+        "Bookings": list(iter_hotel_bookings(hotel, config))
+    }
@@ -2,7 +2,7 @@
 
 import os
 import random
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import yaml
 from faker import Faker
@@ -24,6 +24,7 @@ class HotelNameLocationGenerator:
         if not hasattr(self, 'initialized'):
             self._state = {
                 'current_hotel_index': 0,
+                'existing_names': set(),
                 'existing_keys': set(),
                 'existing_addresses': set()
             }
@@ -52,11 +53,11 @@ class HotelNameLocationGenerator:
             with open(file_path, 'r', encoding='utf-8') as file:
                 config = yaml.safe_load(file)
 
-                # hotel names
-                name_list = [
+                # hotel names, without repetitions
+                name_list = list(dict.fromkeys(
                     name for name in config.get('hotel_names', [])
                     if "'" not in name
-                ]
+                ))
                 self._hotel_names = name_list
                 # hotel countries
                 self._hotel_locations = config.get('hotel_location', [])
@@ -76,17 +77,25 @@ class HotelNameLocationGenerator:
         """
         Generate a unique hotel name.
 
+        Names are taken in the order of the configuration; once all of them
+        are used, they are reused with a number (e.g. "Seraphina Hotel 2"),
+        as the bookings database and datasets key hotels by name.
+
         Returns:
             Optional[str]: A hotel name or None if no names are available
         """
         if not self._hotel_names:
             return None
 
-        hotel_name = self._hotel_names[self._state['current_hotel_index']]
-        self._state['current_hotel_index'] = (
-            self._state['current_hotel_index'] + 1
-        ) % len(self._hotel_names)
-        return hotel_name
+        while True:
+            cycle, position = divmod(self._state['current_hotel_index'], len(self._hotel_names))
+            self._state['current_hotel_index'] += 1
+            hotel_name = self._hotel_names[position]
+            if cycle:
+                hotel_name = f"{hotel_name} {cycle + 1}"
+            if hotel_name not in self._state['existing_names']:
+                self._state['existing_names'].add(hotel_name)
+                return hotel_name
 
     def generate_hotel_key(self) -> str:
         """
@@ -143,3 +152,12 @@ class HotelNameLocationGenerator:
         country = random.choice(list(self._guest_locations.keys()))
         city = random.choice(self._guest_locations[country])
         return country, city
+
+    def get_guest_locations(self) -> Dict[str, List[str]]:
+        """
+        Get the guest locations of the configuration.
+
+        Returns:
+            Dict[str, List[str]]: Cities of the guests by country
+        """
+        return self._guest_locations
@@ -1,9 +1,27 @@
 """Utility functions for generating parametric hotel and booking data."""
 
+import calendar
 import random
 
+import numpy as np
 import pandas as pd
 
+# Guests of each room type name, used to apply the occupancy discount
+ROOM_CAPACITY = {"Single": 1, "Double": 2, "Triple": 3}
+
+# Values and weights of the booking attributes
+BOOKING_ATTRIBUTE_WEIGHTS = {
+    "WorkTravel": (("Yes", "No"), (30, 70)),
+    "FreeCancellation": (("Yes", "No"), (40, 60)),
+    "Promotion": (("Yes", "No"), (20, 80)),
+    "NonRefundable": (("Yes", "No"), (30, 70)),
+    "CancellationFee": (("15%", "25%", "35%"), (20, 50, 30)),
+    "CancellationStatus": (("Cancelled", "Active"), (5, 95)),
+}
+# Number of guests and extra bed by room type (1=single, 2=double, 3=triple)
+NUMBER_OF_GUESTS_WEIGHTS = {2: ((1, 2), (10, 90)), 3: ((2, 3), (10, 70))}
+EXTRA_BED_WEIGHTS = (("Yes", "No"), (5, 95))
+
 
 def get_rooms_floors(config):
     """
@@ -257,7 +275,7 @@ def get_hotel_mealplan_weight(config):
 
     # Normalizar los pesos para que sumen 1
     total_weight = sum(plan_data['weight'] for plan_data in pesos.values())
-    for plan, plan_data in pesos.items():
+    for plan_data in pesos.values():
         plan_data['weight'] = round(plan_data['weight'] / total_weight, 2)
 
     # Ajuste final (iterativo para evitar pesos negativos)
@@ -277,7 +295,7 @@ def get_hotel_mealplan_weight(config):
             )  # Rango 0-1
         else:
             # Distribuir la diferencia proporcionalmente (sin pesos negativos)
-            for plan, plan_data in pesos.items():
+            for plan_data in pesos.values():
                 plan_data['weight'] += difference / len(pesos)
                 plan_data['weight'] = max(
                     0.0, min(1.0, float(plan_data['weight']))
@@ -318,7 +336,8 @@ def get_work_travel():
     Returns:
         str: "Yes" or "No"
     """
-    return random.choices(["Yes", "No"], weights=[30, 70], k=1)[0]
+    values, weights = BOOKING_ATTRIBUTE_WEIGHTS["WorkTravel"]
+    return random.choices(values, weights=weights, k=1)[0]
 
 
 def get_free_cancellation():
@@ -328,7 +347,8 @@ def get_free_cancellation():
     Returns:
         str: "Yes" or "No"
     """
-    return random.choices(["Yes", "No"], weights=[40, 60], k=1)[0]
+    values, weights = BOOKING_ATTRIBUTE_WEIGHTS["FreeCancellation"]
+    return random.choices(values, weights=weights, k=1)[0]
 
 
 def get_promotion():
@@ -338,7 +358,8 @@ def get_promotion():
     Returns:
         str: "Yes" or "No"
     """
-    return random.choices(["Yes", "No"], weights=[20, 80], k=1)[0]
+    values, weights = BOOKING_ATTRIBUTE_WEIGHTS["Promotion"]
+    return random.choices(values, weights=weights, k=1)[0]
 
 
 def get_non_refundable():
@@ -348,7 +369,8 @@ def get_non_refundable():
     Returns:
         str: "Yes" or "No"
     """
-    return random.choices(["Yes", "No"], weights=[30, 70], k=1)[0]
+    values, weights = BOOKING_ATTRIBUTE_WEIGHTS["NonRefundable"]
+    return random.choices(values, weights=weights, k=1)[0]
 
 
 def get_cancellation_fee(non_refundable):
@@ -363,7 +385,8 @@ def get_cancellation_fee(non_refundable):
     """
     if non_refundable == "Yes":
         return "N/A"
-    return random.choices(["15%", "25%", "35%"], weights=[20, 50, 30], k=1)[0]
+    values, weights = BOOKING_ATTRIBUTE_WEIGHTS["CancellationFee"]
+    return random.choices(values, weights=weights, k=1)[0]
 
 
 def get_cancellation_status():
@@ -373,7 +396,8 @@ def get_cancellation_status():
     Returns:
         str: "Cancelled" or "Active"
     """
-    return random.choices(["Cancelled", "Active"], weights=[5, 95], k=1)[0]
+    values, weights = BOOKING_ATTRIBUTE_WEIGHTS["CancellationStatus"]
+    return random.choices(values, weights=weights, k=1)[0]
 
 
 def get_number_of_guests(room_type):
@@ -388,10 +412,9 @@ def get_number_of_guests(room_type):
     """
     if room_type == 1:
         return 1
-    if room_type == 2:
-        return random.choices([1, 2], weights=[10, 90], k=1)[0]
-    if room_type == 3:
-        return random.choices([2, 3], weights=[10, 70], k=1)[0]
+    if room_type in NUMBER_OF_GUESTS_WEIGHTS:
+        values, weights = NUMBER_OF_GUESTS_WEIGHTS[room_type]
+        return random.choices(values, weights=weights, k=1)[0]
 
     # Default return if room_type is invalid
     return 1  # Return 1 guest as default
@@ -409,10 +432,9 @@ def get_extra_bed(room_type):
     """
     if room_type == 1:
         return "N/A"
-    if room_type == 2:
-        return random.choices(["Yes", "No"], weights=[5, 95], k=1)[0]
-    if room_type == 3:
-        return random.choices(["Yes", "No"], weights=[5, 95], k=1)[0]
+    if room_type in (2, 3):
+        values, weights = EXTRA_BED_WEIGHTS
+        return random.choices(values, weights=weights, k=1)[0]
 
     # Default return if room_type is invalid
     return "No"  # Return "No" as default
@@ -501,3 +523,221 @@ def get_total_price(booking, room, peak_season_months, hotel_synthetic_params):
         total_price *= (1 - (hotel_synthetic_params["PromotionPriceDiscount"] / 100))
 
     return round(total_price, 2)
+
+
+def get_peak_season_mask(first_day, last_day, peak_season_months):
+    """
+    Flag the days of a date range that fall in a peak season month.
+
+    Args:
+        first_day (np.datetime64): First day of the range
+        last_day (np.datetime64): Last day of the range (included)
+        peak_season_months (list): List of peak season months
+
+    Returns:
+        np.ndarray: One boolean per day of the range
+    """
+    days = np.arange(np.datetime64(first_day, 'D'), np.datetime64(last_day, 'D') + 1)
+    is_peak_month = np.array(
+        [calendar.month_name[number] in peak_season_months for number in range(13)]
+    )
+    return is_peak_month[days.astype('datetime64[M]').astype(np.int64) % 12 + 1]
+
+
+def get_total_prices(bookings, peak_season_months, hotel_synthetic_params):
+    """
+    Calculate the total price of many bookings at once.
+
+    Gives the same prices as get_total_price: the nightly peak and off-season
+    prices of each booking are adjusted with the same operations in the same
+    order, each night is priced from a peak-season mask of the days covered
+    by the bookings, and the nights of each booking are added with a
+    cumulative sum, which adds them one by one as the per-booking loop does
+    (a count-based closed form can differ in the last bits of a total, which
+    may change its rounding).
+
+    Args:
+        bookings (dict): Columns of the bookings, as sequences of equal length:
+            CheckInDate, CheckOutDate ('YYYY-MM-DD' or datetime64),
+            NumberOfGuests, ExtraBed, MealPlan, Promotion, and the room's
+            PriceOffSeason, PricePeakSeason and Type
+        peak_season_months (list): List of peak season months
+        hotel_synthetic_params (dict): Hotel parameters
+
+    Returns:
+        list: Total price of each booking
+    """
+    check_in = np.asarray(bookings["CheckInDate"], dtype='datetime64[D]')
+    check_out = np.asarray(bookings["CheckOutDate"], dtype='datetime64[D]')
+    if not len(check_in):
+        return []
+
+    base_off = np.asarray(bookings["PriceOffSeason"], dtype=np.float64)
+    base_peak = np.asarray(bookings["PricePeakSeason"], dtype=np.float64)
+
+    # Apply occupancy discount
+    occupancy_discount = 1 - (hotel_synthetic_params["OccupancyBaseDiscountPercentage"] / 100)
+    room_capacity = np.array([ROOM_CAPACITY.get(room_type, 0) for room_type in bookings["Type"]])
+    discounted = np.asarray(bookings["NumberOfGuests"]) < room_capacity
+    base_off = np.where(discounted, base_off * occupancy_discount, base_off)
+    base_peak = np.where(discounted, base_peak * occupancy_discount, base_peak)
+
+    # Apply extra bed increase
+    extra_bed_increase = 1 + (hotel_synthetic_params["ExtraBedChargePercentage"] / 100)
+    extra_bed = np.asarray(bookings["ExtraBed"]) == "Yes"
+    base_off = np.where(extra_bed, base_off * extra_bed_increase, base_off)
+    base_peak = np.where(extra_bed, base_peak * extra_bed_increase, base_peak)
+
+    # Apply meal plan increase
+    meal_plan_prices = hotel_synthetic_params["MealPlanPrices"]
+    meal_plan_increase = np.array(
+        [meal_plan_prices[meal_plan] for meal_plan in bookings["MealPlan"]], dtype=np.float64
+    )
+    base_off = base_off * meal_plan_increase
+    base_peak = base_peak * meal_plan_increase
+
+    # Price every night (bookings x longest stay, unused nights cost 0)
+    first_day = check_in.min()
+    nights = (check_out - check_in).astype(np.int64)
+    max_nights = max(int(nights.max()), 1)
+    peak_mask = get_peak_season_mask(first_day, check_in.max() + max_nights, peak_season_months)
+    night = np.arange(max_nights)
+    day = (check_in - first_day).astype(np.int64)[:, None] + night
+    daily_prices = np.where(peak_mask[day], base_peak[:, None], base_off[:, None])
+    daily_prices[night >= nights[:, None]] = 0.0
+    total_prices = np.cumsum(daily_prices, axis=1)[:, -1]
+
+    # Apply promotion discount
+    promotion = np.asarray(bookings["Promotion"]) == "Yes"
+    discount = 1 - (hotel_synthetic_params["PromotionPriceDiscount"] / 100)
+    total_prices = np.where(promotion, total_prices * discount, total_prices)
+
+    # Python's round, as in get_total_price; a stay of no nights without
+    # promotion keeps the integer 0 the per-booking loop starts from
+    return [
+        round(total_price, 2) if has_nights or has_promotion else 0
+        for total_price, has_nights, has_promotion
+        in zip(total_prices.tolist(), (nights > 0).tolist(), promotion.tolist(), strict=True)
+    ]
+
+
+def get_cumulative_weight_table(values, weights, normalize=True):
+    """
+    Precompute the cumulative weights used to draw values in batches.
+
+    Args:
+        values (sequence): Values to draw
+        weights (sequence): Weight of each value
+        normalize (bool): Scale the weights to add up to 1; if False they are
+            used as probabilities, as get_meal_plan does
+
+    Returns:
+        tuple: (values as an array, cumulative weights)
+    """
+    cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+    if normalize:
+        cumulative /= cumulative[-1]
+    return np.array(values), cumulative
+
+
+def sample_from_weight_table(rng, table, size):
+    """
+    Draw values from a cumulative weight table.
+
+    A value is drawn when the uniform draw falls below its cumulative weight;
+    draws above the last cumulative weight (only possible with weights that
+    are not normalized) get the first value, as in get_meal_plan.
+
+    Args:
+        rng (np.random.Generator): Random generator
+        table (tuple): Table from get_cumulative_weight_table
+        size (int): Number of values to draw
+
+    Returns:
+        np.ndarray: Drawn values
+    """
+    values, cumulative = table
+    index = np.searchsorted(cumulative, rng.random(size), side="right")
+    index[index == len(values)] = 0
+    return values[index]
+
+
+def get_meal_plan_table(pesos):
+    """
+    Precompute the cumulative weight table of a hotel's meal plans.
+
+    Args:
+        pesos (dict): Weights for each meal plan
+
+    Returns:
+        tuple: Table for sample_from_weight_table
+    """
+    return get_cumulative_weight_table(
+        [data['name'] for data in pesos.values()],
+        [data['weight'] for data in pesos.values()],
+        normalize=False
+    )
+
+
+# Cumulative weight tables of the booking attributes
+BOOKING_ATTRIBUTE_TABLES = {
+    name: get_cumulative_weight_table(values, weights)
+    for name, (values, weights) in BOOKING_ATTRIBUTE_WEIGHTS.items()
+}
+NUMBER_OF_GUESTS_TABLES = {
+    room_type: get_cumulative_weight_table(values, weights)
+    for room_type, (values, weights) in NUMBER_OF_GUESTS_WEIGHTS.items()
+}
+EXTRA_BED_TABLE = get_cumulative_weight_table(*EXTRA_BED_WEIGHTS)
+
+
+def sample_booking_attributes(rng, size, room_type, meal_plan_table):
+    """
+    Draw the categorical attributes of many bookings of a room at once.
+
+    Each column follows the same distribution as the per-booking functions
+    (get_number_of_guests, get_extra_bed, get_non_refundable, get_work_travel,
+    get_meal_plan, get_free_cancellation, get_promotion, get_cancellation_fee
+    and get_cancellation_status), drawn with a numpy Generator.
+
+    Args:
+        rng (np.random.Generator): Random generator
+        size (int): Number of bookings
+        room_type (int): Room type (1=single, 2=double, 3=triple)
+        meal_plan_table (tuple): Meal plan table from get_meal_plan_table
+
+    Returns:
+        dict: Column of values for each attribute
+    """
+    if room_type in NUMBER_OF_GUESTS_TABLES:
+        number_of_guests = sample_from_weight_table(rng, NUMBER_OF_GUESTS_TABLES[room_type], size)
+    else:
+        number_of_guests = np.ones(size, dtype=np.int64)
+    if room_type in (2, 3):
+        extra_bed = sample_from_weight_table(rng, EXTRA_BED_TABLE, size)
+    else:
+        extra_bed = np.full(size, "N/A" if room_type == 1 else "No")
+    number_of_guests = number_of_guests + (extra_bed == "Yes")
+
+    non_refundable = sample_from_weight_table(rng, BOOKING_ATTRIBUTE_TABLES["NonRefundable"], size)
+    cancellation_fee = np.where(
+        non_refundable == "Yes",
+        "N/A",
+        sample_from_weight_table(rng, BOOKING_ATTRIBUTE_TABLES["CancellationFee"], size)
+    )
+    columns = {
+        "NumberOfGuests": number_of_guests,
+        "ExtraBed": extra_bed,
+        "WorkTravel": sample_from_weight_table(rng, BOOKING_ATTRIBUTE_TABLES["WorkTravel"], size),
+        "MealPlan": sample_from_weight_table(rng, meal_plan_table, size),
+        "FreeCancellation": sample_from_weight_table(
+            rng, BOOKING_ATTRIBUTE_TABLES["FreeCancellation"], size
+        ),
+        "Promotion": sample_from_weight_table(rng, BOOKING_ATTRIBUTE_TABLES["Promotion"], size),
+        "NonRefundable": non_refundable,
+        "CancellationFee": cancellation_fee,
+        "CancellationStatus": sample_from_weight_table(
+            rng, BOOKING_ATTRIBUTE_TABLES["CancellationStatus"], size
+        ),
+    }
+    return {name: values.tolist() for name, values in columns.items()}
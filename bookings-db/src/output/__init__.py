@@ -4,7 +4,15 @@ from .booking_output_writer import (
     generate_file_json_for_bookings,
     generate_file_excel_for_bookings,
     generate_file_md_hotel_bookings,
-    generate_file_excel_all_bookings
+    generate_file_excel_all_bookings,
+    ExcelBookingsWriter,
+    MarkdownBookingsWriter
+)
+from .booking_columnar_writer import (
+    generate_file_parquet_all_bookings,
+    generate_file_arrow_all_bookings,
+    booking_columns_to_record_batch,
+    PartitionedBookingsWriter
 )
 from .hotel_output_writer import (
     generate_file_json_for_hotels,
@@ -22,6 +30,12 @@ __all__ = [
     'generate_file_excel_for_bookings',
     'generate_file_md_hotel_bookings',
     'generate_file_excel_all_bookings',
+    'generate_file_parquet_all_bookings',
+    'generate_file_arrow_all_bookings',
+    'booking_columns_to_record_batch',
+    'ExcelBookingsWriter',
+    'MarkdownBookingsWriter',
+    'PartitionedBookingsWriter',
 
     # Hotel output functions
     'generate_file_json_for_hotels',
@@ -0,0 +1,277 @@
+"""Module for writing booking data as columnar Parquet and Arrow IPC datasets.
+
+The bookings are converted to Arrow tables with a typed, flat schema (the
+columns of the database's `bookings` view) and written in hive-style
+partitions by hotel and check-in month:
+
+    all_bookings.parquet/hotel_name=Grand%20Victoria/month=2025-01/part-0.parquet
+
+Readers can load the whole dataset, or only the hotels and months they need,
+without parsing a spreadsheet. Arrow IPC files are written uncompressed so
+they can be memory-mapped and read without copying.
+
+PartitionedBookingsWriter receives the bookings hotel by hotel, in chunks,
+and appends each chunk to the files of its months as it arrives; only the
+files of the current hotel are open, so memory stays bounded by the chunk
+size whatever the size of the dataset. The chunks of the booking generator
+are columns, which booking_columns_to_record_batch converts to a record
+batch without building a dictionary per booking.
+"""
+
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Columns of the booking datasets; hotel_name and month are stored in the partition paths
+BOOKINGS_ARROW_SCHEMA = pa.schema([
+    ("hotel_name", pa.string()),
+    ("room_id", pa.string()),
+    ("room_type", pa.string()),
+    ("room_category", pa.string()),
+    ("check_in_date", pa.date32()),
+    ("check_out_date", pa.date32()),
+    ("guest_first_name", pa.string()),
+    ("guest_last_name", pa.string()),
+    ("guest_email", pa.string()),
+    ("guest_phone", pa.string()),
+    ("guest_country", pa.string()),
+    ("guest_city", pa.string()),
+    ("guest_address", pa.string()),
+    ("guest_zip_code", pa.string()),
+    ("meal_plan", pa.string()),
+    ("total_price", pa.float64()),
+    ("month", pa.string()),
+])
+
+PARTITION_COLUMNS = ["hotel_name", "month"]
+
+# Columns stored in the files (the partition columns are in the paths)
+FILE_SCHEMA = pa.schema(
+    [field for field in BOOKINGS_ARROW_SCHEMA if field.name not in PARTITION_COLUMNS]
+)
+
+# Dataset formats: file extension and Parquet compression
+DATASET_FORMATS = ("parquet", "arrow")
+PARQUET_COMPRESSION = "zstd"
+
+
+def bookings_to_arrow_table(booking_list: List[Dict[str, Any]]) -> pa.Table:
+    """Convert the bookings of several hotels into a flat Arrow table.
+
+    Args:
+        booking_list: List of dictionaries with 'HotelName' and 'Bookings' keys
+
+    Returns:
+        Table with the BOOKINGS_ARROW_SCHEMA columns, one row per booking
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in BOOKINGS_ARROW_SCHEMA.names}
+    for hotel_bookings in booking_list:
+        hotel_name = hotel_bookings["HotelName"]
+        for booking in hotel_bookings["Bookings"]:
+            guest = booking["Guest"]
+            columns["hotel_name"].append(hotel_name)
+            columns["room_id"].append(booking["RoomAssigned"])
+            columns["room_type"].append(booking["RoomType"])
+            columns["room_category"].append(booking["RoomCategory"])
+            columns["check_in_date"].append(booking["CheckInDate"])
+            columns["check_out_date"].append(booking["CheckOutDate"])
+            columns["guest_first_name"].append(guest["FirstName"])
+            columns["guest_last_name"].append(guest["LastName"])
+            columns["guest_email"].append(guest["Email"])
+            columns["guest_phone"].append(guest["Phone"])
+            columns["guest_country"].append(guest["Country"])
+            columns["guest_city"].append(guest["City"])
+            columns["guest_address"].append(guest["Address"])
+            columns["guest_zip_code"].append(guest["ZipCode"])
+            columns["meal_plan"].append(booking["MealPlan"])
+            columns["total_price"].append(booking["TotalPrice"])
+            columns["month"].append(booking["CheckInDate"][:7])
+
+    return pa.Table.from_arrays(_to_arrays(columns), schema=BOOKINGS_ARROW_SCHEMA)
+
+
+def booking_columns_to_record_batch(
+    hotel_name: str, columns: Dict[str, List[Any]]
+) -> pa.RecordBatch:
+    """Convert booking columns of a hotel into an Arrow record batch.
+
+    Args:
+        hotel_name: Name of the hotel
+        columns: One list per booking field, as produced by the booking generator
+
+    Returns:
+        Record batch with the BOOKINGS_ARROW_SCHEMA columns, one row per booking
+    """
+    guests = columns["Guest"]
+    check_in_dates = columns["CheckInDate"]
+    arrow_columns = {
+        "hotel_name": [hotel_name] * len(check_in_dates),
+        "room_id": columns["RoomAssigned"],
+        "room_type": columns["RoomType"],
+        "room_category": columns["RoomCategory"],
+        "check_in_date": check_in_dates,
+        "check_out_date": columns["CheckOutDate"],
+        "guest_first_name": [guest["FirstName"] for guest in guests],
+        "guest_last_name": [guest["LastName"] for guest in guests],
+        "guest_email": [guest["Email"] for guest in guests],
+        "guest_phone": [guest["Phone"] for guest in guests],
+        "guest_country": [guest["Country"] for guest in guests],
+        "guest_city": [guest["City"] for guest in guests],
+        "guest_address": [guest["Address"] for guest in guests],
+        "guest_zip_code": [guest["ZipCode"] for guest in guests],
+        "meal_plan": columns["MealPlan"],
+        "total_price": columns["TotalPrice"],
+        "month": [date[:7] for date in check_in_dates],
+    }
+    return pa.RecordBatch.from_arrays(_to_arrays(arrow_columns), schema=BOOKINGS_ARROW_SCHEMA)
+
+
+def _to_arrays(columns: Dict[str, List[Any]]) -> List[pa.Array]:
+    """Build the arrays of the BOOKINGS_ARROW_SCHEMA columns from lists of values."""
+    arrays = []
+    for field in BOOKINGS_ARROW_SCHEMA:
+        if pa.types.is_date(field.type):
+            # Dates are generated as 'YYYY-MM-DD' strings
+            arrays.append(pa.array(columns[field.name], pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return arrays
+
+
+class PartitionedBookingsWriter:
+    """Stream bookings into a dataset partitioned by hotel and check-in month."""
+
+    def __init__(self, output_path: str, file_format: str = "parquet"):
+        """Create the dataset directory, replacing any previous dataset.
+
+        Args:
+            output_path: Directory of the dataset (e.g. .../all_bookings.parquet)
+            file_format: "parquet" or "arrow" (Arrow IPC)
+        """
+        if file_format not in DATASET_FORMATS:
+            raise ValueError(
+                f"Unknown dataset format '{file_format}', "
+                f"expected one of {', '.join(DATASET_FORMATS)}"
+            )
+        self.output_path = output_path
+        self.file_format = file_format
+        self.rows = 0
+        if os.path.isdir(output_path):
+            shutil.rmtree(output_path)
+        os.makedirs(output_path)
+        self._hotel = None
+        # Open files of the current hotel by month, and files written per partition
+        self._writers: Dict[str, Any] = {}
+        self._parts: Dict[str, int] = {}
+
+    def _open(self, hotel_name: str, month: str):
+        """Open a new file in the partition of a hotel and month."""
+        directory = os.path.join(
+            self.output_path, f"hotel_name={quote(hotel_name, safe='')}", f"month={month}"
+        )
+        os.makedirs(directory, exist_ok=True)
+        part = self._parts.get(directory, 0)
+        self._parts[directory] = part + 1
+        path = os.path.join(directory, f"part-{part}.{self.file_format}")
+        if self.file_format == "parquet":
+            return pq.ParquetWriter(path, FILE_SCHEMA, compression=PARQUET_COMPRESSION)
+        return pa.ipc.new_file(path, FILE_SCHEMA)
+
+    def _close_hotel(self) -> None:
+        """Close the files of the current hotel."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def write(self, hotel_bookings: Dict[str, Any]) -> None:
+        """Append the bookings of a chunk to the files of their months.
+
+        Args:
+            hotel_bookings: Dictionary with 'HotelKey', 'HotelName' and 'Bookings' keys
+        """
+        self.write_batch(hotel_bookings.get("HotelKey"), hotel_bookings["HotelName"],
+                         bookings_to_arrow_table([hotel_bookings]))
+
+    def write_batch(self, hotel_key: Optional[str], hotel_name: str,
+                    batch: pa.RecordBatch | pa.Table) -> None:
+        """Append Arrow bookings of a hotel to the files of their months.
+
+        Args:
+            hotel_key: Key of the hotel (a new hotel starts when the key or name changes)
+            hotel_name: Name of the hotel
+            batch: Bookings with the BOOKINGS_ARROW_SCHEMA columns
+                (see booking_columns_to_record_batch)
+        """
+        hotel = (hotel_key, hotel_name)
+        if hotel != self._hotel:
+            self._close_hotel()
+            self._hotel = hotel
+
+        table = pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch
+        for month in pc.unique(table["month"]).to_pylist():
+            if month not in self._writers:
+                self._writers[month] = self._open(hotel_name, month)
+            rows = table.filter(pc.equal(table["month"], month)).select(FILE_SCHEMA.names)
+            self._writers[month].write_table(rows)
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        """Close the open files."""
+        self._close_hotel()
+        print(
+            f"{self.file_format.capitalize()} dataset with {self.rows} bookings "
+            f"written to: {self.output_path}"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _write_bookings_dataset(
+    booking_list: List[Dict[str, Any]], output_path: str, file_format: str
+) -> None:
+    """Write the bookings as a dataset partitioned by hotel and check-in month.
+
+    Any previous dataset at output_path is replaced.
+    """
+    with PartitionedBookingsWriter(output_path, file_format) as writer:
+        for hotel_bookings in booking_list:
+            writer.write(hotel_bookings)
+
+
+def generate_file_parquet_all_bookings(
+    booking_list: List[Dict[str, Any]], output_path: str
+) -> None:
+    """Generate a Parquet dataset with all booking data, partitioned by hotel and month.
+
+    Args:
+        booking_list: List of dictionaries with 'HotelName' and 'Bookings' keys
+        output_path: Directory of the dataset (e.g. .../all_bookings.parquet)
+
+    Returns:
+        None
+    """
+    _write_bookings_dataset(booking_list, output_path, "parquet")
+
+
+def generate_file_arrow_all_bookings(booking_list: List[Dict[str, Any]], output_path: str) -> None:
+    """Generate an uncompressed Arrow IPC dataset with all booking data.
+
+    The dataset is partitioned by hotel and month.
+
+    Args:
+        booking_list: List of dictionaries with 'HotelName' and 'Bookings' keys
+        output_path: Directory of the dataset (e.g. .../all_bookings.arrow)
+
+    Returns:
+        None
+    """
+    _write_bookings_dataset(booking_list, output_path, "arrow")
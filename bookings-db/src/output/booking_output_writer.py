@@ -1,10 +1,24 @@
-"""Module for writing booking data to output files in various formats (JSON, Excel, MD)."""
+"""Module for writing booking data to output files in various formats (JSON, Excel, MD).
+
+The all-bookings outputs have streaming writers (MarkdownBookingsWriter,
+ExcelBookingsWriter) that receive the bookings hotel by hotel, in chunks,
+and write them as they arrive, so a whole dataset never has to be held in
+memory. Consecutive chunks of the same hotel continue its section.
+"""
 
 import json
 import re
 from io import TextIOWrapper
 from typing import cast, Dict, List, Any
 import pandas as pd
+from openpyxl import Workbook
+
+# Columns of the all-bookings Excel file
+EXCEL_ALL_BOOKINGS_COLUMNS = [
+    'Hotel Name', 'Room ID', 'Room Type', 'Room Category', 'Check-in Date', 'Check-out Date',
+    'Guest First Name', 'Guest Last Name', 'Guest Email', 'Guest Phone', 'Guest Country',
+    'Guest City', 'Guest Address', 'Guest Zip Code', 'Meal Plan', 'Total Price'
+]
 
 def generate_file_json_for_bookings(
     bookings: Dict[str, Any],
@@ -55,44 +69,61 @@ def generate_file_excel_for_bookings(
     )
     df.to_excel(filename, index=False)
 
+class ExcelBookingsWriter:
+    """Stream the bookings of all hotels into one Excel sheet (openpyxl write-only mode)."""
+
+    def __init__(self, output_path: str):
+        """Start the workbook.
+
+        Args:
+            output_path: Path to write the Excel file
+        """
+        self.output_path = output_path
+        self.rows = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append(EXCEL_ALL_BOOKINGS_COLUMNS)
+
+    def write(self, hotel_bookings: Dict[str, Any]) -> None:
+        """Append the bookings of a chunk.
+
+        Args:
+            hotel_bookings: Dictionary with 'HotelName' and 'Bookings' keys
+        """
+        hotel_name = hotel_bookings["HotelName"]
+        for booking in hotel_bookings["Bookings"]:
+            guest = booking['Guest']
+            self._sheet.append([
+                hotel_name, booking['RoomAssigned'], booking['RoomType'], booking['RoomCategory'],
+                booking['CheckInDate'], booking['CheckOutDate'],
+                guest['FirstName'], guest['LastName'], guest['Email'], guest['Phone'],
+                guest['Country'], guest['City'], guest['Address'], guest['ZipCode'],
+                booking['MealPlan'], booking['TotalPrice']
+            ])
+        self.rows += len(hotel_bookings["Bookings"])
+
+    def close(self) -> None:
+        """Save the workbook."""
+        self._workbook.save(self.output_path)
+        print(f"Excel file with all bookings written to: {self.output_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 def generate_file_excel_all_bookings(booking_list, output_path):
     """Generate an Excel file with all booking data.
-    
+
     Args:
         booking_list (list): List of booking dictionaries
         output_path (str): Path to write the Excel file
     """
-    # Create a list to store all booking data
-    all_bookings = []
-
-    # Extract data from each booking
-    for hotel_bookings in booking_list:
-        hotel_name = hotel_bookings["HotelName"]
-        for booking in hotel_bookings["Bookings"]:
-            booking_data = {
-                'Hotel Name': hotel_name,
-                'Room ID': booking['RoomAssigned'],
-                'Room Type': booking['RoomType'],
-                'Room Category': booking['RoomCategory'],
-                'Check-in Date': booking['CheckInDate'],
-                'Check-out Date': booking['CheckOutDate'],
-                'Guest First Name': booking['Guest']['FirstName'],
-                'Guest Last Name': booking['Guest']['LastName'],
-                'Guest Email': booking['Guest']['Email'],
-                'Guest Phone': booking['Guest']['Phone'],
-                'Guest Country': booking['Guest']['Country'],
-                'Guest City': booking['Guest']['City'],
-                'Guest Address': booking['Guest']['Address'],
-                'Guest Zip Code': booking['Guest']['ZipCode'],
-                'Meal Plan': booking['MealPlan'],
-                'Total Price': booking['TotalPrice']
-            }
-            all_bookings.append(booking_data)
-
-    # Create DataFrame and write to Excel
-    df = pd.DataFrame(all_bookings)
-    df.to_excel(output_path, index=False)
-    print(f"Excel file with all bookings written to: {output_path}")
+    with ExcelBookingsWriter(output_path) as writer:
+        for hotel_bookings in booking_list:
+            writer.write(hotel_bookings)
 
 def generate_hotel_bookings_filename(hotel_key: str, hotel_name: str) -> str:
     """Generate a standardized filename for hotel booking data.
@@ -112,6 +143,67 @@ def generate_hotel_bookings_filename(hotel_key: str, hotel_name: str) -> str:
     filename = f"hotel_{hotel_key}_{camel_case_name}_bookings"
     return filename
 
+class MarkdownBookingsWriter:
+    """Stream the bookings of all hotels into hotel_bookings.md, one section per hotel."""
+
+    def __init__(self, output_path: str):
+        """Open the Markdown file.
+
+        Args:
+            output_path: Directory path where the file will be saved
+        """
+        self._file = open(f"{output_path}hotel_bookings.md", "w", encoding="utf-8")
+        self._hotel = None
+
+    def write(self, hotel_bookings: Dict[str, Any]) -> None:
+        """Write the bookings of a chunk, starting a new section when the hotel changes.
+
+        Args:
+            hotel_bookings: Dictionary with 'HotelKey', 'HotelName' and 'Bookings' keys
+        """
+        hotel_name = hotel_bookings["HotelName"]
+        hotel = (hotel_bookings.get("HotelKey"), hotel_name)
+        if hotel != self._hotel:
+            if self._hotel is not None:
+                self._file.write("\n---\n\n")
+            self._hotel = hotel
+            self._file.write(f"# HOTEL - Name: {hotel_name}\n\n")
+            self._file.write("## Bookings\n\n")
+            self._file.write(
+                "| Country of Guest | City of Guest | Check-In Date | "
+                "Check-Out Date | Room Assigned | Room Category | Room Type | "
+                "Meal Plan | Total Price |\n"
+            )
+            self._file.write(
+                "|------------------|---------------|---------------|"
+                "----------------|---------------|---------------|-----------|"
+                "-----------|-------------|\n"
+            )
+
+        for booking in hotel_bookings["Bookings"]:
+            guest_country = booking["Guest"]["Country"]
+            guest_city = booking["Guest"]["City"]
+            self._file.write(
+                f"| {guest_country} | {guest_city} | "
+                f"{booking['CheckInDate']} | {booking['CheckOutDate']} | "
+                f"{booking['RoomAssigned']} | {booking['RoomCategory']} | "
+                f"{booking['RoomType']} | {booking['MealPlan']} | "
+                f"{booking['TotalPrice']} |\n"
+            )
+
+    def close(self) -> None:
+        """Close the last hotel section and the file."""
+        if self._hotel is not None:
+            self._file.write("\n---\n\n")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 def generate_file_md_hotel_bookings(
     hotel_bookings_list: List[Dict[str, Any]],
     output_path: str
@@ -129,33 +221,6 @@ def generate_file_md_hotel_bookings(
     Returns:
         None
     """
-    filename = f"{output_path}hotel_bookings.md"
-
-    with open(filename, "w", encoding="utf-8") as file:
+    with MarkdownBookingsWriter(output_path) as writer:
         for hotel_bookings in hotel_bookings_list:
-            hotel_name = hotel_bookings["HotelName"]
-
-            file.write(f"# HOTEL - Name: {hotel_name}\n\n")
-            file.write("## Bookings\n\n")
-            file.write(
-                "| Country of Guest | City of Guest | Check-In Date | "
-                "Check-Out Date | Room Assigned | Room Category | Room Type | "
-                "Meal Plan | Total Price |\n"
-            )
-            file.write(
-                "|------------------|---------------|---------------|"
-                "----------------|---------------|---------------|-----------|"
-                "-----------|-------------|\n"
-            )
-
-            for booking in hotel_bookings["Bookings"]:
-                guest_country = booking["Guest"]["Country"]
-                guest_city = booking["Guest"]["City"]
-                file.write(
-                    f"| {guest_country} | {guest_city} | "
-                    f"{booking['CheckInDate']} | {booking['CheckOutDate']} | "
-                    f"{booking['RoomAssigned']} | {booking['RoomCategory']} | "
-                    f"{booking['RoomType']} | {booking['MealPlan']} | "
-                    f"{booking['TotalPrice']} |\n"
-                )
-            file.write("\n---\n\n")
+            writer.write(hotel_bookings)
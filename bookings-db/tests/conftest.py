@@ -0,0 +1,6 @@
+"""Shared setup of the generator tests: import the src package from the bookings-db directory."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
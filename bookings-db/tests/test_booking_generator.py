@@ -0,0 +1,54 @@
+"""Tests of the synthetic booking generation."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+from src.generator.booking_generator import booking_rows, generate_booking_chunks
+from src.generator.hotel_generator import generate_hotels
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "generate_hotels_param.yaml"
+
+
+@pytest.fixture(scope="module")
+def config(tmp_path_factory):
+    config = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    config["num_of_hotels"] = 3
+    config["rooms_per_hotel"]["number"] = {"min": 3, "max": 5}
+    booking_year = config["hotel_occupancy"]["booking_year"]
+    booking_year["start"] = booking_year["end"]
+    config["guest_pool"]["size"] = 500
+    config["guest_pool"]["cache_dir"] = str(tmp_path_factory.mktemp("cache"))
+    return config
+
+
+@pytest.fixture(scope="module")
+def hotels(config):
+    return generate_hotels(config)
+
+
+def _bookings(hotels, config, seed, workers):
+    """Booking records of generate_booking_chunks, with the hotel of each chunk."""
+    bookings = []
+    for chunk in generate_booking_chunks(hotels, config, 50, seed=seed, workers=workers):
+        for booking in booking_rows(chunk["Columns"]):
+            bookings.append((chunk["HotelKey"], chunk["HotelName"], booking))
+    return bookings
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_bookings_do_not_depend_on_the_number_of_workers(hotels, config, workers):
+    sequential = _bookings(hotels, config, 42, 1)
+
+    assert sequential
+    assert [hotel_key for hotel_key, _, _ in sequential][-1] == hotels[-1]["hotelkey"]
+    assert _bookings(hotels, config, 42, workers) == sequential
+
+
+def test_bookings_depend_on_the_seed(hotels, config):
+    assert _bookings(hotels, config, 42, 1) != _bookings(hotels, config, 7, 1)
+
+
+def test_parallel_generation_requires_a_seed(hotels, config):
+    with pytest.raises(ValueError):
+        next(generate_booking_chunks(hotels, config, 50, workers=2))
@@ -0,0 +1,68 @@
+"""Tests of the batched booking pricing against the per-booking price."""
+
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+from src.benchmark_pricing import booking_columns, build_bookings
+from src.generator import parametric_utils as ParUt
+from src.generator.hotel_generator import generate_hotels
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "generate_hotels_param.yaml"
+
+
+@pytest.fixture(scope="module")
+def config():
+    config = yaml.safe_load(CONFIG_PATH.read_text(encoding="utf-8"))
+    config["num_of_hotels"] = 3
+    return config
+
+
+@pytest.fixture(scope="module")
+def hotels(config):
+    return generate_hotels(config)
+
+
+def _assert_same_prices(batch_prices, bookings, config, params):
+    loop_prices = [
+        ParUt.get_total_price(booking, booking["Room"], config["peak_season_months"], params)
+        for booking in bookings
+    ]
+    assert len(batch_prices) == len(loop_prices)
+    for loop, batch in zip(loop_prices, batch_prices, strict=True):
+        assert batch == loop
+        assert type(batch) is type(loop)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batched_prices_match_the_per_booking_price(hotels, config, seed):
+    for hotel in hotels:
+        params = hotel["SyntheticParams"]
+        bookings = build_bookings(hotel, 2000, 3, random.Random(seed))
+        batch_prices = ParUt.get_total_prices(
+            booking_columns(bookings), config["peak_season_months"], params
+        )
+
+        _assert_same_prices(batch_prices, bookings, config, params)
+
+
+def test_batched_prices_of_date_arrays_match_the_per_booking_price(hotels, config):
+    # The generator passes the check-in and check-out dates as datetime64 arrays
+    hotel = hotels[0]
+    params = hotel["SyntheticParams"]
+    bookings = build_bookings(hotel, 2000, 2, random.Random(7))
+    columns = booking_columns(bookings)
+    columns["CheckInDate"] = np.array(columns["CheckInDate"], dtype="datetime64[D]")
+    columns["CheckOutDate"] = np.array(columns["CheckOutDate"], dtype="datetime64[D]")
+    batch_prices = ParUt.get_total_prices(columns, config["peak_season_months"], params)
+
+    _assert_same_prices(batch_prices, bookings, config, params)
+
+
+def test_no_bookings_have_no_prices(hotels, config):
+    columns = booking_columns([])
+    assert len(ParUt.get_total_prices(
+        columns, config["peak_season_months"], hotels[0]["SyntheticParams"]
+    )) == 0
@@ -0,0 +1,184 @@
+"""Tests of the slot arrays against the original slot lists of timestamps."""
+
+import calendar
+import random
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.generator.booking_generator import (
+    adjust_slot_arrays_forecast,
+    adjust_slot_arrays_occupancy,
+    date_slot_arrays,
+)
+
+PEAK_SEASON_MONTHS = ("January", "April", "May", "June", "July", "August", "September", "December")
+FORECAST_REDUCTION = [15, 30, 45, 60, 75, 90, 100]
+
+
+# Reference implementation: the slot lists the generator used before the slot arrays
+
+
+def reference_all_date_slots(start_date, end_date, min_slot=1, max_slot=13):
+    current_date = start_date
+    slots = []
+    week_count = number_count = weekend_count = 0
+
+    while current_date <= end_date:
+        max_duration = min(max_slot, (end_date - current_date).days + 1)
+        if number_count < 6 or week_count < 1 or weekend_count / week_count > 1:
+            slot_duration = random.randint(min_slot, max_duration)
+        elif current_date.weekday() < 4:
+            slot_duration = random.randint(1, 4)
+        else:
+            slot_duration = 3
+
+        slot_end = min(current_date + pd.Timedelta(days=slot_duration - 1), end_date)
+        if current_date.weekday() == 4 and slot_duration == 1:
+            weekend_count += 1
+        slots.append((current_date, slot_end))
+
+        current_date = slot_end + pd.Timedelta(days=1)
+        number_count += 1
+        week_count = ((current_date - start_date).days + 1) // 7
+
+    return slots
+
+
+def _slots_by_month(all_slots):
+    slots_by_month = {}
+    for start, end in all_slots:
+        slots_by_month.setdefault(start.strftime("%Y-%m"), []).append((start, end))
+    return slots_by_month
+
+
+def _is_weekend(slot):
+    return all(
+        (slot[0] + timedelta(days=i)).weekday() in [4, 5, 6]
+        for i in range((slot[1] - slot[0]).days + 1)
+    )
+
+
+def reference_adjust_slots_occupancy(all_slots, peak_season_months, occupancy_peak,
+                                     occupancy_offseason):
+    adjusted_slots = []
+    for month, slots in _slots_by_month(all_slots).items():
+        year, month_num = map(int, month.split("-"))
+        is_peak = calendar.month_name[month_num] in peak_season_months
+        total_days = calendar.monthrange(year, month_num)[1]
+        current_days = sum((end - start).days + 1 for start, end in slots)
+        target_occupancy = occupancy_peak if is_peak else occupancy_offseason
+        target_days = int((target_occupancy / 100) * total_days)
+
+        if current_days > target_days:
+            excess_days = current_days - target_days
+            non_weekend = [slot for slot in slots if not _is_weekend(slot)]
+            weekend = [slot for slot in slots if _is_weekend(slot)]
+
+            while excess_days > 0 and non_weekend:
+                slot_to_remove = random.choice(non_weekend)
+                non_weekend.remove(slot_to_remove)
+                slots.remove(slot_to_remove)
+                excess_days -= (slot_to_remove[1] - slot_to_remove[0]).days + 1
+
+            if not is_peak and weekend:
+                slot_to_remove = random.choice(weekend)
+                weekend.remove(slot_to_remove)
+                slots.remove(slot_to_remove)
+
+        adjusted_slots.extend(slots)
+    return adjusted_slots
+
+
+def reference_adjust_slots_forecast(all_slots, current_month, reduce_booking_list):
+    slots_by_month = _slots_by_month(all_slots)
+    current_year, current_month_num = map(int, current_month.split("-"))
+    adjusted_slots = []
+    for month, slots in slots_by_month.items():
+        year, month_num = map(int, month.split("-"))
+        if year < current_year or (year == current_year and month_num <= current_month_num):
+            adjusted_slots.extend(slots)
+
+    for i, reduction in enumerate(reduce_booking_list):
+        year_to_adjust = current_year + (current_month_num + i - 1) // 12
+        month_to_adjust = (current_month_num + i) % 12 + 1
+        month = f"{year_to_adjust:04d}-{month_to_adjust:02d}"
+        if month not in slots_by_month:
+            continue
+        slots = slots_by_month[month]
+        target_days = int(sum((end - start).days + 1 for start, end in slots)
+                          * (1 - (reduction / 100)))
+        if target_days <= 0:
+            continue
+
+        current_days = 0
+        for slot in slots:
+            if current_days >= target_days:
+                break
+            slot_days = (slot[1] - slot[0]).days + 1
+            if current_days + slot_days > target_days:
+                slot_days = target_days - current_days
+                slot = (slot[0], slot[0] + pd.Timedelta(days=slot_days - 1))
+            adjusted_slots.append(slot)
+            current_days += slot_days
+    return adjusted_slots
+
+
+def _arrays(slots):
+    return (np.array([start for start, _ in slots], dtype="datetime64[D]"),
+            np.array([end for _, end in slots], dtype="datetime64[D]"))
+
+
+def _assert_same_slots(arrays, slots):
+    expected_starts, expected_ends = _arrays(slots)
+    np.testing.assert_array_equal(arrays[0], expected_starts)
+    np.testing.assert_array_equal(arrays[1], expected_ends)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize(
+    "start, end",
+    [("2025-01-01", "2025-12-31"), ("2023-03-15", "2025-02-10"), ("2024-02-27", "2024-03-02")],
+)
+def test_date_slot_arrays_match_the_slot_list(seed, start, end):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    random.seed(seed)
+    slots = reference_all_date_slots(start, end)
+    state = random.getstate()
+    random.seed(seed)
+    arrays = date_slot_arrays(start, end)
+
+    _assert_same_slots(arrays, slots)
+    # The same random draws were consumed
+    assert random.getstate() == state
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("occupancy_peak, occupancy_offseason", [(85, 60), (100, 40), (30, 90)])
+def test_occupancy_adjustment_matches_the_slot_list(seed, occupancy_peak, occupancy_offseason):
+    random.seed(seed)
+    slots = reference_all_date_slots(pd.Timestamp("2024-01-01"), pd.Timestamp("2025-12-31"))
+
+    random.seed(seed + 100)
+    expected = reference_adjust_slots_occupancy(
+        list(slots), PEAK_SEASON_MONTHS, occupancy_peak, occupancy_offseason
+    )
+    random.seed(seed + 100)
+    arrays = adjust_slot_arrays_occupancy(
+        *_arrays(slots), PEAK_SEASON_MONTHS, occupancy_peak, occupancy_offseason
+    )
+
+    _assert_same_slots(arrays, expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("current_month", ["2025-04", "2024-11", "2025-12", "2023-06"])
+def test_forecast_adjustment_matches_the_slot_list(seed, current_month):
+    random.seed(seed)
+    slots = reference_all_date_slots(pd.Timestamp("2024-01-01"), pd.Timestamp("2025-12-31"))
+
+    expected = reference_adjust_slots_forecast(slots, current_month, FORECAST_REDUCTION)
+    arrays = adjust_slot_arrays_forecast(*_arrays(slots), current_month, FORECAST_REDUCTION)
+
+    _assert_same_slots(arrays, expected)